@@ -18,10 +18,12 @@ export const useAgentStart = () => {
     try {
       const res = await axios.post(`${API_URL}/agent/start`, { niche });
 
+      // ✅ Server queues the run (HTTP 202) and returns a job ID to poll
       const response: AgentStartResponse = {
-        success: res.status === 200,
-        status: "completed",
+        success: res.status === 200 || res.status === 202,
+        status: "queued",
         message: res.data?.message || "Agent started successfully!",
+        job_id: res.data?.job_id,
       };
 
       setStartMessage(response.message);
@@ -32,7 +34,7 @@ export const useAgentStart = () => {
       const response: AgentStartResponse = {
         success: false,
         status: "failed",
-        message: err.response?.data?.message || err.message || "Failed to start agent",
+        message: err.response?.data?.detail || err.response?.data?.message || err.message || "Failed to start agent",
       };
 
       setStartError(response.message);
@@ -28,6 +28,7 @@ export interface JobStep {
 
 export interface AgentStartResponse {
   success: boolean;
-  status: "completed" | "failed";
+  status: "queued" | "completed" | "failed";
   message: string;
+  job_id?: string;
 }
@@ -1,13 +1,75 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.routes.route import router as agent_router
 from app.routes.authRoute import router as auth_router
+from app.services.job_queue import job_queue
+from app.services.checkpoint_store import checkpoint_store
+from app.services.topic_index import topic_index
+from app.services.job_counters import job_counters
+from app.services.post_outbox import post_outbox
+from app.services.http_client import close_http_clients, aclose_http_clients
+from app.services.mongodb_service import (
+    get_client,
+    close_mongo_client,
+    get_async_client,
+    close_async_mongo_client,
+    aensure_post_indexes,
+)
+from app.utils.config import validate_config
 import uvicorn
 
+# ------------------------------------------------------------
+# 0️⃣ Application lifespan
+#    - Validates the environment, then warms up the agent graph
+#      (LangChain/OpenAI imports, LLM cache, graph compilation)
+#      off the event loop; importing app.main stays cheap
+#    - Opens the shared MongoDB clients (sync and async pools),
+#      creates the post history indexes, attaches the graph
+#      checkpointer, loads the topic de-duplication index and
+#      starts the job counter flush, the post outbox drainer and
+#      the background job queue workers on startup
+#    - Stops them (flushing the remaining job counters and queued
+#      posts) and closes the checkpointer, the MongoDB clients and
+#      the pooled LinkedIn HTTP clients on shutdown
+# ------------------------------------------------------------
+def _warm_up():
+    from app.services.agent_graph import warm_up
+
+    return warm_up()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    validate_config()
+    agent_graph = await asyncio.to_thread(_warm_up)
+    get_client()
+    get_async_client()
+    await aensure_post_indexes()
+    await checkpoint_store.start(agent_graph)
+    await topic_index.start()
+    await job_counters.start()
+    await post_outbox.start()
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await post_outbox.stop()
+        await job_counters.stop()
+        await topic_index.stop()
+        await checkpoint_store.stop(agent_graph)
+        close_mongo_client()
+        await close_async_mongo_client()
+        close_http_clients()
+        await aclose_http_clients()
+
 # ------------------------------------------------------------
 # 1️⃣ Initialize FastAPI application
 # ------------------------------------------------------------
-app = FastAPI(title="LinkedIn AI Posting Agent")
+app = FastAPI(title="LinkedIn AI Posting Agent", lifespan=lifespan)
 
 # ------------------------------------------------------------
 # 2️⃣ Configure CORS middleware
@@ -38,7 +100,16 @@ def root():
     return {"message": "Welcome to the LinkedIn AI Agent API 🚀"}
 
 # ------------------------------------------------------------
-# 5️⃣ Application entry point
+# 5️⃣ Metrics endpoint
+#    - Per-node latency, external call timings, LLM tokens and
+#      cost in Prometheus text format
+# ------------------------------------------------------------
+@app.get("/metrics")
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# ------------------------------------------------------------
+# 6️⃣ Application entry point
 #    - Starts the FastAPI app using Uvicorn server
 # ------------------------------------------------------------
 if __name__ == "__main__":
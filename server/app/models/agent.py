@@ -1,9 +1,15 @@
 from pydantic import BaseModel, Field, field_validator
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Annotated, Any, Dict, Optional, List
 from langchain_core.messages import BaseMessage
 
 
+def merge_models_used(left: Dict[str, str], right: Dict[str, str]) -> Dict[str, str]:
+    """Reducer for AgentState.models_used: node updates add to the mapping."""
+    return {**(left or {}), **(right or {})}
+
+
 # ============================================================
 # 🧠 AgentState Model
 # ------------------------------------------------------------
@@ -45,6 +51,19 @@ class AgentState(BaseModel):
     # The finalized version of the post (after approval and edits).
     final_post: Optional[str] = None
 
+    # === Review Feedback ===
+    # Latest reviewer critique, used by the content creator when reworking.
+    review_feedback: Optional[str] = None
+
+    # === Review Score ===
+    # Quality score (1-10) from the structured reviewer or self-review.
+    review_score: Optional[int] = None
+
+    # === Models Used ===
+    # Which model served each LLM node (after routing/fallback), e.g.
+    # {"topic_generator": "gpt-4o-mini", "content_creator": "gpt-4o"}.
+    models_used: Annotated[Dict[str, str], merge_models_used] = Field(default_factory=dict)
+
     # === Current Node ===
     # Represents the workflow node currently being executed 
     # (e.g., “topic_generator”, “content_refiner”, etc.).
@@ -59,6 +78,20 @@ class AgentState(BaseModel):
     # Stores the LinkedIn image asset URN returned after uploading media.
     image_asset_urn: Optional[str] = None
 
+    # === Image Blob ===
+    # Content hash, size, dimensions and MIME type of the generated image
+    # in the image blob store (the bytes themselves never enter the state).
+    image: Optional[Dict[str, Any]] = None
+
+    # === Image Prompt ===
+    # Text the image was generated from (speculative mode uses the topic),
+    # compared against the final post to detect drift during review.
+    image_prompt: Optional[str] = None
+
+    # === Speculative Image Task ===
+    # Handle to the in-flight speculative image generation of this run.
+    image_task_id: Optional[str] = None
+
     # === Start Timestamp ===
     # Automatically captures the time when the workflow begins.
     started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -81,3 +114,37 @@ class AgentState(BaseModel):
         if not v or not v.strip():
             raise ValueError("niche must not be empty")
         return v
+
+
+# ============================================================
+# 🪶 LeanAgentState
+# ------------------------------------------------------------
+# Same fields as AgentState as a slotted dataclass. LangGraph
+# rebuilds the state object from its channels before every node
+# and routing function; for AgentState that is a full Pydantic
+# validation, for this class a plain constructor call.
+# Used as the graph schema when AGENT_STATE_SCHEMA=lean. Run
+# inputs are still AgentState instances, so the API edge keeps
+# its validation.
+# ============================================================
+@dataclass(slots=True)
+class LeanAgentState:
+    """Unvalidated, attribute-compatible counterpart of `AgentState`."""
+
+    niche: str
+    messages: List[Any] = field(default_factory=list)
+    topic: Optional[str] = None
+    post_draft: Optional[str] = None
+    is_approved: bool = False
+    final_post: Optional[str] = None
+    review_feedback: Optional[str] = None
+    review_score: Optional[int] = None
+    models_used: Annotated[Dict[str, str], merge_models_used] = field(default_factory=dict)
+    current_node: str = "topic_generator"
+    iteration_count: int = 0
+    image_asset_urn: Optional[str] = None
+    image: Optional[Dict[str, Any]] = None
+    image_prompt: Optional[str] = None
+    image_task_id: Optional[str] = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
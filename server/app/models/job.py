@@ -0,0 +1,73 @@
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional, List, Dict, Any
+from uuid import uuid4
+
+
+# ============================================================
+# 🚦 JobStatus Enum
+# ------------------------------------------------------------
+# Lifecycle of a queued agent run:
+#   queued → running → completed | failed
+# ============================================================
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# ============================================================
+# 📋 Job Model
+# ------------------------------------------------------------
+# Tracks one background execution of the agent graph so that
+# clients can poll GET /agent/jobs/{id} for per-node progress
+# instead of holding the HTTP request open.
+# ============================================================
+class Job(BaseModel):
+    """
+    Status record for a single queued agent workflow run.
+    ----------------------------------------------------
+    Updated by the job queue workers as each graph node finishes.
+    """
+
+    # === Job Identifier ===
+    # Also the checkpoint thread ID of the run.
+    id: str = Field(default_factory=lambda: uuid4().hex)
+
+    # === Niche/Category ===
+    # The niche the workflow was started for.
+    niche: str
+
+    # === Status ===
+    status: JobStatus = JobStatus.QUEUED
+
+    # === Current Node ===
+    # Mirrors AgentState.current_node of the most recently finished node.
+    current_node: Optional[str] = None
+
+    # === Completed Nodes ===
+    # Graph nodes executed so far, in order (repeats on rework loops).
+    completed_nodes: List[str] = Field(default_factory=list)
+
+    # === Models Used ===
+    # Model that served each LLM node of this run.
+    models_used: Dict[str, str] = Field(default_factory=dict)
+
+    # === Final State ===
+    # Last state update emitted by the graph, set once the job completes.
+    result: Optional[Dict[str, Any]] = None
+
+    # === Resume Info ===
+    # Number of executions (1 + resumes) and the node the last resume restarted at.
+    attempts: int = 1
+    resumed_from: Optional[str] = None
+
+    # === Error Message ===
+    error: Optional[str] = None
+
+    # === Timestamps ===
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+# ============================================================
+# 🧭 ModelRoute Model
+# ------------------------------------------------------------
+# Which OpenAI model (and settings) serves one graph node.
+# Routes are configured per node via LLM_ROUTES; see
+# DEFAULT_LLM_ROUTES in app/utils/constants.py.
+# ============================================================
+class ModelRoute(BaseModel):
+    """
+    LLM settings for a single graph node.
+    """
+
+    # === Primary Model ===
+    model: str = "gpt-4o"
+    temperature: float = Field(0.7, ge=0, le=2)
+
+    # === Output Cap ===
+    # None leaves the completion length to the model.
+    max_tokens: Optional[int] = Field(None, gt=0)
+
+    # === Fallback Model ===
+    # Faster/cheaper model used when the primary breaches the latency
+    # SLO (raced after `latency_slo_seconds`) or keeps failing.
+    fallback_model: Optional[str] = None
+    latency_slo_seconds: Optional[float] = Field(None, gt=0)
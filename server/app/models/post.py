@@ -1,6 +1,23 @@
 from pydantic import BaseModel, Field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional, List
+
+
+# ============================================================
+# 🖼️ Image Blob Reference
+# ------------------------------------------------------------
+# Points at an image in the content-addressed blob store. The
+# bytes live there (stored once per distinct image) and are
+# streamed by GET /agent/images/{hash}; posts only keep this.
+# ============================================================
+class ImageBlob(BaseModel):
+    """Metadata of a stored image."""
+
+    hash: str = Field(..., description="SHA-256 of the image bytes (blob key)")
+    size: int = Field(..., description="Size in bytes")
+    width: int = Field(..., description="Width in pixels")
+    height: int = Field(..., description="Height in pixels")
+    content_type: str = Field("image/png", description="MIME type")
 
 
 # ============================================================
@@ -10,7 +27,7 @@ from typing import Optional
 # in MongoDB. Each post contains information such as:
 # - The platform it was created for (LinkedIn, Facebook, etc.)
 # - The actual post content (text)
-# - Optional image data (binary)
+# - An optional reference to its image in the blob store
 # - A timestamp indicating when the post was created.
 # ============================================================
 class Post(BaseModel):
@@ -35,14 +52,27 @@ class Post(BaseModel):
         description="Content of the post"
     )
 
-    # === Image Data (Optional) ===
-    # Stores binary image data (e.g., from Gemini AI image generation).
-    # This field may be None if the post is text-only.
-    image_data: Optional[bytes] = Field(
+    # === Image (Optional) ===
+    # Hash, size and dimensions of the image (e.g., from Gemini AI image
+    # generation) in the blob store. None if the post is text-only.
+    image: Optional[ImageBlob] = Field(
         None,
-        description="Binary image data generated by Gemini"
+        description="Stored image generated by Gemini"
     )
 
+    # === Run Record (Optional) ===
+    # What the workflow run knew when it published: the niche and topic,
+    # LinkedIn's image asset URN and publish response, the model behind
+    # each LLM node, the review outcome and when the run started.
+    niche: Optional[str] = Field(None, description="Niche the post was generated for")
+    topic: Optional[str] = Field(None, description="Generated topic")
+    image_urn: Optional[str] = Field(None, description="LinkedIn image asset URN")
+    linkedin_response: Optional[str] = Field(None, description="LinkedIn publish response")
+    models_used: Dict[str, str] = Field(default_factory=dict, description="Model per LLM node")
+    review_score: Optional[int] = Field(None, description="Final reviewer score (1-10)")
+    iteration_count: int = Field(0, description="Review/revision cycles")
+    started_at: Optional[datetime] = Field(None, description="Run start (UTC)")
+
     # === Timestamp (UTC) ===
     # Automatically records the UTC time when the post object is created.
     # Helps with ordering and history tracking in the database.
@@ -62,3 +92,33 @@ class NicheRequest(BaseModel):
     Example JSON: { "niche": "AI Marketing" }
     """
     niche: str
+
+
+# ==============================================================
+# 🔹 Batch Request Body Model
+#    Defines the structure for the POST /agent/batch request
+# ==============================================================
+
+class BatchRequest(BaseModel):
+    """
+    Represents the input model for the batch workflow API.
+    Example JSON: { "niches": ["AI", "Cloud"], "count_per_niche": 2 }
+    An empty `niches` list falls back to the POST_NICHE env var.
+    """
+    niches: List[str] = Field(default_factory=list)
+    count_per_niche: int = Field(1, ge=1, le=50)
+    max_parallelism: Optional[int] = Field(None, ge=1)
+
+
+# ==============================================================
+# 🔹 Post History Page
+#    Response of GET /agent/posts (newest first)
+# ==============================================================
+
+class PostPage(BaseModel):
+    """
+    One page of stored posts. Pass `next_cursor` back as `cursor`
+    to get the next (older) page; it is None on the last page.
+    """
+    items: List[Dict] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+# ============================================================
+# 🧑‍⚖️ ReviewVerdict Model
+# ------------------------------------------------------------
+# Structured output of the reviewer node: one call both judges
+# the draft and, when needed, returns a fixed version of it.
+# ============================================================
+class ReviewVerdict(BaseModel):
+    """
+    JSON verdict returned by the reviewer LLM.
+    """
+
+    # === Quality Score (1-10) ===
+    score: int = Field(..., ge=1, le=10)
+
+    # === Approval Flag ===
+    # True if the draft can be published as-is.
+    approved: bool
+
+    # === Critique ===
+    # Concise, actionable improvements (empty when approved).
+    critique: str = ""
+
+    # === Revised Draft ===
+    # The full post with the critique applied; None when approved.
+    revised_draft: Optional[str] = None
+
+
+# ============================================================
+# ✍️ SelfReviewedDraft Model
+# ------------------------------------------------------------
+# Output of the content creator in self-review mode: draft,
+# self-critique and final post produced in a single completion.
+# ============================================================
+class SelfReviewedDraft(BaseModel):
+    """
+    JSON output of the content creator when CONTENT_SELF_REVIEW is on.
+    """
+
+    draft: str
+    critique: str = ""
+    final_draft: str
+    score: int = Field(..., ge=1, le=10)
@@ -2,6 +2,8 @@ import json
 import requests
 from fastapi import APIRouter, HTTPException, Header
 from app.utils.logger import get_logger
+from app.services.metrics import track_external
+from app.services.http_client import get_session
 from app.utils.config import TOKEN_URL, USERINFO_URL, REDIRECT_URI
 
 # === Initialize logger ===
@@ -29,6 +31,8 @@ def get_access_token(data: dict):
         - redirect_uri = must match the app settings
         - client_id, client_secret = from LinkedIn Developer Portal
     3️⃣ Receive and return the access token from LinkedIn.
+    The call goes through the shared LinkedIn connection pool (with
+    timeouts); an unreachable LinkedIn is reported as HTTP 502.
     """
 
     # --- Extract data from frontend request ---
@@ -49,7 +53,12 @@ def get_access_token(data: dict):
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
     # --- Exchange code for access token ---
-    res = requests.post(TOKEN_URL, data=payload, headers=headers)
+    try:
+        with track_external("linkedin", "oauth_token"):
+            res = get_session("linkedin").post(TOKEN_URL, data=payload, headers=headers)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"LinkedIn token request failed: {e}")
+        raise HTTPException(status_code=502, detail=f"LinkedIn token request failed: {e}")
 
     # --- Handle LinkedIn API errors ---
     if res.status_code != 200:
@@ -92,7 +101,12 @@ def get_user_info(authorization: str = Header(...)):
     headers = {"Authorization": f"Bearer {access_token}"}
 
     # --- Fetch user info from LinkedIn ---
-    res = requests.get(USERINFO_URL, headers=headers)
+    try:
+        with track_external("linkedin", "userinfo"):
+            res = get_session("linkedin").get(USERINFO_URL, headers=headers)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"LinkedIn userinfo request failed: {e}")
+        raise HTTPException(status_code=502, detail=f"LinkedIn userinfo request failed: {e}")
 
     # --- Handle LinkedIn API response codes ---
     if res.status_code == 401:
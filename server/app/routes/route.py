@@ -1,9 +1,32 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import tempfile
+from uuid import uuid4
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.models.post import NicheRequest, BatchRequest, PostPage
+from app.services.mongodb_service import aget_posts
+from app.services.job_queue import job_queue
+from app.services.job_summary import job_summary_cache
+from app.services.blob_store import image_store
+from app.services.post_archive import (
+    MEDIA_TYPES,
+    aexport_posts,
+    aimport_posts,
+    aread_ndjson,
+    check_format,
+    import_posts,
+    read_parquet,
+)
+from app.services.batch_runner import run_batch
+from app.services.checkpoint_store import checkpoint_store
 from app.models.agent import AgentState
-from app.models.post import NicheRequest
-from app.services.mongodb_service import get_job_summary_from_summary_collection
+from app.utils.config import POST_NICHE, BATCH_MAX_PARALLELISM
+from app.utils.constants import JOB_QUEUE_FULL, JOB_NOT_FOUND, IMAGE_NOT_FOUND
 from app.utils.logger import get_logger
-from app.services.agent_graph import app
 
 # ==============================================================
 # 🔹 Setup: Logger and Router
@@ -15,50 +38,157 @@ router = APIRouter(prefix="/agent", tags=["Agent Workflow"])
 # ==============================================================
 # 🔹 Endpoint: Run Agent Workflow
 #    POST /agent/start
-#    Starts and executes the AI agent pipeline
+#    Enqueues the AI agent pipeline and returns a job ID
 # ==============================================================
 
-@router.post("/start")
-def run_agent_workflow(req: NicheRequest):
+@router.post("/start", status_code=202)
+async def run_agent_workflow(req: NicheRequest):
     """
-    🚀 Run the AI agent workflow for a given niche.
+    🚀 Queue the AI agent workflow for a given niche.
+
+    The run executes in the background job queue; poll
+    GET /agent/jobs/{job_id} for per-node progress.
 
     Flow:
         1️⃣ Receive the niche input from the user.
-        2️⃣ Initialize the AgentState with default values.
-        3️⃣ Start the agent workflow using `app.stream()`.
-        4️⃣ Log progress for each node executed in the graph.
-        5️⃣ Return the final workflow state upon completion.
+        2️⃣ Enqueue the run on the in-process job queue.
+        3️⃣ Return the job ID immediately (HTTP 202).
+        4️⃣ Reject with HTTP 503 when the queue is full.
     """
     try:
-        # Step 1: Initialize agent state with niche and default values
-        state = AgentState(
-            niche=req.niche,
-            topic=None,
-            post_draft=None,
-            final_post=None,
-            image_asset_urn=None,
-            is_approved=False,
-            iteration_count=0,
-        )
+        job = job_queue.submit(req.niche)
+        return {"status": "queued", "message": "Workflow queued", "job_id": job.id}
 
-        logger.info("🚀 Starting workflow for niche: %s", req.niche)
+    except asyncio.QueueFull:
+        logger.warning("Job queue full, rejecting niche: %s", req.niche)
+        raise HTTPException(status_code=503, detail=JOB_QUEUE_FULL.format(maxsize=job_queue.maxsize))
 
-        # Step 2: Stream through agent workflow steps
-        final_state = None
-        for s in app.stream(state):
-            node_name = list(s.keys())[0]
-            logger.info("➡ Node executed: %s", node_name)
-            final_state = s  # Capture latest state
 
-        # Step 3: Workflow successfully completed
-        logger.info("🎯 Workflow finished successfully for niche: %s", req.niche)
-        return {"status": "success", "message": "Workflow completed", "final_state": final_state}
+# ==============================================================
+# 🔹 Endpoint: Get Job Status
+#    GET /agent/jobs/{job_id}
+#    Reports status and per-node progress of a queued run
+# ==============================================================
 
-    # Step 4: Handle exceptions during workflow execution
-    except Exception as e:
-        logger.exception("❌ Workflow execution failed: %s", e)
-        raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    📋 Return the status record of a queued workflow run.
+
+    Includes `current_node` (from AgentState), the list of
+    completed nodes, timestamps, and the final state once done.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=JOB_NOT_FOUND.format(job_id=job_id))
+    return job
+
+
+# ==============================================================
+# 🔹 Endpoint: Resume Job
+#    POST /agent/jobs/{job_id}/resume
+#    Restarts a failed run from its last successful node
+# ==============================================================
+
+@router.post("/jobs/{job_id}/resume", status_code=202)
+async def resume_job(job_id: str):
+    """
+    🔁 Resume a failed run from its checkpoint.
+
+    Topic, draft, review and image results already checkpointed are
+    reused; only the failed node onwards is executed again.
+    """
+    if not checkpoint_store.enabled:
+        raise HTTPException(status_code=400, detail="Checkpointing is disabled (CHECKPOINT_BACKEND=none)")
+
+    try:
+        job = await job_queue.resume(job_id)
+        return {"status": "queued", "message": f"Resuming at {job.resumed_from}", "job_id": job.id}
+
+    except LookupError:
+        raise HTTPException(status_code=404, detail=JOB_NOT_FOUND.format(job_id=job_id))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail=JOB_QUEUE_FULL.format(maxsize=job_queue.maxsize))
+
+
+# ==============================================================
+# 🔹 Endpoint: Run Batch Workflow
+#    POST /agent/batch
+#    Runs many niches concurrently and streams results (NDJSON)
+# ==============================================================
+
+@router.post("/batch")
+async def run_batch_workflow(req: BatchRequest):
+    """
+    📦 Run the workflow for many niches concurrently.
+
+    Flow:
+        1️⃣ Resolve niches from the request (or the POST_NICHE env var).
+        2️⃣ Fan out `count_per_niche` runs per niche, capped at
+           `max_parallelism` (default BATCH_MAX_PARALLELISM).
+        3️⃣ Stream one NDJSON "result" line per run as it completes.
+        4️⃣ Finish with a "summary" line (throughput and latency stats).
+    """
+    niches = [n.strip() for n in (req.niches or POST_NICHE.split(",")) if n and n.strip()]
+    if not niches:
+        raise HTTPException(status_code=400, detail="No niches provided")
+
+    parallelism = min(req.max_parallelism or BATCH_MAX_PARALLELISM, BATCH_MAX_PARALLELISM)
+
+    async def ndjson_stream():
+        async for event in run_batch(niches, req.count_per_niche, parallelism):
+            yield json.dumps(jsonable_encoder(event)) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+
+# ==============================================================
+# 🔹 Endpoint: Stream Agent Workflow
+#    GET /agent/stream?niche=...
+#    Runs the pipeline and streams progress as Server-Sent Events
+# ==============================================================
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+@router.get("/stream")
+async def stream_agent_workflow(niche: str):
+    """
+    📡 Run the workflow for `niche` and stream it over SSE.
+
+    Event types:
+        node_start / node_end:  a graph node began / finished (with its update)
+        token:                  an LLM token for the draft, critique or topic
+        done / error:           the run finished or raised
+
+    Usable directly from the browser with `new EventSource(...)`.
+    """
+    if not niche or not niche.strip():
+        raise HTTPException(status_code=400, detail="niche must not be empty")
+
+    from app.services.agent_graph import stream_workflow_events
+
+    thread_id = uuid4().hex
+
+    async def event_stream():
+        logger.info("📡 Streaming workflow for niche: %s", niche)
+        try:
+            async for event in stream_workflow_events(AgentState(niche=niche), thread_id=thread_id):
+                yield _sse(event["event"], event)
+            yield _sse("done", {"event": "done", "niche": niche, "thread_id": thread_id})
+        except Exception as e:
+            logger.exception("❌ Streamed workflow failed: %s", e)
+            yield _sse("error", {"event": "error", "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ==============================================================
@@ -68,37 +198,177 @@ def run_agent_workflow(req: NicheRequest):
 # ==============================================================
 
 @router.get("/summary")
-def get_jobs_summary():
+async def get_jobs_summary(
+    granularity: Literal["hour", "day"] = Query("hour", description="Bucket size of the breakdowns"),
+    periods: int = Query(24, ge=1, le=720, description="Number of buckets, the current one included"),
+):
     """
-    ✅ Returns total completed and failed jobs.
+    ✅ Returns total completed and failed jobs (all-time, with failure
+    counts per node and reason), plus per-niche, per-node and
+    per-bucket breakdowns over the last `periods` buckets.
 
     Flow:
-        1️⃣ Log start of summary retrieval.
-        2️⃣ Fetch summary data from MongoDB via helper function.
-        3️⃣ Log and return total completed and failed job counts.
-        4️⃣ Handle exceptions with HTTP 500 response.
+        1️⃣ Serve the summary from the in-memory TTL cache, which
+           refreshes from the pre-aggregated counters when stale.
+        2️⃣ Log and return the counts.
+        3️⃣ Handle exceptions with HTTP 500 response.
     """
     try:
-        # Step 1: Log fetching action
-        print("Fetching job summary from database...")
-
-        # Step 2: Retrieve summary data from MongoDB
-        job_summary = get_job_summary_from_summary_collection()  
+        # Step 1: Cached summary (at most one refresh per TTL and window)
+        job_summary = await job_summary_cache.get(granularity, periods)
 
-        # Step 3: Log summary result
-        logger.info(
-            "Job summary fetched: completed=%d, failed=%d",
+        # Step 2: Log summary result
+        logger.debug(
+            "Job summary served: completed=%d, failed=%d",
             job_summary["total_completed"],
             job_summary["total_failed"]
         )
-        
-        # Step 4: Return structured JSON response
-        return {
-            "total_completed": job_summary["total_completed"],
-            "total_failed": job_summary["total_failed"]
-        }
-
-    # Step 5: Handle MongoDB or runtime errors
+        return job_summary
+
+    # Step 3: Handle MongoDB or runtime errors
     except Exception as e:
         logger.exception("Failed to fetch job summary: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch job summary: {str(e)}")
+
+
+# ==============================================================
+# 🔹 Endpoint: Post History
+#    GET /agent/posts
+#    Newest-first pages of published posts (keyset pagination)
+# ==============================================================
+
+@router.get("/posts", response_model=PostPage)
+async def list_posts(
+    niche: Optional[str] = Query(None, description="Only posts generated for this niche"),
+    platform: Optional[str] = Query(None, description="Only posts for this platform, e.g. LinkedIn"),
+    since: Optional[datetime] = Query(None, description="Posted at or after (ISO 8601)"),
+    until: Optional[datetime] = Query(None, description="Posted before (ISO 8601)"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. topic,niche,image"),
+):
+    """
+    ✅ Lists stored posts with their run records, newest first.
+
+    Flow:
+        1️⃣ Filter by niche, platform and date range.
+        2️⃣ Continue after `cursor` (an index seek, not a skip).
+        3️⃣ Project `fields` (binary fields are never returned; images
+           are referenced by hash, see GET /agent/images/{hash}).
+        4️⃣ Return the page and the cursor of the next one.
+        5️⃣ Reject malformed cursors or unknown fields with HTTP 400.
+    """
+    try:
+        items, next_cursor = await aget_posts(
+            niche=niche, platform=platform, since=since, until=until, cursor=cursor, limit=limit,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        )
+        return PostPage(items=jsonable_encoder(items), next_cursor=next_cursor)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Failed to list posts: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to list posts: {str(e)}")
+
+
+# ==============================================================
+# 🔹 Endpoint: Post Export
+#    GET /agent/posts/export
+#    Streams the whole (filtered) post history as NDJSON or Parquet
+# ==============================================================
+
+@router.get("/posts/export")
+async def export_posts(
+    format: Literal["ndjson", "parquet"] = Query("ndjson", description="NDJSON (Extended JSON) or Parquet"),
+    niche: Optional[str] = Query(None, description="Only posts generated for this niche"),
+    platform: Optional[str] = Query(None, description="Only posts for this platform, e.g. LinkedIn"),
+    since: Optional[datetime] = Query(None, description="Posted at or after (ISO 8601)"),
+    until: Optional[datetime] = Query(None, description="Posted before (ISO 8601)"),
+    strip_images: bool = Query(True, description="Leave inline legacy image bytes out"),
+):
+    """
+    ✅ Downloads stored posts, oldest first, for analytics or migration.
+
+    Posts are read through one server-side cursor and written out a
+    batch at a time (POST_ARCHIVE_BATCH_SIZE), so memory use does not
+    grow with the collection. Parquet needs the optional pyarrow
+    package (HTTP 400 without it).
+    """
+    try:
+        check_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    chunks = aexport_posts(
+        format, niche=niche, platform=platform, since=since, until=until, strip_images=strip_images
+    )
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers={
+        "Content-Disposition": f'attachment; filename="posts.{format}"',
+    })
+
+
+# ==============================================================
+# 🔹 Endpoint: Post Import
+#    POST /agent/posts/import
+#    Bulk-inserts posts from an NDJSON or Parquet export
+# ==============================================================
+
+@router.post("/posts/import")
+async def import_posts_endpoint(
+    request: Request,
+    format: Literal["ndjson", "parquet"] = Query("ndjson", description="Format of the request body"),
+):
+    """
+    ✅ Inserts the posts of an export (the raw request body).
+
+    Flow:
+        1️⃣ NDJSON is parsed as the body streams in; Parquet (which
+           keeps its index at the end of the file) is spooled to a
+           temporary file first.
+        2️⃣ Posts are inserted with one unordered insert_many per
+           batch; posts already present (same id) are skipped.
+        3️⃣ Return the inserted and skipped counts; HTTP 400 on a
+           malformed body.
+    """
+    try:
+        check_format(format)
+        if format == "ndjson":
+            return await aimport_posts(aread_ndjson(request.stream()))
+
+        with tempfile.TemporaryFile() as spool:
+            async for chunk in request.stream():
+                await asyncio.to_thread(spool.write, chunk)
+            await asyncio.to_thread(spool.seek, 0)
+            return await asyncio.to_thread(import_posts, read_parquet(spool))
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Failed to import posts: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to import posts: {str(e)}")
+
+
+# ==============================================================
+# 🔹 Stored Image Endpoint
+#    Streams a post image from the blob store by content hash
+# ==============================================================
+
+@router.get("/images/{image_hash}")
+async def get_image(image_hash: str):
+    """
+    ✅ Streams a stored post image in chunks.
+
+    Post documents only reference images by hash (`image.hash`); the
+    bytes are read here, on demand. Content is immutable per hash, so
+    clients and proxies may cache the response indefinitely.
+    """
+    opened = await image_store.aopen(image_hash)
+    if opened is None:
+        raise HTTPException(status_code=404, detail=IMAGE_NOT_FOUND.format(image_hash=image_hash))
+
+    content_type, chunks = opened
+    return StreamingResponse(chunks, media_type=content_type, headers={
+        "ETag": f'"{image_hash}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+    })
@@ -1,28 +1,74 @@
 from __future__ import annotations
+import asyncio
+import contextlib
+import functools
 import os
-from typing import Optional, Dict
-from datetime import datetime, timezone
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator, List, NamedTuple, Optional, Dict, Tuple
+from datetime import datetime
+from uuid import uuid4
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from langgraph.prebuilt import create_react_agent
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from pydantic import ValidationError
 
 from app.services.linkedin_service import post_to_linkedin, upload_media_to_linkedin
-from app.services.gemini_service import generate_gemini_image
-from app.services.mongodb_service import save_post
-from app.services.mongodb_service import increment_total_completed, increment_total_failed
+from app.services.linkedin_service import apost_to_linkedin, aupload_media_to_linkedin
+from app.services.gemini_service import generate_gemini_image, agenerate_gemini_image
+from app.services.post_outbox import post_outbox
+from app.services.job_counters import job_counters
+from app.services.mongodb_service import get_llm_cache_collection
+from app.services.llm_cache import build_llm_cache
+from app.services.topic_index import topic_index
+from app.services.blob_store import image_store
+from app.services.rate_limiter import rate_limit, arate_limit, estimate_tokens
+from app.services.resilience import resilient, aresilient, timeout, within_timeout
+from app.services.metrics import llm_usage_callback, register_cache_metrics, timed_node, track_run, LLM_FALLBACKS
 from app.utils.logger import get_logger
-from app.utils.config import OPENAI_API_KEY
-from app.models.agent import AgentState
+from app.utils.config import (
+    OPENAI_API_KEY,
+    AGENT_GRAPH_MODE,
+    SPECULATIVE_IMAGE_ON_DRIFT,
+    IMAGE_DRIFT_THRESHOLD,
+    LLM_CACHE_NODES,
+    LLM_CACHE_MAXSIZE,
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_SQLITE_PATH,
+    REVIEWER_MODE,
+    CONTENT_SELF_REVIEW,
+    TOPIC_DEDUP_ENABLED,
+    TOPIC_DEDUP_THRESHOLD,
+    TOPIC_DEDUP_MAX_RETRIES,
+    LLM_COMPLETION_TOKEN_ESTIMATE,
+    LLM_HEDGE_AFTER_SECONDS,
+    LLM_ROUTES,
+    PROVIDER_MODE,
+    AGENT_STATE_SCHEMA,
+)
+from app.models.agent import AgentState, LeanAgentState
+from app.models.review import ReviewVerdict, SelfReviewedDraft
+from app.models.model_route import ModelRoute
 from app.utils.constants import (
     TOPIC_GENERATOR_SYSTEM_PROMPT,
     TOPIC_GENERATOR_USER_PROMPT,
+    TOPIC_GENERATOR_RETRY_USER_PROMPT,
     CONTENT_CREATOR_SYSTEM_PROMPT,
     CONTENT_CREATOR_USER_PROMPT,
     REVIEWER_SYSTEM_PROMPT,
+    REVIEWER_STRUCTURED_SYSTEM_PROMPT,
+    REVIEWER_USER_PROMPT,
+    CONTENT_REVISION_USER_PROMPT,
+    CONTENT_SELF_REVIEW_SYSTEM_PROMPT,
     POST_EXECUTOR_SUCCESS_MESSAGE,
     POST_EXECUTOR_FAILURE_MESSAGE,
+    LINKEDIN_POST_SUCCESS,
+    DEFAULT_LLM_ROUTES,
 )
 
 # ============================================================
@@ -31,54 +77,465 @@ from app.utils.constants import (
 logger = get_logger(__name__)
 
 MAX_ITERATIONS = 1
-llm = ChatOpenAI(model="gpt-4o", temperature=0.7, openai_api_key=OPENAI_API_KEY)
 
 # ============================================================
-# ⚙️ DEFINE LANGGRAPH TOOLS & AGENT
+# 🗃️ LLM RESPONSE CACHE
+#    Completions are cached by (model params, rendered prompt).
+#    Only nodes listed in LLM_CACHE_NODES use it. Opened on first
+#    use (or by `warm_up`), not at import.
+# ============================================================
+@functools.lru_cache(maxsize=None)
+def get_llm_cache():
+    cache = build_llm_cache(
+        LLM_CACHE_BACKEND,
+        maxsize=LLM_CACHE_MAXSIZE,
+        ttl_seconds=LLM_CACHE_TTL_SECONDS,
+        sqlite_path=LLM_CACHE_SQLITE_PATH,
+        mongo_collection=get_llm_cache_collection() if LLM_CACHE_BACKEND == "mongo" else None,
+    )
+    register_cache_metrics(cache)
+    return cache
+
+# ============================================================
+# 🧭 PER-NODE MODEL ROUTING
+#    DEFAULT_LLM_ROUTES merged with the LLM_ROUTES overrides; nodes
+#    without a route use "default".
+# ============================================================
+LLM_ROUTING: Dict[str, ModelRoute] = {
+    node: ModelRoute(**{**DEFAULT_LLM_ROUTES.get(node, {}), **LLM_ROUTES.get(node, {})})
+    for node in {*DEFAULT_LLM_ROUTES, *LLM_ROUTES}
+}
+
+
+class LLMReply(NamedTuple):
+    text: str
+    model: str
+
+
+def _route(node: str) -> ModelRoute:
+    return LLM_ROUTING.get(node, LLM_ROUTING["default"])
+
+
+@functools.lru_cache(maxsize=None)
+def _chat_model(model: str, temperature: float, max_tokens: Optional[int], cached: bool) -> ChatOpenAI:
+    """One shared client per distinct model/settings combination."""
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import FakeChatModel
+
+        return FakeChatModel(
+            model=model, temperature=temperature, max_tokens=max_tokens,
+            callbacks=[llm_usage_callback], cache=get_llm_cache() if cached else None,
+        )
+    # Retries/timeouts are owned by app.services.resilience, not the OpenAI client
+    return ChatOpenAI(
+        model=model, temperature=temperature, max_tokens=max_tokens, openai_api_key=OPENAI_API_KEY,
+        timeout=timeout("openai"), max_retries=0, callbacks=[llm_usage_callback],
+        cache=get_llm_cache() if cached else None,
+    )
+
+
+def _llm_for(node: str, model: Optional[str] = None):
+    """Chat model for `node` per its route (`model` overrides, e.g. the fallback)."""
+    route = _route(node)
+    return _chat_model(model or route.model, route.temperature, route.max_tokens, node in LLM_CACHE_NODES)
+
+
 # ============================================================
-posting_tools = [post_to_linkedin, generate_gemini_image, save_post]
-posting_agent = create_react_agent(model=llm, tools=posting_tools)
+# 🧩 NODE HELPERS
+#    Prompt construction and result handling shared by the sync
+#    and async node implementations below.
+# ============================================================
+
+# Prompt templates are built once at import; nodes only fill in the
+# variables (niche, topic, draft), so no run pays for template parsing.
+TOPIC_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", TOPIC_GENERATOR_SYSTEM_PROMPT),
+    ("user", TOPIC_GENERATOR_USER_PROMPT),
+])
+
+TOPIC_RETRY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", TOPIC_GENERATOR_SYSTEM_PROMPT),
+    ("user", TOPIC_GENERATOR_RETRY_USER_PROMPT),
+])
+
+CONTENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CONTENT_CREATOR_SYSTEM_PROMPT),
+    ("user", CONTENT_CREATOR_USER_PROMPT),
+])
+
+CONTENT_REVISION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CONTENT_CREATOR_SYSTEM_PROMPT),
+    ("user", CONTENT_REVISION_USER_PROMPT),
+])
+
+CONTENT_SELF_REVIEW_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CONTENT_SELF_REVIEW_SYSTEM_PROMPT),
+    ("user", CONTENT_CREATOR_USER_PROMPT),
+])
+
+REVIEW_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", REVIEWER_STRUCTURED_SYSTEM_PROMPT if REVIEWER_MODE == "structured" else REVIEWER_SYSTEM_PROMPT),
+    ("user", REVIEWER_USER_PROMPT),
+])
+
+
+def _content_request(state: AgentState) -> Tuple[ChatPromptTemplate, Dict[str, Any], bool]:
+    """
+    Pick the content creator's prompt: self-review (JSON), revision of the
+    previous draft against the reviewer's critique, or a fresh draft.
+    Returns (prompt, inputs, json_mode).
+    """
+    if CONTENT_SELF_REVIEW:
+        return CONTENT_SELF_REVIEW_PROMPT, {"topic": state.topic}, True
+
+    if state.review_feedback and state.post_draft:
+        inputs = {"topic": state.topic, "post_draft": state.post_draft, "feedback": state.review_feedback}
+        return CONTENT_REVISION_PROMPT, inputs, False
+
+    return CONTENT_PROMPT, {"topic": state.topic}, False
+
+
+def _llm_budget(prompt: ChatPromptTemplate, inputs: Dict[str, Any], route: ModelRoute) -> int:
+    """Estimated tokens (rendered prompt + expected completion) for the TPM limiter."""
+    text = "\n".join(str(m.content) for m in prompt.format_messages(**inputs))
+    return estimate_tokens(text, route.max_tokens or LLM_COMPLETION_TOKEN_ESTIMATE)
+
+
+def _usage_tokens(result) -> int:
+    return (getattr(result, "usage_metadata", None) or {}).get("total_tokens", 0)
+
+
+def _invoke_llm(node: str, prompt: ChatPromptTemplate, inputs: Dict[str, Any], json_mode: bool = False) -> LLMReply:
+    """
+    Run `prompt | model` for `node` on its routed model and return the
+    stripped completion text with the model that produced it. With
+    `json_mode` the model is constrained to emit a single JSON object.
+    The route's fallback model is used if the primary keeps failing.
+    """
+    route = _route(node)
+    budget = _llm_budget(prompt, inputs, route)
+
+    def call(model_name: str) -> Callable[[], LLMReply]:
+        model = _llm_for(node, model_name)
+        if json_mode:
+            model = model.bind(response_format={"type": "json_object"})
+
+        def attempt() -> LLMReply:
+            with rate_limit("openai", budget) as permit:
+                result = (prompt | model).invoke(inputs)
+                permit.settle(_usage_tokens(result))
+            return LLMReply(result.content.strip(), model_name)
+        return attempt
+
+    try:
+        return resilient("openai", node, call(route.model))
+    except Exception as e:
+        if not route.fallback_model:
+            raise
+        logger.warning("⚠️ %s failed on %s (%s), falling back to %s", node, route.model, e, route.fallback_model)
+        LLM_FALLBACKS.labels(node, "error").inc()
+        return resilient("openai", node, call(route.fallback_model))
+
+
+async def _ainvoke_llm(node: str, prompt: ChatPromptTemplate, inputs: Dict[str, Any], json_mode: bool = False) -> LLMReply:
+    """
+    Async version of `_invoke_llm`. When the route sets a latency SLO,
+    a request to the fallback model is raced against a primary request
+    that has not answered within it.
+    """
+    route = _route(node)
+    budget = _llm_budget(prompt, inputs, route)
+
+    def call(model_name: str) -> Callable[[], Any]:
+        model = _llm_for(node, model_name)
+        if json_mode:
+            model = model.bind(response_format={"type": "json_object"})
+
+        async def attempt() -> LLMReply:
+            async with arate_limit("openai", budget) as permit:
+                result = await within_timeout("openai", (prompt | model).ainvoke(inputs))
+                permit.settle(_usage_tokens(result))
+            return LLMReply(result.content.strip(), model_name)
+        return attempt
+
+    slo_fallback = route.fallback_model and route.latency_slo_seconds
+    try:
+        reply = await aresilient(
+            "openai", node, call(route.model),
+            hedge_after=route.latency_slo_seconds if slo_fallback else LLM_HEDGE_AFTER_SECONDS,
+            hedge_factory=call(route.fallback_model) if slo_fallback else None,
+        )
+    except Exception as e:
+        if not route.fallback_model:
+            raise
+        logger.warning("⚠️ %s failed on %s (%s), falling back to %s", node, route.model, e, route.fallback_model)
+        LLM_FALLBACKS.labels(node, "error").inc()
+        return await aresilient("openai", node, call(route.fallback_model))
+
+    if reply.model != route.model:
+        LLM_FALLBACKS.labels(node, "latency_slo").inc()
+    return reply
+
+
+def _topic_fallback(state: AgentState) -> Dict[str, Optional[str]]:
+    fallback = f"{state.niche} insight {datetime.utcnow().isoformat()}"
+    return {"topic": fallback, "current_node": "topic_generator"}
+
+
+def _duplicate_of(topic: str, vector) -> Optional[str]:
+    """Return the already-posted topic `topic` near-duplicates, if any."""
+    score, match = topic_index.nearest(vector)
+    if score < TOPIC_DEDUP_THRESHOLD:
+        return None
+    logger.info("♻️ Near-duplicate topic (similarity %.2f with %r): %s", score, match, topic)
+    return match
+
+
+def _unique_topic(state: AgentState, topic: str) -> str:
+    """Regenerate `topic` while it near-duplicates a past post (see topic_index)."""
+    avoid = []
+    for attempt in range(TOPIC_DEDUP_MAX_RETRIES + 1):
+        try:
+            match = _duplicate_of(topic, topic_index.embed(topic))
+        except Exception as e:
+            logger.warning("⚠️ Topic de-duplication unavailable: %s", e)
+            return topic
+        if match is None:
+            return topic
+        if attempt == TOPIC_DEDUP_MAX_RETRIES:
+            logger.warning("⚠️ No unique topic after %d retries, keeping: %s", attempt, topic)
+            return topic
+        avoid += [match, topic]
+        topic = _invoke_llm("topic_generator", TOPIC_RETRY_PROMPT, {"niche": state.niche, "avoid": "\n".join(avoid)}).text
+    return topic
+
+
+async def _aunique_topic(state: AgentState, topic: str) -> str:
+    """Async version of `_unique_topic`."""
+    avoid = []
+    for attempt in range(TOPIC_DEDUP_MAX_RETRIES + 1):
+        try:
+            match = _duplicate_of(topic, await topic_index.aembed(topic))
+        except Exception as e:
+            logger.warning("⚠️ Topic de-duplication unavailable: %s", e)
+            return topic
+        if match is None:
+            return topic
+        if attempt == TOPIC_DEDUP_MAX_RETRIES:
+            logger.warning("⚠️ No unique topic after %d retries, keeping: %s", attempt, topic)
+            return topic
+        avoid += [match, topic]
+        reply = await _ainvoke_llm("topic_generator", TOPIC_RETRY_PROMPT, {"niche": state.niche, "avoid": "\n".join(avoid)})
+        topic = reply.text
+    return topic
+
+
+def _content_outcome(state: AgentState, content: str) -> Dict[str, Any]:
+    """
+    Turn the content creator's completion into a state update. In
+    self-review mode the JSON result is already final and approved.
+    """
+    if CONTENT_SELF_REVIEW:
+        try:
+            reviewed = SelfReviewedDraft.model_validate_json(content)
+        except ValidationError:
+            logger.warning("⚠️ Self-review output was not valid JSON, sending draft to reviewer.")
+            return {"post_draft": content, "review_feedback": None, "current_node": "content_creator"}
+
+        logger.info("✍️ Post drafted and self-reviewed (score %d).", reviewed.score)
+        return {
+            "post_draft": reviewed.draft,
+            "final_post": reviewed.final_draft,
+            "review_feedback": reviewed.critique or None,
+            "review_score": reviewed.score,
+            "is_approved": True,
+            "current_node": "content_creator",
+        }
+
+    logger.info("✍️ Post draft created successfully.")
+    return {"post_draft": content, "review_feedback": None, "current_node": "content_creator"}
+
+
+def _review_fallback(current_iter: int) -> str:
+    return "APPROVED" if current_iter >= MAX_ITERATIONS else "Minor rewrite suggested."
+
+
+def _parse_verdict(content: str) -> ReviewVerdict:
+    """
+    Parse the reviewer's completion into a `ReviewVerdict`. Plain-text
+    replies (REVIEWER_MODE=text, fallbacks, or malformed JSON) fall back
+    to the legacy rule: "APPROVED" anywhere means approved, anything else
+    is a critique.
+    """
+    if REVIEWER_MODE == "structured":
+        try:
+            return ReviewVerdict.model_validate_json(content)
+        except ValidationError:
+            logger.warning("⚠️ Reviewer output was not a valid verdict, using text rules.")
+
+    approved = "APPROVED" in content.upper()
+    return ReviewVerdict(score=10 if approved else 5, approved=approved, critique="" if approved else content)
+
+
+def _review_outcome(state: AgentState, content: str, current_iter: int) -> Dict[str, Any]:
+    """Turn the reviewer's verdict into a state update."""
+    verdict = _parse_verdict(content)
+    update: Dict[str, Any] = {
+        "current_node": "reviewer",
+        "iteration_count": current_iter,
+        "review_score": verdict.score,
+    }
+
+    if verdict.approved:
+        logger.info("✅ Post approved (score %d).", verdict.score)
+        return {**update, "is_approved": True, "final_post": state.post_draft, "review_feedback": None}
+
+    if verdict.revised_draft:
+        # The reviewer already applied its own critique: publish the revision
+        # instead of paying for another draft/review round trip.
+        logger.info("✅ Post approved with reviewer revision (score %d).", verdict.score)
+        return {
+            **update,
+            "is_approved": True,
+            "final_post": verdict.revised_draft,
+            "review_feedback": verdict.critique or None,
+        }
+
+    if current_iter >= MAX_ITERATIONS:
+        logger.warning("⚠️ Max iterations reached, forcing approval.")
+        return {**update, "is_approved": True, "final_post": state.post_draft, "review_feedback": verdict.critique}
+
+    logger.info("🔁 Rework suggested (iteration %d): %s", current_iter, verdict.critique[:80])
+    return {**update, "is_approved": False, "review_feedback": verdict.critique}
+
+
+def _write_temp_image(image_bytes: bytes) -> str:
+    """Write image bytes to a unique temp file so concurrent runs never collide."""
+    fd, path = tempfile.mkstemp(prefix="agent_image_", suffix=".png")
+    with os.fdopen(fd, "wb") as f:
+        f.write(image_bytes)
+    logger.info(f"✅ Image saved at {path}")
+    return path
+
+
+def _remove_temp_image(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+        logger.info("🧹 Temporary image file removed.")
+
+
+class GeneratedImage(NamedTuple):
+    asset_urn: Optional[str]
+    blob: Optional[Dict[str, Any]]
+
+
+NO_IMAGE = GeneratedImage(None, None)
+
+
+def _store_image(image_bytes: bytes) -> Optional[Dict[str, Any]]:
+    """Keep the image in the blob store; a storage failure only costs the archive copy."""
+    try:
+        return image_store.put(image_bytes)
+    except Exception as e:
+        logger.error("❌ Could not store generated image: %s", e)
+        return None
+
+
+async def _astore_image(image_bytes: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        return await image_store.aput(image_bytes)
+    except Exception as e:
+        logger.error("❌ Could not store generated image: %s", e)
+        return None
+
+
+def _generate_and_upload_image(prompt_text: str) -> GeneratedImage:
+    """Generate an image for `prompt_text` with Gemini, store it and upload it to LinkedIn."""
+    image_bytes = generate_gemini_image.invoke(prompt_text)
+    if not image_bytes:
+        logger.warning("⚠️ Image generation returned no data. Skipping image.")
+        return NO_IMAGE
+
+    blob = _store_image(image_bytes)
+    temp_path = _write_temp_image(image_bytes)
+    try:
+        return GeneratedImage(upload_media_to_linkedin(temp_path), blob)
+    finally:
+        _remove_temp_image(temp_path)
+
+
+async def _agenerate_and_upload_image(prompt_text: str) -> GeneratedImage:
+    """Async version of `_generate_and_upload_image` (storage and upload run concurrently)."""
+    image_bytes = await agenerate_gemini_image(prompt_text)
+    if not image_bytes:
+        logger.warning("⚠️ Image generation returned no data. Skipping image.")
+        return NO_IMAGE
+
+    temp_path = await asyncio.to_thread(_write_temp_image, image_bytes)
+    try:
+        blob, asset_urn = await asyncio.gather(_astore_image(image_bytes), aupload_media_to_linkedin(temp_path))
+        return GeneratedImage(asset_urn, blob)
+    finally:
+        _remove_temp_image(temp_path)
+
+
+def _is_asset_urn(asset_urn: Optional[str]) -> bool:
+    return bool(asset_urn and asset_urn.startswith("urn:li:asset:"))
+
+
+def _image_outcome(image: GeneratedImage) -> Dict[str, Any]:
+    if _is_asset_urn(image.asset_urn):
+        logger.info("🖼️ Image asset URN generated: %s", image.asset_urn)
+        return {"image_asset_urn": image.asset_urn, "image": image.blob, "current_node": "image_generation"}
+    logger.warning("⚠️ Image upload failed, post will be text-only.")
+    return {"image_asset_urn": None, "image": None, "current_node": "image_generation"}
+
+
+def _post_record(state: AgentState, linkedin_response: str) -> Dict[str, Any]:
+    return {
+        "platform": "LinkedIn",
+        "niche": state.niche,
+        "topic": state.topic,
+        "content": state.final_post,
+        "image_urn": state.image_asset_urn,
+        "image": state.image,
+        "linkedin_response": linkedin_response,
+        "models_used": state.models_used,
+        "review_score": state.review_score,
+        "iteration_count": state.iteration_count,
+        "started_at": state.started_at,
+    }
+
 
 # ============================================================
-# 🧩 NODE IMPLEMENTATIONS
+# 🧩 NODE IMPLEMENTATIONS (SYNC)
 # ============================================================
 
 def topic_generator_node(state: AgentState) -> Dict[str, Optional[str]]:
     """Generate a relevant post topic based on the provided niche."""
     try:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", TOPIC_GENERATOR_SYSTEM_PROMPT),
-            ("user", TOPIC_GENERATOR_USER_PROMPT.format(niche=state.niche)),
-        ])
-        chain = prompt | llm
-        result = chain.invoke({"niche": state.niche})
-        topic = result.content.strip()
+        reply = _invoke_llm("topic_generator", TOPIC_PROMPT, {"niche": state.niche})
+        topic = reply.text
+        if TOPIC_DEDUP_ENABLED:
+            topic = _unique_topic(state, topic)
 
         logger.info("✅ Topic generated: %s", topic)
-        return {"topic": topic, "current_node": "topic_generator"}
+        return {"topic": topic, "current_node": "topic_generator", "models_used": {"topic_generator": reply.model}}
     except Exception as e:
         logger.exception("❌ Topic generation failed: %s", e)
-        increment_total_failed()  # ✅ Record failure
-        fallback = f"{state.niche} insight {datetime.utcnow().isoformat()}"
-        return {"topic": fallback, "current_node": "topic_generator"}
+        job_counters.record_failed("topic_generator", e, state.niche)  # ✅ Record failure
+        return _topic_fallback(state)
 
 
 def content_creator_node(state: AgentState) -> Dict[str, Optional[str]]:
     """Generate a professional LinkedIn post draft for the chosen topic."""
     try:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", CONTENT_CREATOR_SYSTEM_PROMPT),
-            ("user", CONTENT_CREATOR_USER_PROMPT.format(topic=state.topic)),
-        ])
-        chain = prompt | llm
-        result = chain.invoke({"topic": state.topic})
-        post_draft = result.content.strip()
-
-        logger.info("✍️ Post draft created successfully.")
-        return {"post_draft": post_draft, "current_node": "content_creator"}
+        prompt, inputs, json_mode = _content_request(state)
+        reply = _invoke_llm("content_creator", prompt, inputs, json_mode=json_mode)
+        return {**_content_outcome(state, reply.text), "models_used": {"content_creator": reply.model}}
     except Exception as e:
         logger.exception("❌ Content creation failed: %s", e)
-        increment_total_failed()  # ✅ Record failure
+        job_counters.record_failed("content_creator", e, state.niche)  # ✅ Record failure
         return {"post_draft": f"{state.topic} — quick insight", "current_node": "content_creator"}
 
 
@@ -86,114 +543,329 @@ def reviewer_node(state: AgentState) -> Dict[str, Optional[str]]:
     """Review and refine post drafts until approval or iteration limit reached."""
     current_iter = state.iteration_count + 1
 
+    models_used = {}
     try:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", REVIEWER_SYSTEM_PROMPT),
-            ("user", f"Critique this draft:\n\n{state.post_draft}"),
-        ])
-        chain = prompt | llm
-        result = chain.invoke({"post_draft": state.post_draft})
-        content = result.content.strip()
+        reply = _invoke_llm(
+            "reviewer", REVIEW_PROMPT, {"post_draft": state.post_draft},
+            json_mode=REVIEWER_MODE == "structured",
+        )
+        content, models_used = reply.text, {"reviewer": reply.model}
     except Exception as e:
         logger.exception("⚠️ Review step failed: %s", e)
-        increment_total_failed()  # ✅ Record failure
-        content = "APPROVED" if current_iter >= MAX_ITERATIONS else "Minor rewrite suggested."
+        job_counters.record_failed("reviewer", e, state.niche)  # ✅ Record failure
+        content = _review_fallback(current_iter)
 
-    if "APPROVED" in content.upper() or current_iter >= MAX_ITERATIONS:
-        if current_iter >= MAX_ITERATIONS and "APPROVED" not in content.upper():
-            logger.warning("⚠️ Max iterations reached, forcing approval.")
-        logger.info("✅ Post approved.")
-        return {
-            "is_approved": True,
-            "final_post": state.post_draft,
-            "current_node": "reviewer",
-            "iteration_count": current_iter,
-        }
-    else:
-        logger.info("🔁 Rework suggested (iteration %d): %s", current_iter, content[:80])
-        return {
-            "post_draft": content,
-            "is_approved": False,
-            "current_node": "reviewer",
-            "iteration_count": current_iter,
-        }
+    return {**_review_outcome(state, content, current_iter), "models_used": models_used}
 
 
 def image_generation_node(state: AgentState) -> Dict[str, Optional[str]]:
     """Generate an image using Gemini and upload it to LinkedIn."""
     if not state.final_post:
         logger.warning("⚠️ No final_post available, skipping image generation.")
-        increment_total_failed()  # ✅ Record skipped/failure
-        return {"image_asset_urn": None, "current_node": "image_generation"}
+        job_counters.record_failed("image_generation", "no_final_post", state.niche)  # ✅ Record skipped/failure
+        return {"image_asset_urn": None, "image": None, "current_node": "image_generation"}
+
+    try:
+        outcome = _image_outcome(_generate_and_upload_image(state.final_post))
+        if outcome["image_asset_urn"] is None:
+            job_counters.record_failed("image_generation", "no_image_asset", state.niche)
+        return outcome
+
+    except Exception as e:
+        logger.exception("❌ Image generation error: %s", e)
+        job_counters.record_failed("image_generation", e, state.niche)
+        return {"image_asset_urn": None, "image": None, "current_node": "image_generation"}
+
+
+def post_executor_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Publish final content to LinkedIn and store record in MongoDB."""
+    if not state.final_post:
+        logger.error("❌ No final_post to publish.")
+        job_counters.record_failed("post_executor", "no_final_post", state.niche)
+        return {"messages": [{"role": "system", "content": "post_failed"}], "current_node": "post_executor"}
+
+    try:
+        linkedin_response = post_to_linkedin.invoke({
+            "post_content": state.final_post,
+            "image_asset_urn": state.image_asset_urn
+        })
+        # The LinkedIn tools report failures as status messages, not exceptions
+        if linkedin_response != LINKEDIN_POST_SUCCESS:
+            logger.error("❌ LinkedIn post failed: %s", linkedin_response)
+            job_counters.record_failed("post_executor", "linkedin_post_failed", state.niche)
+            return {"messages": [{"role": "system", "content": "post_failed"}], "current_node": "post_executor"}
+        logger.info("✅ LinkedIn post successful: %s", linkedin_response)
+
+        post_outbox.save(_post_record(state, linkedin_response))
+        logger.info(POST_EXECUTOR_SUCCESS_MESSAGE)
+
+        job_counters.record_completed(state.niche)  # ✅ Mark as successful job
+        if TOPIC_DEDUP_ENABLED and state.topic:
+            try:
+                topic_index.remember(state.topic)
+            except Exception as e:
+                logger.warning("⚠️ Could not index posted topic: %s", e)
+        return {"messages": [{"role": "system", "content": "post_success"}], "current_node": "post_executor"}
+
+    except Exception as e:
+        logger.exception(POST_EXECUTOR_FAILURE_MESSAGE.format(error=e))
+        job_counters.record_failed("post_executor", e, state.niche)  # ✅ Record failure
+        return {"messages": [{"role": "system", "content": "post_failed"}], "current_node": "post_executor"}
 
-    TEMP_IMAGE_PATH = "temp_dummy_image.png"
 
+# ============================================================
+# ⚡ NODE IMPLEMENTATIONS (ASYNC)
+#    Same behaviour as the sync nodes, but every LLM, Gemini,
+#    LinkedIn and MongoDB call is awaited. Used by `app.astream`.
+# ============================================================
+
+async def atopic_generator_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `topic_generator_node`."""
     try:
-        image_bytes = generate_gemini_image.invoke(state.final_post)
+        reply = await _ainvoke_llm("topic_generator", TOPIC_PROMPT, {"niche": state.niche})
+        topic = reply.text
+        if TOPIC_DEDUP_ENABLED:
+            topic = await _aunique_topic(state, topic)
+
+        logger.info("✅ Topic generated: %s", topic)
+        return {"topic": topic, "current_node": "topic_generator", "models_used": {"topic_generator": reply.model}}
+    except Exception as e:
+        logger.exception("❌ Topic generation failed: %s", e)
+        job_counters.record_failed("topic_generator", e, state.niche)  # ✅ Record failure
+        return _topic_fallback(state)
+
+
+async def acontent_creator_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `content_creator_node`."""
+    try:
+        prompt, inputs, json_mode = _content_request(state)
+        reply = await _ainvoke_llm("content_creator", prompt, inputs, json_mode=json_mode)
+        return {**_content_outcome(state, reply.text), "models_used": {"content_creator": reply.model}}
+    except Exception as e:
+        logger.exception("❌ Content creation failed: %s", e)
+        job_counters.record_failed("content_creator", e, state.niche)  # ✅ Record failure
+        return {"post_draft": f"{state.topic} — quick insight", "current_node": "content_creator"}
+
+
+async def areviewer_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `reviewer_node`."""
+    current_iter = state.iteration_count + 1
 
-        if not image_bytes:
-            logger.warning("⚠️ Image generation returned no data. Skipping image.")
-            increment_total_failed()
-            return {"image_asset_urn": None, "current_node": "image_generation"}
+    models_used = {}
+    try:
+        reply = await _ainvoke_llm(
+            "reviewer", REVIEW_PROMPT, {"post_draft": state.post_draft},
+            json_mode=REVIEWER_MODE == "structured",
+        )
+        content, models_used = reply.text, {"reviewer": reply.model}
+    except Exception as e:
+        logger.exception("⚠️ Review step failed: %s", e)
+        job_counters.record_failed("reviewer", e, state.niche)  # ✅ Record failure
+        content = _review_fallback(current_iter)
 
-        with open(TEMP_IMAGE_PATH, "wb") as f:
-            f.write(image_bytes)
-        logger.info(f"✅ Dummy image saved at {TEMP_IMAGE_PATH}")
+    return {**_review_outcome(state, content, current_iter), "models_used": models_used}
 
-        asset_urn = upload_media_to_linkedin(TEMP_IMAGE_PATH)
 
-        if os.path.exists(TEMP_IMAGE_PATH):
-            os.remove(TEMP_IMAGE_PATH)
-            logger.info("🧹 Temporary image file removed.")
+async def aimage_generation_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `image_generation_node`."""
+    if not state.final_post:
+        logger.warning("⚠️ No final_post available, skipping image generation.")
+        job_counters.record_failed("image_generation", "no_final_post", state.niche)  # ✅ Record skipped/failure
+        return {"image_asset_urn": None, "image": None, "current_node": "image_generation"}
 
-        if asset_urn and asset_urn.startswith("urn:li:asset:"):
-            logger.info("🖼️ Image asset URN generated: %s", asset_urn)
-            return {"image_asset_urn": asset_urn, "current_node": "image_generation"}
-        else:
-            logger.warning("⚠️ Image upload failed, post will be text-only.")
-            increment_total_failed()
-            return {"image_asset_urn": None, "current_node": "image_generation"}
+    try:
+        outcome = _image_outcome(await _agenerate_and_upload_image(state.final_post))
+        if outcome["image_asset_urn"] is None:
+            job_counters.record_failed("image_generation", "no_image_asset", state.niche)
+        return outcome
 
     except Exception as e:
         logger.exception("❌ Image generation error: %s", e)
-        increment_total_failed()
-        return {"image_asset_urn": None, "current_node": "image_generation"}
+        job_counters.record_failed("image_generation", e, state.niche)
+        return {"image_asset_urn": None, "image": None, "current_node": "image_generation"}
 
 
-def post_executor_node(state: AgentState) -> Dict[str, Optional[str]]:
-    """Publish final content to LinkedIn and store record in MongoDB."""
+async def apost_executor_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `post_executor_node`."""
     if not state.final_post:
         logger.error("❌ No final_post to publish.")
-        increment_total_failed()
+        job_counters.record_failed("post_executor", "no_final_post", state.niche)
         return {"messages": [{"role": "system", "content": "post_failed"}], "current_node": "post_executor"}
 
     try:
-        linkedin_response = post_to_linkedin.invoke({
-            "post_content": state.final_post,
-            "image_urn": state.image_asset_urn
-        })
+        linkedin_response = await apost_to_linkedin(state.final_post, state.image_asset_urn)
+        # The LinkedIn tools report failures as status messages, not exceptions
+        if linkedin_response != LINKEDIN_POST_SUCCESS:
+            logger.error("❌ LinkedIn post failed: %s", linkedin_response)
+            job_counters.record_failed("post_executor", "linkedin_post_failed", state.niche)
+            return {"messages": [{"role": "system", "content": "post_failed"}], "current_node": "post_executor"}
         logger.info("✅ LinkedIn post successful: %s", linkedin_response)
 
-        save_post.invoke({
-            "platform": "LinkedIn",
-            "niche": state.niche,
-            "topic": state.topic,
-            "content": state.final_post,
-            "image_urn": state.image_asset_urn,
-            "posted_at": datetime.now(timezone.utc).isoformat(),
-            "linkedin_response": linkedin_response,
-        })
+        await post_outbox.asave(_post_record(state, linkedin_response))
         logger.info(POST_EXECUTOR_SUCCESS_MESSAGE)
 
-        increment_total_completed()  # ✅ Mark as successful job
+        job_counters.record_completed(state.niche)  # ✅ Mark as successful job
+        if TOPIC_DEDUP_ENABLED and state.topic:
+            try:
+                await topic_index.aremember(state.topic)
+            except Exception as e:
+                logger.warning("⚠️ Could not index posted topic: %s", e)
         return {"messages": [{"role": "system", "content": "post_success"}], "current_node": "post_executor"}
 
     except Exception as e:
         logger.exception(POST_EXECUTOR_FAILURE_MESSAGE.format(error=e))
-        increment_total_failed()  # ✅ Record failure
+        job_counters.record_failed("post_executor", e, state.niche)  # ✅ Record failure
         return {"messages": [{"role": "system", "content": "post_failed"}], "current_node": "post_executor"}
 
 
+# ============================================================
+# 🏎️ SPECULATIVE IMAGE BRANCH
+#    In "speculative" graph mode the image is generated from the
+#    topic while the post is drafted and reviewed. The branch node
+#    only *starts* the work (LangGraph runs each superstep in
+#    lockstep, so a long-running branch node would stall the
+#    reviewer); `image_reconcile` joins it after approval.
+# ============================================================
+
+# In-flight speculative image work, keyed by AgentState.image_task_id.
+# `image_reconcile` pops its entry; runs that end before it (failure,
+# cancellation) drop theirs when `_track_speculative_images` exits.
+_speculative_images: Dict[str, Any] = {}
+# Task IDs started by the workflow run currently executing; graph tasks
+# inherit it, as with the per-run usage in app.services.metrics
+_run_image_tasks: ContextVar[Optional[List[str]]] = ContextVar("speculative_image_tasks", default=None)
+
+
+@functools.lru_cache(maxsize=None)
+def _speculative_executor() -> ThreadPoolExecutor:
+    """Worker threads for the sync speculative image node, created on first use."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative-image")
+
+
+def _speculative_image_sync(prompt_text: str) -> GeneratedImage:
+    try:
+        return _generate_and_upload_image(prompt_text)
+    except Exception as e:
+        logger.exception("❌ Speculative image generation error: %s", e)
+        return NO_IMAGE
+
+
+async def _speculative_image_async(prompt_text: str) -> GeneratedImage:
+    try:
+        return await _agenerate_and_upload_image(prompt_text)
+    except Exception as e:
+        logger.exception("❌ Speculative image generation error: %s", e)
+        return NO_IMAGE
+
+
+def _register_speculative_image(work: Any) -> str:
+    """Keep a strong reference to the in-flight work and return its key."""
+    task_id = uuid4().hex
+    _speculative_images[task_id] = work
+    run_tasks = _run_image_tasks.get()
+    if run_tasks is not None:
+        run_tasks.append(task_id)
+    return task_id
+
+
+@contextlib.contextmanager
+def _track_speculative_images() -> Iterator[None]:
+    """
+    Scope one workflow run: on exit, forget the speculative images it
+    started and did not reconcile, cancelling any still in flight.
+    """
+    task_ids: List[str] = []
+    token = _run_image_tasks.set(task_ids)
+    try:
+        yield
+    finally:
+        _run_image_tasks.reset(token)
+        for task_id in task_ids:
+            work = _speculative_images.pop(task_id, None)
+            if work is not None:
+                work.cancel()
+
+
+def _content_drift(image_prompt: Optional[str], final_post: Optional[str]) -> float:
+    """
+    Fraction of the image prompt's key words (len > 3) that no longer
+    appear in the final post: 0.0 = fully covered, 1.0 = unrelated.
+    """
+    def words(text: Optional[str]) -> set:
+        return {w for w in re.findall(r"[a-z0-9]+", (text or "").lower()) if len(w) > 3}
+
+    prompt_words = words(image_prompt)
+    if not prompt_words:
+        return 0.0
+    return 1.0 - len(prompt_words & words(final_post)) / len(prompt_words)
+
+
+def _reconcile_decision(state: AgentState, asset_urn: Optional[str]) -> str:
+    """Return "keep", "regenerate" or "text_only" for the speculative image."""
+    if not _is_asset_urn(asset_urn):
+        return "text_only"
+    drift = _content_drift(state.image_prompt, state.final_post)
+    if drift <= IMAGE_DRIFT_THRESHOLD:
+        return "keep"
+    logger.info("🔀 Final post drifted from image prompt (drift=%.2f).", drift)
+    return "regenerate" if SPECULATIVE_IMAGE_ON_DRIFT == "regenerate" else "text_only"
+
+
+def speculative_image_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Start generating/uploading the topic image in a background thread."""
+    future = _speculative_executor().submit(_speculative_image_sync, state.topic)
+    logger.info("🏎️ Speculative image generation started for topic: %s", state.topic)
+    return {"image_prompt": state.topic, "image_task_id": _register_speculative_image(future)}
+
+
+async def aspeculative_image_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `speculative_image_node` (starts an asyncio task)."""
+    task = asyncio.create_task(_speculative_image_async(state.topic))
+    logger.info("🏎️ Speculative image generation started for topic: %s", state.topic)
+    return {"image_prompt": state.topic, "image_task_id": _register_speculative_image(task)}
+
+
+def image_reconcile_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Join the speculative image; regenerate or drop it if the post drifted."""
+    work = _speculative_images.pop(state.image_task_id, None) if state.image_task_id else None
+    if work is None:
+        # e.g. the run was resumed in another process: fall back to the sequential step
+        logger.warning("⚠️ Speculative image not found, generating from final post.")
+        return {**image_generation_node(state), "current_node": "image_reconcile"}
+
+    image = work.result()
+    decision = _reconcile_decision(state, image.asset_urn)
+    if decision == "keep":
+        logger.info("🖼️ Using speculative image asset URN: %s", image.asset_urn)
+        return {"image_asset_urn": image.asset_urn, "image": image.blob, "current_node": "image_reconcile"}
+    if decision == "regenerate":
+        return {**image_generation_node(state), "image_prompt": state.final_post, "current_node": "image_reconcile"}
+
+    logger.warning("⚠️ Speculative image unusable, post will be text-only.")
+    job_counters.record_failed("image_reconcile", "speculative_image_unusable", state.niche)
+    return {"image_asset_urn": None, "image": None, "current_node": "image_reconcile"}
+
+
+async def aimage_reconcile_node(state: AgentState) -> Dict[str, Optional[str]]:
+    """Async version of `image_reconcile_node`."""
+    work = _speculative_images.pop(state.image_task_id, None) if state.image_task_id else None
+    if work is None:
+        logger.warning("⚠️ Speculative image not found, generating from final post.")
+        return {**await aimage_generation_node(state), "current_node": "image_reconcile"}
+
+    image = await work if isinstance(work, asyncio.Future) else await asyncio.wrap_future(work)
+    decision = _reconcile_decision(state, image.asset_urn)
+    if decision == "keep":
+        logger.info("🖼️ Using speculative image asset URN: %s", image.asset_urn)
+        return {"image_asset_urn": image.asset_urn, "image": image.blob, "current_node": "image_reconcile"}
+    if decision == "regenerate":
+        return {**await aimage_generation_node(state), "image_prompt": state.final_post, "current_node": "image_reconcile"}
+
+    logger.warning("⚠️ Speculative image unusable, post will be text-only.")
+    job_counters.record_failed("image_reconcile", "speculative_image_unusable", state.niche)
+    return {"image_asset_urn": None, "image": None, "current_node": "image_reconcile"}
+
+
 # ============================================================
 # 🧭 DECISION FUNCTION
 # ============================================================
@@ -202,25 +874,208 @@ def decide_to_rework(state: AgentState) -> str:
     return "image_generation" if state.is_approved else "content_creator"
 
 
+def decide_after_content(state: AgentState) -> str:
+    """Skip the reviewer when the content creator already self-reviewed the post."""
+    return "image_generation" if state.is_approved else "reviewer"
+
+
 # ============================================================
 # ⚙️ GRAPH BUILDER CONFIGURATION
 # ============================================================
-builder = StateGraph(AgentState)
-builder.add_node("topic_generator", topic_generator_node)
-builder.add_node("content_creator", content_creator_node)
-builder.add_node("reviewer", reviewer_node)
-builder.add_node("image_generation", image_generation_node)
-builder.add_node("post_executor", post_executor_node)
-
-builder.set_entry_point("topic_generator")
-builder.add_edge("topic_generator", "content_creator")
-builder.add_edge("content_creator", "reviewer")
-builder.add_conditional_edges("reviewer", decide_to_rework, {
-    "image_generation": "image_generation",
-    "content_creator": "content_creator",
-})
-builder.add_edge("image_generation", "post_executor")
-builder.add_edge("post_executor", END)
-
-app = builder.compile()
-logger.info("✅ Agent graph compiled successfully.")
+def _node(name: str, func: Callable, afunc: Callable) -> RunnableLambda:
+    """Register a node's sync/async implementations, timed per node on /metrics."""
+    sync_node, async_node = timed_node(name, func, afunc)
+    return RunnableLambda(sync_node, afunc=async_node, name=func.__name__)
+
+
+def build_graph(mode: str = "sequential", state_schema: type = AgentState):
+    """
+    Build and compile the agent graph.
+
+    Modes:
+        sequential:  topic → content_creator → reviewer → image_generation → post_executor
+        speculative: topic → (content_creator → reviewer) ∥ speculative_image
+                     → image_reconcile → post_executor
+
+    With CONTENT_SELF_REVIEW the reviewer is skipped whenever the content
+    creator returns an already self-reviewed, approved post.
+
+    `state_schema` is AgentState or LeanAgentState (AGENT_STATE_SCHEMA).
+    """
+    # Each node carries both implementations: `app.stream` / `app.invoke`
+    # run the sync function, `app.astream` / `app.ainvoke` the async one.
+    builder = StateGraph(state_schema)
+    builder.add_node("topic_generator", _node("topic_generator", topic_generator_node, atopic_generator_node))
+    builder.add_node("content_creator", _node("content_creator", content_creator_node, acontent_creator_node))
+    builder.add_node("reviewer", _node("reviewer", reviewer_node, areviewer_node))
+    builder.add_node("post_executor", _node("post_executor", post_executor_node, apost_executor_node))
+
+    builder.set_entry_point("topic_generator")
+    builder.add_edge("topic_generator", "content_creator")
+    image_step = "image_reconcile" if mode == "speculative" else "image_generation"
+    if CONTENT_SELF_REVIEW:
+        builder.add_conditional_edges("content_creator", decide_after_content, {
+            "image_generation": image_step,
+            "reviewer": "reviewer",
+        })
+    else:
+        builder.add_edge("content_creator", "reviewer")
+
+    if mode == "speculative":
+        builder.add_node("speculative_image", _node("speculative_image", speculative_image_node, aspeculative_image_node))
+        builder.add_node("image_reconcile", _node("image_reconcile", image_reconcile_node, aimage_reconcile_node))
+        builder.add_edge("topic_generator", "speculative_image")
+        builder.add_conditional_edges("reviewer", decide_to_rework, {
+            "image_generation": "image_reconcile",
+            "content_creator": "content_creator",
+        })
+        builder.add_edge("image_reconcile", "post_executor")
+    else:
+        builder.add_node("image_generation", _node("image_generation", image_generation_node, aimage_generation_node))
+        builder.add_conditional_edges("reviewer", decide_to_rework, {
+            "image_generation": "image_generation",
+            "content_creator": "content_creator",
+        })
+        builder.add_edge("image_generation", "post_executor")
+
+    builder.add_edge("post_executor", END)
+    return builder.compile()
+
+
+@functools.lru_cache(maxsize=None)
+def get_graph():
+    """The compiled agent graph, built once on first use."""
+    state_schema = LeanAgentState if AGENT_STATE_SCHEMA == "lean" else AgentState
+    graph = build_graph(AGENT_GRAPH_MODE, state_schema)
+    logger.info("✅ Agent graph compiled successfully (mode=%s, state=%s).", AGENT_GRAPH_MODE, state_schema.__name__)
+    return graph
+
+
+def warm_up():
+    """
+    Pay the one-off construction costs before the first run: compile the
+    graph, open the LLM cache and create the routed OpenAI clients.
+    Called from the FastAPI lifespan; returns the compiled graph.
+    """
+    graph = get_graph()
+    for node in LLM_ROUTING:
+        _llm_for(node)
+    return graph
+
+
+# ============================================================
+# ▶️ WORKFLOW RUNNER
+# ============================================================
+def thread_config(thread_id: str) -> Dict[str, Any]:
+    """LangGraph config addressing the checkpoint thread of one run."""
+    return {"configurable": {"thread_id": thread_id}}
+
+
+async def run_workflow(
+    state: Optional[AgentState],
+    on_node: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Drive one workflow run with `get_graph().astream` and return the last
+    state update emitted by the graph.
+
+    Args:
+        state (AgentState | None): Initial state for the run, or None to
+            continue from the checkpoint addressed by `config`.
+        on_node (callable, optional): Called with (node_name, update)
+            after every node finishes, e.g. to report progress.
+        config (dict, optional): Graph config; defaults to a fresh
+            checkpoint thread (see `thread_config`).
+    """
+    config = config or thread_config(uuid4().hex)
+    final_state = None
+    try:
+        with track_run(), _track_speculative_images():
+            async for s in get_graph().astream(state, config):
+                node_name = list(s.keys())[0]
+                logger.info("➡ Node executed: %s", node_name)
+                if on_node:
+                    on_node(node_name, s[node_name] or {})
+                final_state = s  # Capture latest state
+    finally:
+        # Outside the app lifespan nothing flushes the run's job counters
+        if not job_counters.running:
+            await job_counters.aflush()
+    return final_state
+
+
+def was_published(final_state: Optional[Dict[str, Any]]) -> bool:
+    """True if a `run_workflow` result's post_executor update reports `post_success`."""
+    update = (final_state or {}).get("post_executor") or {}
+    return any(
+        isinstance(m, dict) and m.get("content") == "post_success"
+        for m in update.get("messages", [])
+    )
+
+
+def _post_failed(values: Dict[str, Any]) -> bool:
+    messages = values.get("messages") or []
+    last = messages[-1] if messages else None
+    return isinstance(last, dict) and last.get("content") == "post_failed"
+
+
+async def find_resume_point(thread_id: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Locate the checkpoint a run should resume from.
+
+    Flow:
+        1️⃣ If the run stopped mid-graph, resume at its pending node.
+        2️⃣ If it finished but publishing failed, fork from the checkpoint
+           taken just before `post_executor` (topic, draft, review and
+           image are reused, not regenerated).
+
+    Returns:
+        (config, next_node): pass `config` to `run_workflow(None, ...)`.
+
+    Raises:
+        LookupError: No checkpoint exists for `thread_id`.
+        ValueError: The run already published successfully.
+    """
+    config = thread_config(thread_id)
+    snapshot = await get_graph().aget_state(config)
+    if not snapshot.values:
+        raise LookupError(f"No checkpoint found for run {thread_id}")
+
+    if snapshot.next:
+        return snapshot.config, snapshot.next[0]
+
+    if not _post_failed(snapshot.values):
+        raise ValueError(f"Run {thread_id} already completed successfully")
+
+    async for past in get_graph().aget_state_history(config):
+        if past.next == ("post_executor",):
+            return past.config, "post_executor"
+    raise ValueError(f"Run {thread_id} has no checkpoint before post_executor")
+
+
+async def stream_workflow_events(state: AgentState, thread_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one workflow and yield UI-friendly events as they happen.
+
+    Events:
+        {"event": "node_start", "node": ...}
+        {"event": "token", "node": ..., "content": ...}   # LLM output tokens
+        {"event": "node_end", "node": ..., "update": {...}}
+    """
+    with track_run(), _track_speculative_images():
+        async for event in get_graph().astream_events(state, thread_config(thread_id or uuid4().hex), version="v2"):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    yield {"event": "token", "node": node, "content": content}
+
+            # Graph-level node runs are the chain events named after the node itself
+            elif kind in ("on_chain_start", "on_chain_end") and node and event["name"] == node:
+                if kind == "on_chain_start":
+                    yield {"event": "node_start", "node": node}
+                else:
+                    yield {"event": "node_end", "node": node, "update": event["data"].get("output")}
\ No newline at end of file
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List
+from uuid import uuid4
+
+from app.models.agent import AgentState
+from app.utils.logger import get_logger
+from app.utils.stats import latency_summary
+
+logger = get_logger(__name__)
+
+
+# ==============================================================
+# 🔹 Batch Runner
+#    Fans out one workflow run per (niche, repetition) with a
+#    concurrency cap and yields each result as soon as it lands.
+# ==============================================================
+
+async def _run_item(niche: str, index: int, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Run a single workflow under the semaphore; never raises."""
+    from app.services.agent_graph import run_workflow, thread_config, was_published
+
+    thread_id = uuid4().hex
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            final_state = await run_workflow(AgentState(niche=niche), config=thread_config(thread_id))
+            if was_published(final_state):
+                status, payload = "success", {"final_state": final_state}
+            else:
+                status, payload = "failed", {"error": "post_failed", "final_state": final_state}
+        except Exception as e:
+            logger.exception("❌ Batch item failed for niche %s #%d: %s", niche, index, e)
+            status, payload = "failed", {"error": str(e)}
+        latency = time.perf_counter() - started
+
+    return {
+        "type": "result",
+        "niche": niche,
+        "index": index,
+        "thread_id": thread_id,
+        "status": status,
+        "latency_s": round(latency, 4),
+        **payload,
+    }
+
+
+async def run_batch(niches: List[str], count_per_niche: int, parallelism: int) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the agent graph for every niche `count_per_niche` times.
+
+    Flow:
+        1️⃣ Schedule one task per run, gated by a semaphore of `parallelism`.
+        2️⃣ Yield a "result" event per run in completion order.
+        3️⃣ Yield a final "summary" event with throughput and latency stats.
+
+    Per-item failures are reported as failed results and never abort
+    the batch. If the consumer stops iterating (e.g. client disconnect),
+    all outstanding runs are cancelled.
+    """
+    semaphore = asyncio.Semaphore(parallelism)
+    tasks = [
+        asyncio.create_task(_run_item(niche, i, semaphore))
+        for niche in niches
+        for i in range(count_per_niche)
+    ]
+    logger.info("📦 Batch started: %d runs, parallelism=%d", len(tasks), parallelism)
+
+    started = time.perf_counter()
+    latencies: List[float] = []
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            latencies.append(result["latency_s"])
+            if result["status"] != "success":
+                failed += 1
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "type": "summary",
+        "total": len(tasks),
+        "succeeded": len(tasks) - failed,
+        "failed": failed,
+        "parallelism": parallelism,
+        "wall_time_s": round(elapsed, 4),
+        "throughput_per_min": round(len(tasks) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "latency_s": latency_summary(latencies),
+    }
+    logger.info("📦 Batch finished: %s", summary)
+    yield summary
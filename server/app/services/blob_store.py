@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from io import BytesIO
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from app.utils.config import IMAGE_BLOB_BACKEND, IMAGE_BLOB_PATH
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+_MAGIC = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "riff"),
+]
+
+
+# ==============================================================
+# 🔹 Image Blob Store
+#    Generated images are stored once, keyed by the SHA-256 of
+#    their bytes (identical images de-duplicate for free). Post
+#    documents only carry the hash, size and dimensions; the bytes
+#    are streamed in chunks when GET /agent/images/{hash} asks.
+#
+#    Backends:
+#        local:  files under IMAGE_BLOB_PATH/ab/cd/<hash> (default)
+#        gridfs: GridFS bucket "images" in DB_NAME
+# ==============================================================
+
+def is_blob_hash(value: str) -> bool:
+    return bool(_HASH_RE.match(value or ""))
+
+
+def sniff_content_type(head: bytes) -> str:
+    """MIME type of an image from its leading bytes."""
+    for magic, content_type in _MAGIC:
+        if head.startswith(magic):
+            return "image/webp" if content_type == "riff" and head[8:12] == b"WEBP" else content_type
+    return "application/octet-stream"
+
+
+def describe_image(data: bytes) -> Dict[str, Any]:
+    """Hash, size, dimensions and MIME type of image `data` (header only, no full decode)."""
+    from PIL import Image
+
+    with Image.open(BytesIO(data)) as image:
+        width, height = image.size
+        content_type = Image.MIME.get(image.format, "application/octet-stream")
+    return {
+        "hash": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "width": width,
+        "height": height,
+        "content_type": content_type,
+    }
+
+
+class LocalBlobStore:
+    """Content-addressed files on local disk (or any mounted volume)."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, blob_hash: str) -> str:
+        return os.path.join(self.root, blob_hash[:2], blob_hash[2:4], blob_hash)
+
+    def exists(self, blob_hash: str) -> bool:
+        return os.path.exists(self._path(blob_hash))
+
+    def put(self, blob_hash: str, data: bytes, content_type: str) -> bool:
+        """Store `data` under `blob_hash`; False if it was already stored."""
+        path = self._path(blob_hash)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename: readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return True
+
+    def open(self, blob_hash: str) -> Optional[Iterator[bytes]]:
+        """Chunk iterator over the blob, or None if it is not stored."""
+        path = self._path(blob_hash)
+        if not os.path.exists(path):
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            with open(path, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    yield chunk
+        return chunks()
+
+
+class GridFSBlobStore:
+    """Content-addressed files in a GridFS bucket (filename = hash)."""
+
+    def __init__(self, database, bucket_name: str = "images"):
+        import gridfs
+
+        self._bucket = gridfs.GridFSBucket(database, bucket_name=bucket_name, chunk_size_bytes=CHUNK_SIZE)
+        self._files = database[f"{bucket_name}.files"]
+        self._files.create_index("filename", unique=True)
+
+    def exists(self, blob_hash: str) -> bool:
+        return self._files.find_one({"filename": blob_hash}, {"_id": 1}) is not None
+
+    def put(self, blob_hash: str, data: bytes, content_type: str) -> bool:
+        from pymongo.errors import DuplicateKeyError
+
+        if self.exists(blob_hash):
+            return False
+        try:
+            self._bucket.upload_from_stream(blob_hash, data, metadata={"content_type": content_type})
+            return True
+        except DuplicateKeyError:
+            # Stored concurrently by another run
+            return False
+
+    def open(self, blob_hash: str) -> Optional[Iterator[bytes]]:
+        import gridfs
+
+        try:
+            stream = self._bucket.open_download_stream_by_name(blob_hash)
+        except gridfs.errors.NoFile:
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            with stream:
+                while chunk := stream.readchunk():
+                    yield chunk
+        return chunks()
+
+
+class ImageStore:
+    """Stores images by content hash on the configured backend."""
+
+    def __init__(self, backend: str, path: str):
+        self.backend = backend
+        self.path = path
+        self._store: Optional[Any] = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            if self.backend == "gridfs":
+                from app.services.mongodb_service import get_client
+                from app.utils.config import DB_NAME
+
+                self._store = GridFSBlobStore(get_client()[DB_NAME])
+            else:
+                self._store = LocalBlobStore(self.path)
+        return self._store
+
+    def put(self, data: bytes) -> Dict[str, Any]:
+        """Store image `data` (once per distinct content) and return its metadata."""
+        info = describe_image(data)
+        if self.store.put(info["hash"], data, info["content_type"]):
+            logger.info("🗄️ Image stored: %s (%d bytes)", info["hash"], info["size"])
+        else:
+            logger.info("🗄️ Image already stored: %s", info["hash"])
+        return info
+
+    async def aput(self, data: bytes) -> Dict[str, Any]:
+        """Async version of `put` (hashing and I/O run off the event loop)."""
+        return await asyncio.to_thread(self.put, data)
+
+    def open(self, blob_hash: str) -> Optional[Iterator[bytes]]:
+        """Chunk iterator over a stored image, or None if unknown."""
+        if not is_blob_hash(blob_hash):
+            return None
+        return self.store.open(blob_hash)
+
+    async def aopen(self, blob_hash: str) -> Optional[Tuple[str, AsyncIterator[bytes]]]:
+        """
+        Async version of `open`: returns (MIME type sniffed from the
+        first chunk, async chunk iterator); each chunk is read in a
+        worker thread.
+        """
+        chunks = await asyncio.to_thread(self.open, blob_hash)
+        if chunks is None:
+            return None
+        first = await asyncio.to_thread(next, chunks, b"")
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield first
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                yield chunk
+        return sniff_content_type(first), stream()
+
+
+# Process-wide image store
+image_store = ImageStore(IMAGE_BLOB_BACKEND, IMAGE_BLOB_PATH)
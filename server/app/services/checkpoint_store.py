@@ -0,0 +1,85 @@
+from typing import Any, Optional
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.utils.config import (
+    DB_NAME,
+    CHECKPOINT_BACKEND,
+    CHECKPOINT_SQLITE_PATH,
+    CHECKPOINT_TTL_SECONDS,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==============================================================
+# 🔹 Checkpoint Store
+#    Owns the LangGraph checkpointer for the compiled agent graph.
+#    AgentState is persisted after every node, so a failed run can
+#    resume from its last successful node instead of starting over.
+# ==============================================================
+
+class CheckpointStore:
+    """
+    Opens/closes the configured LangGraph checkpointer.
+
+    Backends:
+        sqlite: local file via aiosqlite (default)
+        mongo:  MongoDB collections in DB_NAME (optional TTL)
+        memory: in-process only (lost on restart)
+        none:   checkpointing disabled
+    """
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        self.saver: Optional[Any] = None
+        self._resource: Optional[Any] = None
+
+    async def start(self, graph) -> None:
+        """Create the checkpointer and attach it to the compiled `graph`."""
+        # Allow our state model to be restored from checkpoints
+        serde = JsonPlusSerializer(allowed_msgpack_modules=[("app.models.agent", "AgentState"), ("app.models.agent", "LeanAgentState")])
+
+        if self.backend == "sqlite":
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+            self._resource = await aiosqlite.connect(CHECKPOINT_SQLITE_PATH)
+            self.saver = AsyncSqliteSaver(self._resource, serde=serde)
+            await self.saver.setup()
+        elif self.backend == "mongo":
+            from langgraph.checkpoint.mongodb import MongoDBSaver
+            from app.services.mongodb_service import open_mongo_client
+
+            # Shares the app's pooled client; closed by the lifespan, not here
+            self.saver = MongoDBSaver(
+                open_mongo_client(),
+                db_name=DB_NAME,
+                ttl=CHECKPOINT_TTL_SECONDS or None,
+                serde=serde,
+            )
+        elif self.backend == "memory":
+            self.saver = InMemorySaver(serde=serde)
+        else:
+            self.saver = None
+
+        graph.checkpointer = self.saver
+        logger.info("💾 Graph checkpointing: backend=%s", self.backend if self.saver else "none")
+
+    async def stop(self, graph) -> None:
+        """Detach the checkpointer and release its connection."""
+        graph.checkpointer = None
+        if self.backend == "sqlite" and self._resource is not None:
+            await self._resource.close()
+        self.saver = None
+        self._resource = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.saver is not None
+
+
+# Process-wide store, started in the app lifespan
+checkpoint_store = CheckpointStore(CHECKPOINT_BACKEND)
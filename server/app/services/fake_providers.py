@@ -0,0 +1,400 @@
+import asyncio
+import functools
+import hashlib
+import json
+import random
+import time
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any, List, Optional
+from uuid import uuid4
+
+import httpx
+import numpy as np
+import requests
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.utils.config import FAKE_LATENCY_SECONDS, FAKE_LATENCY_JITTER, FAKE_ERROR_RATES, TOKEN_URL, USERINFO_URL
+from app.utils.constants import (
+    TOPIC_GENERATOR_SYSTEM_PROMPT,
+    REVIEWER_SYSTEM_PROMPT,
+    REVIEWER_STRUCTURED_SYSTEM_PROMPT,
+    CONTENT_SELF_REVIEW_SYSTEM_PROMPT,
+    REGISTER_UPLOAD_URL,
+    LINKEDIN_POST_API_URL,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==============================================================
+# 🔹 Fake Providers (PROVIDER_MODE=fake)
+#    Local stand-ins for OpenAI, Gemini, LinkedIn and MongoDB so
+#    the full pipeline can run (and be load-tested) without paying
+#    for real calls. Each fake sleeps for its provider's configured
+#    latency and fails at its configured error rate; everything
+#    above them (rate limiters, retries, circuit breakers, metrics,
+#    temp files, graph orchestration) is the production code path.
+# ==============================================================
+
+class FakeProviderError(Exception):
+    """Injected failure. Looks like an HTTP 503 to the retry layer."""
+
+    status_code = 503
+
+    def __init__(self, provider: str):
+        super().__init__(f"injected {provider} failure")
+        self.provider = provider
+
+
+def _latency(provider: str) -> float:
+    mean = FAKE_LATENCY_SECONDS.get(provider, 0.0)
+    return max(0.0, mean * random.uniform(1 - FAKE_LATENCY_JITTER, 1 + FAKE_LATENCY_JITTER))
+
+
+def _fails(provider: str) -> bool:
+    return random.random() < FAKE_ERROR_RATES.get(provider, 0.0)
+
+
+def inject(provider: str) -> None:
+    """Simulate one blocking call to `provider`: sleep, then maybe fail."""
+    time.sleep(_latency(provider))
+    if _fails(provider):
+        raise FakeProviderError(provider)
+
+
+async def ainject(provider: str) -> None:
+    """Async version of `inject`."""
+    await asyncio.sleep(_latency(provider))
+    if _fails(provider):
+        raise FakeProviderError(provider)
+
+
+# ==============================================================
+# 🔹 OpenAI: chat model and embeddings
+# ==============================================================
+
+def _fake_post(topic_line: str) -> str:
+    topic = topic_line.rsplit(":", 1)[-1].strip()
+    return (
+        f"{topic}\n\n"
+        "Three things teams get wrong, and what to do instead:\n"
+        "1. Start from the problem, not the tool.\n"
+        "2. Measure before you optimize.\n"
+        "3. Ship small, learn fast.\n\n"
+        "#AI #Engineering #Productivity"
+    )
+
+
+def _fake_completion(messages: List[BaseMessage]) -> str:
+    """Pick a plausible completion from the node's system prompt."""
+    system = messages[0].content if messages else ""
+    user = str(messages[-1].content) if messages else ""
+
+    if system == TOPIC_GENERATOR_SYSTEM_PROMPT:
+        return f"Fake topic {uuid4().hex[:8]}: lessons from shipping AI agents"
+    if system == REVIEWER_STRUCTURED_SYSTEM_PROMPT:
+        return json.dumps({"score": 8, "approved": True, "critique": "", "revised_draft": None})
+    if system == REVIEWER_SYSTEM_PROMPT:
+        return "APPROVED"
+    if system == CONTENT_SELF_REVIEW_SYSTEM_PROMPT:
+        post = _fake_post(user)
+        return json.dumps({"draft": post, "critique": "Tighten the hook.", "final_draft": post, "score": 8})
+    return _fake_post(user.splitlines()[0])
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model returning canned, node-appropriate completions with
+    token usage (so rate limiting, cost metrics and caching behave as
+    they would against OpenAI).
+    """
+
+    model: str = "fake"
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model, "temperature": self.temperature, "max_tokens": self.max_tokens}
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        text = _fake_completion(messages)
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4 + 1
+        completion_tokens = len(text) // 4 + 1
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        inject("openai")
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await ainject("openai")
+        return self._result(messages)
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic pseudo-random unit vectors per text (distinct texts are ~orthogonal)."""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def _vector(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        inject("openai")
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await ainject("openai")
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+# ==============================================================
+# 🔹 Gemini: drop-in for the `google.generativeai` module
+# ==============================================================
+
+@functools.lru_cache(maxsize=None)
+def _fake_png() -> bytes:
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (1024, 1024), (10, 102, 194)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_response() -> SimpleNamespace:
+    part = SimpleNamespace(inline_data=SimpleNamespace(data=_fake_png(), mime_type="image/png"))
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class _FakeGenerativeModel:
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, request_options: Optional[dict] = None) -> SimpleNamespace:
+        inject("gemini")
+        return _image_response()
+
+    async def generate_content_async(self, prompt: str, request_options: Optional[dict] = None) -> SimpleNamespace:
+        await ainject("gemini")
+        return _image_response()
+
+
+fake_genai = SimpleNamespace(configure=lambda **kwargs: None, GenerativeModel=_FakeGenerativeModel)
+
+
+# ==============================================================
+# 🔹 LinkedIn: fake REST API behind requests / httpx transports
+#    Injected errors are returned as HTTP 503 responses, the way
+#    the real API reports them.
+# ==============================================================
+
+_FAKE_UPLOAD_URL = "https://fake-linkedin.local/upload/"
+
+
+def _linkedin_reply(method: str, url: str) -> tuple[int, dict]:
+    """(status, JSON body) the LinkedIn API would answer `method url` with."""
+    if _fails("linkedin"):
+        return 503, {"message": "injected linkedin failure"}
+    if method == "POST" and url == REGISTER_UPLOAD_URL:
+        asset_id = uuid4().hex
+        return 200, {"value": {
+            "asset": f"urn:li:asset:fake-{asset_id}",
+            "uploadMechanism": {
+                "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                    "uploadUrl": f"{_FAKE_UPLOAD_URL}{asset_id}",
+                },
+            },
+        }}
+    if method == "POST" and url.startswith(_FAKE_UPLOAD_URL):
+        return 201, {}
+    if method == "POST" and url == LINKEDIN_POST_API_URL:
+        return 201, {"id": f"urn:li:share:fake-{uuid4().hex}"}
+    # OAuth endpoints come from the environment; clients may append a "/"
+    if method == "POST" and url.rstrip("/") == (TOKEN_URL or "").rstrip("/"):
+        return 200, {"access_token": "fake-access-token", "expires_in": 5184000}
+    if method == "GET" and url.rstrip("/") == (USERINFO_URL or "").rstrip("/"):
+        return 200, {"sub": "fake", "name": "Fake Member", "email": "fake@example.com", "locale": "en_US"}
+    return 404, {"message": f"fake LinkedIn has no route for {method} {url}"}
+
+
+class _FakeLinkedInAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs) -> requests.Response:
+        time.sleep(_latency("linkedin"))
+        status, body = _linkedin_reply(request.method, request.url)
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode("utf-8")
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def fake_linkedin_adapter() -> requests.adapters.BaseAdapter:
+    """`requests` transport adapter serving the fake LinkedIn API."""
+    return _FakeLinkedInAdapter()
+
+
+async def _linkedin_handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(_latency("linkedin"))
+    status, body = _linkedin_reply(request.method, str(request.url))
+    return httpx.Response(status, json=body)
+
+
+def fake_linkedin_transport() -> httpx.MockTransport:
+    """httpx transport serving the fake LinkedIn API."""
+    return httpx.MockTransport(_linkedin_handler)
+
+
+# ==============================================================
+# 🔹 MongoDB: mongomock behind a latency/error-injecting proxy
+# ==============================================================
+
+class _FakeMongo:
+    """
+    Wraps a mongomock client, database or collection. Every method call
+    goes through `inject("mongo")`; injected errors raise AutoReconnect
+    like a dropped connection would.
+    """
+
+    def __init__(self, target: Any):
+        self._target = target
+
+    def _wrap(self, value: Any) -> Any:
+        import mongomock
+
+        return _FakeMongo(value) if isinstance(value, (mongomock.Database, mongomock.Collection)) else value
+
+    def __getitem__(self, name: str) -> "_FakeMongo":
+        return _FakeMongo(self._target[name])
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr) or not callable(getattr(type(self._target), name, None)):
+            return self._wrap(attr)
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            from pymongo.errors import AutoReconnect
+
+            try:
+                inject("mongo")
+            except FakeProviderError as e:
+                raise AutoReconnect(str(e)) from e
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+
+@functools.lru_cache(maxsize=None)
+def fake_mongo_client() -> _FakeMongo:
+    """Process-wide in-memory MongoDB (requires the optional `mongomock` package)."""
+    try:
+        import mongomock
+    except ImportError as e:
+        raise RuntimeError("PROVIDER_MODE=fake needs mongomock: pip install -r requirements-dev.txt") from e
+
+    logger.info("🧪 Using in-memory MongoDB (mongomock)")
+    return _FakeMongo(mongomock.MongoClient())
+
+
+class _FakeAsyncMongo(_FakeMongo):
+    """
+    Async view of the same mongomock data (stands in for pymongo's
+    AsyncMongoClient): every method is a coroutine that goes through
+    `ainject("mongo")` instead of blocking.
+    """
+
+    def _wrap(self, value: Any) -> Any:
+        import mongomock
+
+        return _FakeAsyncMongo(value) if isinstance(value, (mongomock.Database, mongomock.Collection)) else value
+
+    def __getitem__(self, name: str) -> "_FakeAsyncMongo":
+        return _FakeAsyncMongo(self._target[name])
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr) or not callable(getattr(type(self._target), name, None)):
+            return self._wrap(attr)
+        if name == "find":
+            # Like AsyncCollection.find: returns a cursor, I/O happens on iteration
+            return lambda *args, **kwargs: _FakeAsyncCursor(attr(*args, **kwargs))
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            from pymongo.errors import AutoReconnect
+
+            try:
+                await ainject("mongo")
+            except FakeProviderError as e:
+                raise AutoReconnect(str(e)) from e
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+
+class _FakeAsyncCursor:
+    """Async cursor over a mongomock cursor (`sort`/`limit`/... chain, `to_list`, `async for`)."""
+
+    def __init__(self, cursor: Any):
+        self._cursor = cursor
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._cursor, name)
+
+        def chain(*args, **kwargs) -> "_FakeAsyncCursor":
+            self._cursor = method(*args, **kwargs)
+            return self
+        return chain
+
+    async def to_list(self, length: Optional[int] = None) -> List[Any]:
+        try:
+            await ainject("mongo")
+        except FakeProviderError as e:
+            from pymongo.errors import AutoReconnect
+
+            raise AutoReconnect(str(e)) from e
+        docs = list(self._cursor)
+        return docs if length is None else docs[:length]
+
+    async def __aiter__(self):
+        for doc in await self.to_list():
+            yield doc
+
+    async def close(self) -> None:
+        self._cursor.close()
+
+
+@functools.lru_cache(maxsize=None)
+def fake_async_mongo_client() -> _FakeAsyncMongo:
+    """Async client over the same in-memory MongoDB as `fake_mongo_client()`."""
+    return _FakeAsyncMongo(fake_mongo_client()._target)
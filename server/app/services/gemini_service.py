@@ -1,11 +1,13 @@
+import asyncio
 from typing import Optional
 from io import BytesIO
-from PIL import Image
 import os
-import google.generativeai as genai
-from langchain.tools import tool
+from langchain_core.tools import tool
 
-from app.utils.config import GEMINI_API_KEY
+from app.utils.config import GEMINI_API_KEY, PROVIDER_MODE
+from app.services.metrics import track_external
+from app.services.rate_limiter import rate_limit, arate_limit
+from app.services.resilience import resilient, aresilient, timeout, within_timeout
 from app.utils.logger import get_logger
 from app.utils.constants import (
     GEMINI_CLIENT_INIT_FAIL,
@@ -24,7 +26,21 @@ logger = get_logger(__name__)
 
 # ------------------------------------------------------------
 # 1️⃣ Gemini Client Initialization Function
+#    The SDK is imported on first use: it is one of the slowest
+#    imports of the app and only the image step needs it
+#    (PROVIDER_MODE=fake substitutes a local stand-in)
 # ------------------------------------------------------------
+def _genai():
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import fake_genai
+
+        return fake_genai
+
+    import google.generativeai as genai
+
+    return genai
+
+
 def get_gemini_client() -> bool:
     """
     Initialize the Gemini API client with the configured API key.
@@ -34,7 +50,7 @@ def get_gemini_client() -> bool:
     """
     try:
         # Configure Gemini API with the provided key
-        genai.configure(api_key=GEMINI_API_KEY)
+        _genai().configure(api_key=GEMINI_API_KEY)
         logger.info("✅ Gemini client configured successfully.")
         return True
     except Exception as e:
@@ -43,18 +59,44 @@ def get_gemini_client() -> bool:
         return False
 
 
+# ------------------------------------------------------------
+# 🔧 Response helpers (shared by sync and async generation)
+# ------------------------------------------------------------
+def _extract_image_bytes(response) -> Optional[bytes]:
+    """Return the first inline image payload of a Gemini response, if any."""
+    if hasattr(response, "candidates") and response.candidates:
+        for part in response.candidates[0].content.parts:
+            if hasattr(part, "inline_data") and part.inline_data:
+                return part.inline_data.data
+    return None
+
+
+def _save_temp_image(image_bytes: bytes, temp_path: str) -> bool:
+    """Decode the image with Pillow and save it to `temp_path`."""
+    try:
+        from PIL import Image
+
+        image = Image.open(BytesIO(image_bytes))
+        image.save(temp_path)
+        logger.info(f"✅ Gemini image saved temporarily at {temp_path}")
+        return True
+    except Exception as e:
+        logger.error(GEMINI_IMAGE_SAVE_FAIL.format(error=e))
+        return False
+
+
 # ------------------------------------------------------------
 # 2️⃣ Gemini Image Generation Tool
 # ------------------------------------------------------------
 @tool("generate_gemini_image")
-def generate_gemini_image(prompt: str, temp_path: str = "temp_gemini_image.png") -> Optional[bytes]:
+def generate_gemini_image(prompt: str, temp_path: Optional[str] = None) -> Optional[bytes]:
     """
     Generate a professional AI image for a LinkedIn post using the Gemini API.
 
     Args:
         prompt (str): The topic or description for the image.
-        temp_path (str, optional): Temporary file path to save the image.
-                                   Defaults to "temp_gemini_image.png".
+        temp_path (str, optional): Also save the image to this path.
+                                   Defaults to None (bytes only).
 
     Returns:
         Optional[bytes]: The image data in bytes, or None if generation failed.
@@ -75,19 +117,18 @@ def generate_gemini_image(prompt: str, temp_path: str = "temp_gemini_image.png")
         # ----------------------------------------------------
         # Step 3: Create a Gemini model instance and request image generation
         # ----------------------------------------------------
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        response = model.generate_content(full_prompt)
+        model = _genai().GenerativeModel(GEMINI_MODEL)
+
+        def attempt():
+            with rate_limit("gemini"), track_external("gemini", "generate_content"):
+                return model.generate_content(full_prompt, request_options={"timeout": timeout("gemini")})
 
-        image_bytes: Optional[bytes] = None
+        response = resilient("gemini", "generate_content", attempt)
 
         # ----------------------------------------------------
         # Step 4: Extract image bytes from Gemini response
         # ----------------------------------------------------
-        if hasattr(response, "candidates") and response.candidates:
-            for part in response.candidates[0].content.parts:
-                if hasattr(part, "inline_data") and part.inline_data:
-                    image_bytes = part.inline_data.data
-                    break
+        image_bytes = _extract_image_bytes(response)
 
         # ----------------------------------------------------
         # Step 5: Check if image data exists
@@ -97,15 +138,11 @@ def generate_gemini_image(prompt: str, temp_path: str = "temp_gemini_image.png")
             return None
 
         # ----------------------------------------------------
-        # Step 6: Save the image temporarily using Pillow
+        # Step 6: Save a copy with Pillow, only if asked to
+        #   (a failed save does not discard the generated image)
         # ----------------------------------------------------
-        try:
-            image = Image.open(BytesIO(image_bytes))
-            image.save(temp_path)
-            logger.info(f"✅ Gemini image saved temporarily at {temp_path}")
-        except Exception as e:
-            logger.error(GEMINI_IMAGE_SAVE_FAIL.format(error=e))
-            return None
+        if temp_path:
+            _save_temp_image(image_bytes, temp_path)
 
         # ----------------------------------------------------
         # Step 7: Return image bytes for further processing
@@ -118,3 +155,55 @@ def generate_gemini_image(prompt: str, temp_path: str = "temp_gemini_image.png")
         # ----------------------------------------------------
         logger.error(GEMINI_IMAGE_GEN_FAIL.format(error=e))
         return None
+
+
+# ------------------------------------------------------------
+# 3️⃣ Async Gemini Image Generation
+#    Used by the async graph nodes; the request itself goes
+#    through `generate_content_async` so it never blocks the loop
+# ------------------------------------------------------------
+async def agenerate_gemini_image(prompt: str, temp_path: Optional[str] = None) -> Optional[bytes]:
+    """
+    Async version of `generate_gemini_image`.
+
+    Args:
+        prompt (str): The topic or description for the image.
+        temp_path (str, optional): Also save the image to this path.
+
+    Returns:
+        Optional[bytes]: The image data in bytes, or None if generation failed.
+    """
+    # Step 1: Ensure Gemini client is properly initialized
+    if not get_gemini_client():
+        return None
+
+    # Step 2: Prepare a descriptive image prompt
+    full_prompt = GEMINI_IMAGE_PROMPT_TEMPLATE.format(topic=prompt)
+    logger.info(f"🎨 Generating Gemini image for prompt: '{prompt}'")
+
+    try:
+        # Step 3: Request image generation without blocking the event loop
+        model = _genai().GenerativeModel(GEMINI_MODEL)
+
+        async def attempt():
+            async with arate_limit("gemini"):
+                with track_external("gemini", "generate_content"):
+                    return await within_timeout("gemini", model.generate_content_async(full_prompt))
+
+        response = await aresilient("gemini", "generate_content", attempt)
+
+        # Step 4: Extract and validate image bytes
+        image_bytes = _extract_image_bytes(response)
+        if not image_bytes:
+            logger.warning(GEMINI_NO_IMAGE_DATA)
+            return None
+
+        # Step 5: Save a copy with Pillow off the event loop, only if asked to
+        if temp_path:
+            await asyncio.to_thread(_save_temp_image, image_bytes, temp_path)
+
+        return image_bytes
+
+    except Exception as e:
+        logger.error(GEMINI_IMAGE_GEN_FAIL.format(error=e))
+        return None
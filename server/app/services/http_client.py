@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import weakref
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.config import (
+    PROVIDER_MODE,
+    PROVIDER_TIMEOUTS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP2_ENABLED,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Distinct hosts a session keeps a connection pool for
+_POOLED_HOSTS = 10
+
+
+# ==============================================================
+# 🔹 Shared HTTP Clients
+#    LinkedIn API and OAuth calls reuse keep-alive connections
+#    from one pool per provider instead of paying a TCP + TLS
+#    handshake per request:
+#        sync:  a requests.Session (urllib3 pool, capped per host)
+#        async: an httpx.AsyncClient per event loop
+#    Both apply a connect timeout and the provider's read timeout
+#    to every request that does not pass its own, and neither
+#    keeps cookies: the clients are shared by every user's OAuth
+#    calls. With PROVIDER_MODE=fake they serve the local fake
+#    LinkedIn API.
+# ==============================================================
+
+_sessions: Dict[str, requests.Session] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def _cookieless_jar() -> CookieJar:
+    """Cookie jar that neither stores nor sends any cookie."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def http_timeout(provider: str) -> Tuple[float, float]:
+    """(connect, read) timeout in seconds for `provider`."""
+    return HTTP_CONNECT_TIMEOUT_SECONDS, PROVIDER_TIMEOUTS[provider]
+
+
+class _PooledSession(requests.Session):
+    """Session applying `default_timeout` to requests sent without one."""
+
+    def __init__(self, default_timeout: Tuple[float, float]):
+        super().__init__()
+        self.default_timeout = default_timeout
+        self.cookies = _cookieless_jar()
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+def _new_session(provider: str) -> requests.Session:
+    session = _PooledSession(http_timeout(provider))
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import fake_linkedin_adapter
+
+        adapter = fake_linkedin_adapter()
+    else:
+        # pool_block: at most HTTP_MAX_CONNECTIONS_PER_HOST connections per host
+        adapter = HTTPAdapter(
+            pool_connections=_POOLED_HOSTS, pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST, pool_block=True
+        )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _http2() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("⚠️ HTTP2_ENABLED needs the h2 package (pip install httpx[http2]); using HTTP/1.1")
+        return False
+    return True
+
+
+def _new_async_client(provider: str) -> httpx.AsyncClient:
+    connect, read = http_timeout(provider)
+    transport = None
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import fake_linkedin_transport
+
+        transport = fake_linkedin_transport()
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(read, connect=connect),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        http2=_http2(),
+        transport=transport,
+        cookies=_cookieless_jar(),
+    )
+
+
+def get_session(provider: str = "linkedin") -> requests.Session:
+    """The process-wide pooled session for `provider` (thread-safe)."""
+    session = _sessions.get(provider)
+    if session is None:
+        with _lock:
+            session = _sessions.get(provider)
+            if session is None:
+                session = _sessions[provider] = _new_session(provider)
+    return session
+
+
+def get_async_http_client(provider: str = "linkedin") -> httpx.AsyncClient:
+    """
+    The pooled async client for `provider` on the running event loop.
+    httpx connections belong to the loop that opened them, so each
+    loop gets its own client. Do not close it; see `aclose_http_clients`.
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(provider)
+    if client is None:
+        client = clients[provider] = _new_async_client(provider)
+    return client
+
+
+def close_http_clients() -> None:
+    """Close the pooled sessions (app shutdown)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+async def aclose_http_clients() -> None:
+    """Close the running loop's async clients (app shutdown)."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.aclose() for client in clients.values()))
@@ -0,0 +1,227 @@
+import asyncio
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.services.metrics import track_external
+from app.utils.config import JOB_COUNTER_FLUSH_SECONDS, SUMMARY_HOURLY_RETENTION_DAYS
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Counter document a pending increment belongs to:
+# ("global",) or (granularity, bucket start, niche)
+Target = Tuple
+
+
+# ==============================================================
+# 🔹 Job Counters
+#    Completed/failed job counts and per-node failure reasons are
+#    accumulated in process and flushed to MongoDB on an interval
+#    and at shutdown, so recording an outcome on a graph node's
+#    hot path never waits on MongoDB. Each outcome bumps:
+#      - the all-time document in `summary_collection`
+#      - its hour and day bucket for the run's niche in
+#        `summary_buckets` (pre-aggregated for GET /agent/summary)
+# ==============================================================
+
+def _field_name(text: str) -> str:
+    """Make `text` safe as a MongoDB field path segment."""
+    return re.sub(r"[.$\s]+", "_", text).strip("_") or "unknown"
+
+
+def _targets(niche: Optional[str]) -> List[Target]:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    niche = niche or "unknown"
+    return [("global",), ("hour", hour, niche), ("day", hour.replace(hour=0), niche)]
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _bucket_filter(target: Target) -> dict:
+    granularity, bucket, niche = target
+    return {"granularity": granularity, "bucket": bucket, "niche": niche}
+
+
+class JobCounters:
+    """
+    Buffered job outcome counters.
+
+    Flow:
+        1️⃣ `record_completed()` / `record_failed(node, reason)` bump
+           in-memory counters (thread-safe, no I/O).
+        2️⃣ Every `flush_seconds` the pending increments are swapped
+           out and written as one upserted `$inc` per counter
+           document (the all-time summary and each touched bucket).
+        3️⃣ Increments of a document whose write failed are put back
+           for the next flush.
+        4️⃣ `stop()` flushes whatever is left.
+
+    When the flusher is not running (scripts, one-off runs), records
+    made from plain threads are written through immediately; records
+    made on an event loop stay buffered (no blocking I/O on the loop)
+    until the caller awaits `aflush()`, as `run_workflow` does when a
+    run ends.
+    """
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[Target, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Create the bucket indexes and start the periodic background flush."""
+        await self.aensure_indexes()
+        self._task = asyncio.create_task(self._run(), name="job-counters-flush")
+        logger.info("🧮 Job counters: flushing every %.1fs", self.flush_seconds)
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write the remaining increments."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.aflush()
+
+    async def aensure_indexes(self) -> None:
+        """
+        Indexes on `summary_buckets`: one document per (granularity,
+        niche, bucket), range scans by (granularity, bucket), and a TTL
+        expiring hourly buckets after SUMMARY_HOURLY_RETENTION_DAYS.
+        """
+        from app.services.mongodb_service import get_async_summary_buckets_collection
+
+        collection = get_async_summary_buckets_collection()
+        try:
+            await collection.create_index([("granularity", 1), ("niche", 1), ("bucket", 1)], unique=True)
+            await collection.create_index([("granularity", 1), ("bucket", 1)])
+            if SUMMARY_HOURLY_RETENTION_DAYS > 0:
+                await collection.create_index(
+                    "bucket",
+                    name="hourly_bucket_ttl",
+                    expireAfterSeconds=SUMMARY_HOURLY_RETENTION_DAYS * 86400,
+                    partialFilterExpression={"granularity": "hour"},
+                )
+        except Exception as e:
+            logger.error("❌ Could not create summary bucket indexes: %s", e)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    # ----------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------
+    def record_completed(self, niche: Optional[str] = None) -> None:
+        """Count one successfully posted job for `niche`."""
+        self._add(niche, {"total_completed": 1})
+
+    def record_failed(self, node: str, reason: Union[BaseException, str], niche: Optional[str] = None) -> None:
+        """
+        Count one failure in `node` for `niche`. `reason` is a short
+        label or the exception raised (recorded by its class name).
+        """
+        label = type(reason).__name__ if isinstance(reason, BaseException) else reason
+        self._add(niche, {"total_failed": 1, f"failures.{_field_name(node)}.{_field_name(label)}": 1})
+
+    def pending(self) -> Dict[str, int]:
+        """All-time increments recorded but not yet written."""
+        with self._lock:
+            return dict(self._pending.get(("global",), {}))
+
+    def merged(self, summary: dict) -> dict:
+        """`summary` (as read from MongoDB) plus this process's unflushed increments."""
+        merged = {**summary, "failures": {node: dict(reasons) for node, reasons in summary.get("failures", {}).items()}}
+        for path, count in self.pending().items():
+            if path.startswith("failures."):
+                _, node, reason = path.split(".", 2)
+                reasons = merged["failures"].setdefault(node, {})
+                reasons[reason] = reasons.get(reason, 0) + count
+            else:
+                merged[path] = merged.get(path, 0) + count
+        return merged
+
+    async def aflush(self) -> int:
+        """Write the pending increments; returns how many documents were updated."""
+        pending = self._take()
+        if not pending:
+            return 0
+        from app.services.mongodb_service import get_async_summary_collection, get_async_summary_buckets_collection
+
+        async def write(target: Target, increments: Dict[str, int]) -> None:
+            if target == ("global",):
+                await get_async_summary_collection().update_one({}, {"$inc": increments}, upsert=True)
+            else:
+                await get_async_summary_buckets_collection().update_one(
+                    _bucket_filter(target), {"$inc": increments}, upsert=True
+                )
+
+        with track_external("mongo", "flush_counters"):
+            results = await asyncio.gather(*(write(t, inc) for t, inc in pending.items()), return_exceptions=True)
+        return self._settle(pending, results)
+
+    def flush(self) -> int:
+        """Sync version of `aflush`."""
+        pending = self._take()
+        if not pending:
+            return 0
+        from app.services.mongodb_service import get_summary_collection, get_summary_buckets_collection
+
+        results = []
+        with track_external("mongo", "flush_counters"):
+            for target, increments in pending.items():
+                try:
+                    if target == ("global",):
+                        get_summary_collection().update_one({}, {"$inc": increments}, upsert=True)
+                    else:
+                        get_summary_buckets_collection().update_one(
+                            _bucket_filter(target), {"$inc": increments}, upsert=True
+                        )
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        return self._settle(pending, results)
+
+    # ----------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------
+    def _add(self, niche: Optional[str], increments: Dict[str, int]) -> None:
+        with self._lock:
+            for target in _targets(niche):
+                self._pending[target].update(increments)
+        if self._task is None and not _on_event_loop():
+            self.flush()
+
+    def _take(self) -> Dict[Target, Dict[str, int]]:
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+        return {target: dict(increments) for target, increments in pending.items()}
+
+    def _settle(self, pending: Dict[Target, Dict[str, int]], results: list) -> int:
+        """Put back the increments of failed writes; return the number that succeeded."""
+        failed = [(t, r) for t, r in zip(pending, results) if isinstance(r, BaseException)]
+        if failed:
+            logger.error("❌ Job counter flush failed for %d document(s), will retry: %s", len(failed), failed[0][1])
+            with self._lock:
+                for target, _ in failed:
+                    self._pending[target].update(pending[target])
+        return len(pending) - len(failed)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.aflush()
+
+
+# Process-wide counters, flushed by the app lifespan
+job_counters = JobCounters(JOB_COUNTER_FLUSH_SECONDS)
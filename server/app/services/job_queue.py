@@ -0,0 +1,206 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from app.models.agent import AgentState
+from app.models.job import Job, JobStatus
+from app.services.metrics import JOB_QUEUE_DEPTH
+from app.utils.config import AGENT_WORKER_COUNT, AGENT_QUEUE_MAXSIZE, AGENT_JOB_HISTORY_LIMIT
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==============================================================
+# 🔹 Job Queue
+#    Bounded in-process queue + fixed pool of async workers that
+#    execute the compiled agent graph in the background.
+# ==============================================================
+
+class JobQueue:
+    """
+    In-process background executor for agent workflow runs.
+
+    Flow:
+        1️⃣ `submit()` registers a Job and enqueues it (non-blocking).
+        2️⃣ Each worker pulls a job and runs the graph via `run_workflow`,
+           checkpointing under the job ID as thread ID.
+        3️⃣ Per-node progress is written back onto the Job record.
+        4️⃣ Finished jobs are kept (up to a history limit) for polling.
+        5️⃣ `resume()` re-enqueues a failed run from its last checkpoint.
+    """
+
+    def __init__(self, worker_count: int, maxsize: int, history_limit: int):
+        self.worker_count = worker_count
+        self.maxsize = maxsize
+        self.history_limit = history_limit
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # Job IDs with a resume request between its checks and the enqueue
+        self._resuming: Set[str] = set()
+
+    # ----------------------------------------------------------
+    # Lifecycle (called from the FastAPI lifespan)
+    # ----------------------------------------------------------
+    async def start(self) -> None:
+        """Create the queue and spawn the worker tasks."""
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"agent-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info("🚦 Job queue started: workers=%d, maxsize=%d", self.worker_count, self.maxsize)
+
+    async def stop(self) -> None:
+        """Cancel the workers; runs still in flight are abandoned."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("🛑 Job queue stopped.")
+
+    # ----------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------
+    def submit(self, niche: str) -> Job:
+        """
+        Enqueue a workflow run for `niche` and return its Job.
+
+        Raises:
+            asyncio.QueueFull: If `maxsize` runs are already pending.
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+
+        job = Job(niche=niche)
+        self._queue.put_nowait((job.id, None))
+        self._jobs[job.id] = job
+        self._trim_history()
+        logger.info("📥 Job %s queued for niche: %s", job.id, niche)
+        return job
+
+    async def resume(self, job_id: str) -> Job:
+        """
+        Re-enqueue a run from its last successful checkpoint.
+
+        Works for jobs no longer in memory (e.g. after a restart), as
+        long as the checkpoint thread still exists.
+
+        Raises:
+            LookupError: No checkpoint exists for `job_id`.
+            ValueError: The job is active or already published.
+            asyncio.QueueFull: If `maxsize` runs are already pending.
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+
+        job = self._jobs.get(job_id)
+        if job is not None and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+            raise ValueError(f"Job {job_id} is still {job.status.value}")
+        # Claim the job before awaiting, so a concurrent resume cannot
+        # enqueue the same thread (and publish the post) a second time
+        if job_id in self._resuming:
+            raise ValueError(f"Job {job_id} is already being resumed")
+        self._resuming.add(job_id)
+
+        from app.services.agent_graph import find_resume_point, get_graph
+
+        try:
+            config, next_node = await find_resume_point(job_id)
+            if job is None:
+                values = (await get_graph().aget_state(config)).values or {}
+                job = Job(id=job_id, niche=values.get("niche", "unknown"), attempts=0)
+
+            self._queue.put_nowait((job.id, config))
+            job.status = JobStatus.QUEUED
+        finally:
+            self._resuming.discard(job_id)
+
+        job.error = None
+        job.attempts += 1
+        job.resumed_from = next_node
+        job.finished_at = None
+        self._jobs[job.id] = job
+        self._jobs.move_to_end(job.id)
+        logger.info("🔁 Job %s queued to resume at node: %s", job.id, next_node)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and job counts by status."""
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        counts["queue_depth"] = self._queue.qsize() if self._queue else 0
+        return counts
+
+    # ----------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id, resume_config = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    await self._run(job, resume_config)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, resume_config: Optional[Dict[str, Any]] = None) -> None:
+        from app.services.agent_graph import run_workflow, thread_config, was_published
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+
+        def on_node(node_name: str, update: dict) -> None:
+            job.current_node = update.get("current_node", node_name)
+            job.completed_nodes.append(node_name)
+            job.models_used.update(update.get("models_used") or {})
+
+        try:
+            logger.info("🚀 Starting workflow for niche: %s (job %s)", job.niche, job.id)
+            if resume_config is None:
+                job.result = await run_workflow(AgentState(niche=job.niche), on_node=on_node, config=thread_config(job.id))
+            else:
+                job.result = await run_workflow(None, on_node=on_node, config=resume_config)
+            if was_published(job.result):
+                job.status = JobStatus.COMPLETED
+                logger.info("🎯 Workflow finished successfully for niche: %s (job %s)", job.niche, job.id)
+            else:
+                # Resumable: find_resume_point forks from before post_executor
+                job.status = JobStatus.FAILED
+                job.error = "post_failed"
+                logger.error("❌ Workflow finished without publishing (job %s)", job.id)
+        except Exception as e:
+            logger.exception("❌ Workflow execution failed (job %s): %s", job.id, e)
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def _trim_history(self) -> None:
+        """Drop the oldest finished jobs beyond the history limit."""
+        excess = len(self._jobs) - self.history_limit
+        if excess <= 0:
+            return
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                del self._jobs[job_id]
+                excess -= 1
+
+
+# Process-wide queue used by the routes and started in the app lifespan
+job_queue = JobQueue(
+    worker_count=AGENT_WORKER_COUNT,
+    maxsize=AGENT_QUEUE_MAXSIZE,
+    history_limit=AGENT_JOB_HISTORY_LIMIT,
+)
+
+JOB_QUEUE_DEPTH.set_function(lambda: job_queue.stats()["queue_depth"])
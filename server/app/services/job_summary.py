@@ -0,0 +1,110 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from app.services.job_counters import job_counters
+from app.services.mongodb_service import aget_job_summary_from_summary_collection, aget_summary_buckets
+from app.utils.config import SUMMARY_CACHE_TTL_SECONDS
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+GRANULARITY_SECONDS = {"hour": 3600, "day": 86400}
+
+
+# ==============================================================
+# 🔹 Job Summary
+#    Dashboard view of job outcomes: all-time totals plus per
+#    niche, per failing node and per time bucket breakdowns read
+#    from the pre-aggregated `summary_buckets` counters. Results
+#    are cached in memory for SUMMARY_CACHE_TTL_SECONDS, so
+#    dashboards polling every few seconds cost no database reads;
+#    concurrent misses for the same window share one refresh.
+# ==============================================================
+
+def _bucket_start(now: datetime, granularity: str) -> datetime:
+    if granularity == "day":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+def _add_failures(into: Dict[str, Dict[str, int]], failures: Dict[str, Dict[str, int]]) -> None:
+    for node, reasons in failures.items():
+        totals = into.setdefault(node, {})
+        for reason, count in reasons.items():
+            totals[reason] = totals.get(reason, 0) + count
+
+
+def build_summary(totals: dict, buckets: List[dict], granularity: str, since: datetime) -> Dict[str, Any]:
+    """Fold bucket documents (all niches, oldest first) into the summary response."""
+    by_niche: Dict[str, Dict[str, int]] = {}
+    by_node: Dict[str, Dict[str, int]] = {}
+    timeline: Dict[datetime, Dict[str, int]] = {}
+
+    for doc in buckets:
+        completed, failed = doc.get("total_completed", 0), doc.get("total_failed", 0)
+        niche = by_niche.setdefault(doc["niche"], {"total_completed": 0, "total_failed": 0})
+        niche["total_completed"] += completed
+        niche["total_failed"] += failed
+        point = timeline.setdefault(doc["bucket"], {"total_completed": 0, "total_failed": 0})
+        point["total_completed"] += completed
+        point["total_failed"] += failed
+        _add_failures(by_node, doc.get("failures", {}))
+
+    return {
+        "total_completed": totals["total_completed"],
+        "total_failed": totals["total_failed"],
+        "failures": totals["failures"],
+        "window": {"granularity": granularity, "since": since.isoformat()},
+        "by_niche": by_niche,
+        "by_node": by_node,
+        "timeline": [{"bucket": bucket.isoformat(), **counts} for bucket, counts in timeline.items()],
+    }
+
+
+class JobSummaryCache:
+    """TTL cache of job summaries keyed by (granularity, periods)."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        self._refreshing: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def get(self, granularity: str = "hour", periods: int = 24) -> Dict[str, Any]:
+        """
+        Summary over the last `periods` buckets of `granularity`
+        (the current, partial bucket included).
+        """
+        key = (granularity, periods)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        # Collapse concurrent misses into a single refresh
+        refresh = self._refreshing.get(key)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._refresh(key))
+            self._refreshing[key] = refresh
+            refresh.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return await asyncio.shield(refresh)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _refresh(self, key: Tuple[str, int]) -> Dict[str, Any]:
+        granularity, periods = key
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        since = _bucket_start(now, granularity) - timedelta(seconds=GRANULARITY_SECONDS[granularity] * (periods - 1))
+
+        totals, buckets = await asyncio.gather(
+            aget_job_summary_from_summary_collection(),
+            aget_summary_buckets(granularity, since),
+        )
+        summary = build_summary(job_counters.merged(totals), buckets, granularity, since)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, summary)
+        return summary
+
+
+# Process-wide cache used by GET /agent/summary
+job_summary_cache = JobSummaryCache(SUMMARY_CACHE_TTL_SECONDS)
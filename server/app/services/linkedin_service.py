@@ -1,7 +1,13 @@
 import json
+import httpx
 import requests
-from langchain.tools import tool
+from langchain_core.tools import tool
+from app.utils.config import PROVIDER_MODE
 from app.utils.logger import get_logger
+from app.services.metrics import track_external
+from app.services.rate_limiter import rate_limit, arate_limit
+from app.services.resilience import resilient, aresilient, raise_for_retryable, within_timeout
+from app.services.http_client import get_session, get_async_http_client
 from app.utils.constants import (
     LINKEDIN_MISSING_CREDENTIALS,
     LINKEDIN_ASSET_REGISTER_FAIL,
@@ -40,8 +46,77 @@ def get_credentials():
     print("person_urn:", linkedin_credentials["person_urn"])
     return linkedin_credentials["access_token"], linkedin_credentials["person_urn"]
 
+# Fake LinkedIn API (PROVIDER_MODE=fake) needs no OAuth login
+if PROVIDER_MODE == "fake":
+    set_credentials("fake-access-token", "urn:li:person:fake")
+
 logger = get_logger(__name__)
 
+# --------------------------------------------------------------
+# ✅ Helpers: HTTP clients
+# Purpose: Pooled keep-alive clients shared by every LinkedIn call
+#          (the local fake API in PROVIDER_MODE=fake)
+# --------------------------------------------------------------
+def _http() -> requests.Session:
+    """Pooled session for the sync calls (connect/read timeouts by default)."""
+    return get_session("linkedin")
+
+
+def _async_client() -> httpx.AsyncClient:
+    """Pooled client for the async calls on the running event loop."""
+    return get_async_http_client("linkedin")
+
+# --------------------------------------------------------------
+# ✅ Helpers: request headers & payloads
+# Purpose: Shared by the sync and async LinkedIn calls below
+# --------------------------------------------------------------
+def _api_headers(access_token: str) -> dict:
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+        "X-Restli-Protocol-Version": "2.0.0"
+    }
+
+
+def _register_upload_payload(person_urn: str) -> dict:
+    return {
+        "registerUploadRequest": {
+            "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
+            "owner": person_urn,
+            "serviceProvider": "LBA"
+        }
+    }
+
+
+def _parse_register_response(reg_data: dict) -> tuple[str, str]:
+    """Extract (asset_urn, upload_url) from a registerUpload response."""
+    asset_urn = reg_data["value"]["asset"]
+    upload_url = reg_data["value"]["uploadMechanism"][
+        "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"
+    ]["uploadUrl"]
+    return asset_urn, upload_url
+
+
+def _ugc_post_payload(person_urn: str, post_content: str, image_asset_urn: str | None) -> dict:
+    payload = {
+        "author": person_urn,
+        "lifecycleState": "PUBLISHED",
+        "specificContent": {
+            "com.linkedin.ugc.ShareContent": {
+                "shareCommentary": {"text": post_content},
+                "shareMediaCategory": "IMAGE" if image_asset_urn else "NONE"
+            }
+        },
+        "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
+    }
+
+    # Attach image URN if available
+    if image_asset_urn:
+        payload["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
+            {"status": "READY", "media": image_asset_urn}
+        ]
+    return payload
+
 # --------------------------------------------------------------
 # ✅ Function: upload_media_to_linkedin
 # Purpose: Upload an image to LinkedIn and return the asset URN
@@ -70,38 +145,33 @@ def upload_media_to_linkedin(file_path: str) -> str | None:
         return None
     
     # Step 2: Prepare headers and request payload for upload registration
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-        "X-Restli-Protocol-Version": "2.0.0"
-    }
-
-    payload = {
-        "registerUploadRequest": {
-            "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-            "owner": person_urn,
-            "serviceProvider": "LBA"
-        }
-    }
+    headers = _api_headers(access_token)
+    payload = _register_upload_payload(person_urn)
 
     try:
         # Step 3: Register upload with LinkedIn
-        reg_response = requests.post(REGISTER_UPLOAD_URL, headers=headers, json=payload)
-        reg_response.raise_for_status()
-        reg_data = reg_response.json()
+        def register():
+            with rate_limit("linkedin") as permit, track_external("linkedin", "register_upload"):
+                response = _http().post(REGISTER_UPLOAD_URL, headers=headers, json=payload)
+                permit.observe(response)
+            response.raise_for_status()
+            return response
+
+        reg_data = resilient("linkedin", "register_upload", register).json()
 
         # Step 4: Extract asset URN & upload URL
-        asset_urn = reg_data["value"]["asset"]
-        upload_url = reg_data["value"]["uploadMechanism"][
-            "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"
-        ]["uploadUrl"]
+        asset_urn, upload_url = _parse_register_response(reg_data)
 
         # Step 5: Upload image bytes to LinkedIn upload URL
-        with open(file_path, "rb") as f:
-            upload_response = requests.post(upload_url, data=f, headers={
-                "Authorization": f"Bearer {access_token}"
-            })
-            upload_response.raise_for_status()
+        def upload():
+            with open(file_path, "rb") as f, rate_limit("linkedin") as permit, track_external("linkedin", "upload_image"):
+                response = _http().post(upload_url, data=f, headers={
+                    "Authorization": f"Bearer {access_token}"
+                })
+                permit.observe(response)
+                response.raise_for_status()
+
+        resilient("linkedin", "upload_image", upload)
 
         # Step 6: Success log and return asset URN
         logger.info(f"✅ Image uploaded successfully to LinkedIn Asset API. URN: {asset_urn}")
@@ -139,36 +209,24 @@ def post_to_linkedin(post_content: str, image_asset_urn: str | None = None) -> s
         return "Missing LinkedIn credentials"       
 
     # Step 2: Prepare headers for API request
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-        "X-Restli-Protocol-Version": "2.0.0"
-    }
+    headers = _api_headers(access_token)
 
-    # Step 3: Construct post payload
-    payload = {
-        "author": person_urn,
-        "lifecycleState": "PUBLISHED",
-        "specificContent": {
-            "com.linkedin.ugc.ShareContent": {
-                "shareCommentary": {"text": post_content},
-                "shareMediaCategory": "IMAGE" if image_asset_urn else "NONE"
-            }
-        },
-        "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
-    }
+    # Step 3: Construct post payload (with image URN if available)
+    payload = _ugc_post_payload(person_urn, post_content, image_asset_urn)
 
-    # Step 4: Attach image URN if available
-    if image_asset_urn:
-        payload["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
-            {"status": "READY", "media": image_asset_urn}
-        ]
+    # Step 4: Make LinkedIn API POST request
+    #   (not idempotent: only retried when LinkedIn cannot have applied it)
+    def publish():
+        with rate_limit("linkedin") as permit, track_external("linkedin", "ugc_post"):
+            response = _http().post(LINKEDIN_POST_API_URL, headers=headers, data=json.dumps(payload))
+            permit.observe(response)
+        raise_for_retryable(response, idempotent=False)
+        return response
 
-    # Step 5: Make LinkedIn API POST request
     try:
-        response = requests.post(LINKEDIN_POST_API_URL, headers=headers, data=json.dumps(payload))
-        
-        # Step 6: Handle success or failure
+        response = resilient("linkedin", "ugc_post", publish, idempotent=False)
+
+        # Step 5: Handle success or failure
         if response.status_code == 201:
             logger.info(LINKEDIN_POST_SUCCESS)
             return LINKEDIN_POST_SUCCESS
@@ -176,7 +234,127 @@ def post_to_linkedin(post_content: str, image_asset_urn: str | None = None) -> s
             logger.error(LINKEDIN_POST_FAIL.format(status=response.status_code, error=response.text))
             return LINKEDIN_POST_FAIL.format(status=response.status_code, error=response.text)
     
-    # Step 7: Handle network issues
+    # Step 6: Handle network issues
     except requests.exceptions.RequestException as e:
         logger.error(LINKEDIN_NETWORK_ERROR.format(error=e))
         return LINKEDIN_NETWORK_ERROR.format(error=e)
+
+
+# ==============================================================
+# 🔹 Async LinkedIn API
+#    Non-blocking counterparts used by the async graph nodes,
+#    so a single event loop can keep many uploads/posts in flight
+# ==============================================================
+
+async def aupload_media_to_linkedin(file_path: str) -> str | None:
+    """
+    Async version of `upload_media_to_linkedin`.
+
+    Args:
+        file_path (str): Local path to the image file.
+
+    Returns:
+        str | None: LinkedIn asset URN if successful, else None.
+    """
+    # Step 1: Get stored credentials
+    access_token, person_urn = get_credentials()
+    if not access_token or not person_urn:
+        logger.error("❌ LinkedIn credentials not set!")
+        return None
+
+    try:
+        client = _async_client()
+
+        # Step 2: Register upload with LinkedIn
+        async def register():
+            async with arate_limit("linkedin") as permit:
+                with track_external("linkedin", "register_upload"):
+                    response = await within_timeout("linkedin", client.post(
+                        REGISTER_UPLOAD_URL,
+                        headers=_api_headers(access_token),
+                        json=_register_upload_payload(person_urn),
+                    ))
+                permit.observe(response)
+            response.raise_for_status()
+            return response
+
+        reg_response = await aresilient("linkedin", "register_upload", register)
+
+        # Step 3: Extract asset URN & upload URL
+        asset_urn, upload_url = _parse_register_response(reg_response.json())
+
+        # Step 4: Upload image bytes to LinkedIn upload URL
+        with open(file_path, "rb") as f:
+            image_bytes = f.read()
+
+        async def upload():
+            async with arate_limit("linkedin") as permit:
+                with track_external("linkedin", "upload_image"):
+                    response = await within_timeout("linkedin", client.post(upload_url, content=image_bytes, headers={
+                        "Authorization": f"Bearer {access_token}"
+                    }))
+                permit.observe(response)
+            response.raise_for_status()
+
+        await aresilient("linkedin", "upload_image", upload)
+
+        # Step 5: Success log and return asset URN
+        logger.info(f"✅ Image uploaded successfully to LinkedIn Asset API. URN: {asset_urn}")
+        return asset_urn
+
+    # Step 6: Handle request/connection errors
+    except httpx.HTTPError as e:
+        logger.error(LINKEDIN_ASSET_REGISTER_FAIL.format(error=e))
+        return None
+    except Exception as e:
+        logger.error(LINKEDIN_ASSET_UPLOAD_FAIL.format(error=e))
+        return None
+
+
+async def apost_to_linkedin(post_content: str, image_asset_urn: str | None = None) -> str:
+    """
+    Async version of the `post_to_linkedin` tool.
+
+    Args:
+        post_content (str): The text content to publish.
+        image_asset_urn (str | None): Optional LinkedIn asset URN for image.
+
+    Returns:
+        str: Status message of the operation.
+    """
+    # Step 1: Retrieve credentials
+    access_token, person_urn = get_credentials()
+    if not access_token or not person_urn:
+        return "Missing LinkedIn credentials"
+
+    # Step 2: Publish the UGC post
+    try:
+        client = _async_client()
+
+        # Not idempotent: only retried when LinkedIn cannot have applied it
+        async def publish():
+            async with arate_limit("linkedin") as permit:
+                with track_external("linkedin", "ugc_post"):
+                    response = await within_timeout("linkedin", client.post(
+                        LINKEDIN_POST_API_URL,
+                        headers=_api_headers(access_token),
+                        content=json.dumps(_ugc_post_payload(person_urn, post_content, image_asset_urn)),
+                    ))
+                permit.observe(response)
+            raise_for_retryable(response, idempotent=False)
+            return response
+
+        response = await aresilient("linkedin", "ugc_post", publish, idempotent=False)
+
+        # Step 3: Handle success or failure
+        if response.status_code == 201:
+            logger.info(LINKEDIN_POST_SUCCESS)
+            return LINKEDIN_POST_SUCCESS
+        else:
+            logger.error(LINKEDIN_POST_FAIL.format(status=response.status_code, error=response.text))
+            return LINKEDIN_POST_FAIL.format(status=response.status_code, error=response.text)
+
+    # Step 4: Handle network issues
+    except httpx.HTTPError as e:
+        logger.error(LINKEDIN_NETWORK_ERROR.format(error=e))
+        return LINKEDIN_NETWORK_ERROR.format(error=e)
@@ -0,0 +1,203 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==============================================================
+# 🔹 Cache Key
+#    `prompt` is LangChain's serialization of the rendered system +
+#    user messages; `llm_string` captures model, temperature and the
+#    other invocation parameters.
+# ==============================================================
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+# ==============================================================
+# 🔹 Persistent Stores
+#    Optional second tier behind the in-memory LRU. Values are the
+#    LangChain-serialized generations with an expiry timestamp.
+# ==============================================================
+
+class SQLiteCacheStore:
+    """On-disk cache tier backed by a local SQLite file."""
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl_seconds),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class MongoCacheStore:
+    """Cache tier stored in MongoDB; expiry is enforced by a TTL index."""
+
+    def __init__(self, collection, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._collection = collection
+        self._collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def get(self, key: str) -> Optional[str]:
+        doc = self._collection.find_one({"_id": key})
+        # The TTL monitor runs about once a minute, so double-check expiry
+        if doc is None or doc["expires_at"].replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
+            return None
+        return doc["value"]
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        self._collection.replace_one(
+            {"_id": key}, {"_id": key, "value": value, "expires_at": expires_at}, upsert=True
+        )
+
+    def clear(self) -> None:
+        self._collection.delete_many({})
+
+
+# ==============================================================
+# 🔹 Tiered LLM Cache
+#    Bounded LRU in memory, optionally backed by a persistent
+#    store. Plugged into a chat model via its `cache=` parameter.
+# ==============================================================
+
+class TieredLLMCache(BaseCache):
+    """
+    Two-tier LangChain cache with hit/miss counters.
+
+    Flow (lookup):
+        1️⃣ Check the in-memory LRU.
+        2️⃣ On a miss, check the persistent store and promote hits.
+        3️⃣ Count memory hits, persistent hits and misses.
+    """
+
+    def __init__(self, maxsize: int = 1024, store: Any = None):
+        self.maxsize = maxsize
+        self.store = store
+        self._memory: "OrderedDict[str, RETURN_VAL_TYPE]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+
+        # Step 1: Memory tier
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return self._memory[key]
+
+        # Step 2: Persistent tier
+        if self.store is not None:
+            try:
+                raw = self.store.get(key)
+            except Exception as e:
+                logger.warning("⚠️ LLM cache store lookup failed: %s", e)
+                raw = None
+            if raw is not None:
+                value = loads(raw, allowed_objects="core")
+                self._remember(key, value)
+                with self._lock:
+                    self._counters["persistent_hits"] += 1
+                return value
+
+        # Step 3: Miss
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        self._remember(key, return_val)
+        if self.store is not None:
+            try:
+                self.store.set(key, dumps(return_val))
+            except Exception as e:
+                logger.warning("⚠️ LLM cache store update failed: %s", e)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        # Memory-only caches answer inline instead of hopping to an executor
+        if self.store is None:
+            return self.lookup(prompt, llm_string)
+        return await super().alookup(prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.store is None:
+            return self.update(prompt, llm_string, return_val)
+        return await super().aupdate(prompt, llm_string, return_val)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus current memory-tier size."""
+        with self._lock:
+            return {**self._counters, "size": len(self._memory)}
+
+    def _remember(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+
+# ==============================================================
+# 🔹 Factory
+# ==============================================================
+
+def build_llm_cache(backend: str, maxsize: int, ttl_seconds: int, sqlite_path: str, mongo_collection=None) -> TieredLLMCache:
+    """
+    Create the process-wide LLM cache.
+
+    Args:
+        backend (str): "memory", "sqlite" or "mongo" (persistent tier).
+    """
+    store = None
+    if backend == "sqlite":
+        store = SQLiteCacheStore(sqlite_path, ttl_seconds)
+    elif backend == "mongo" and mongo_collection is not None:
+        store = MongoCacheStore(mongo_collection, ttl_seconds)
+    logger.info("🗃️ LLM cache ready: backend=%s, maxsize=%d", backend, maxsize)
+    return TieredLLMCache(maxsize=maxsize, store=store)
+
@@ -0,0 +1,236 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.utils.constants import LLM_PRICE_PER_1M_TOKENS
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==============================================================
+# 🔹 Prometheus Metrics
+#    Registered on the default registry and exported by GET /metrics
+# ==============================================================
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+NODE_DURATION = Histogram(
+    "agent_node_duration_seconds", "Wall-clock time per graph node", ["node"], buckets=LATENCY_BUCKETS
+)
+NODE_ERRORS = Counter(
+    "agent_node_errors_total", "Graph node executions that raised", ["node"]
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "agent_external_call_duration_seconds", "External call latency by provider and operation",
+    ["provider", "operation"], buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_CALL_ERRORS = Counter(
+    "agent_external_call_errors_total", "External calls that raised", ["provider", "operation"]
+)
+LLM_TOKENS = Counter(
+    "agent_llm_tokens_total", "LLM tokens by model, node and kind (prompt/completion)", ["model", "node", "kind"]
+)
+LLM_COST = Counter(
+    "agent_llm_cost_usd_total", "Estimated LLM spend in USD", ["model", "node"]
+)
+RUN_DURATION = Histogram(
+    "agent_run_duration_seconds", "End-to-end workflow run time", buckets=LATENCY_BUCKETS
+)
+RUN_TOKENS = Histogram(
+    "agent_run_tokens", "LLM tokens (prompt + completion) per workflow run",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+RUN_COST = Histogram(
+    "agent_run_cost_usd", "Estimated LLM cost per workflow run in USD",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "agent_job_queue_depth", "Workflow runs waiting in the background job queue"
+)
+LLM_CACHE_LOOKUPS = Gauge(
+    "agent_llm_cache_lookups", "LLM response cache lookups by result", ["result"]
+)
+RATE_LIMIT_WAIT = Histogram(
+    "agent_rate_limit_wait_seconds", "Time calls were held back by the provider rate limiter", ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_LIMITED = Counter(
+    "agent_rate_limited_total", "429 / rate-limit responses observed per provider", ["provider"]
+)
+RATE_LIMIT_RPM = Gauge(
+    "agent_rate_limit_rpm", "Current adaptive requests-per-minute limit per provider", ["provider"]
+)
+EXTERNAL_RETRIES = Counter(
+    "agent_external_retries_total", "External calls retried after a transient failure", ["provider", "operation"]
+)
+CIRCUIT_STATE = Gauge(
+    "agent_circuit_state", "Circuit breaker state per provider (0=closed, 1=open, 2=half-open)", ["provider"]
+)
+LLM_FALLBACKS = Counter(
+    "agent_llm_fallbacks_total", "LLM calls served by the route's fallback model", ["node", "reason"]
+)
+HEDGED_REQUESTS = Counter(
+    "agent_hedged_requests_total", "Hedge requests launched for slow calls, and how many won", ["provider", "outcome"]
+)
+POST_OUTBOX_DEPTH = Gauge(
+    "agent_post_outbox_depth", "Published posts waiting in the local outbox to be written to MongoDB"
+)
+
+
+# ==============================================================
+# 🔹 Timing Helpers
+# ==============================================================
+
+@contextmanager
+def track_external(provider: str, operation: str) -> Iterator[None]:
+    """Time an external call (OpenAI, Gemini, LinkedIn, Mongo) and count errors."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EXTERNAL_CALL_ERRORS.labels(provider, operation).inc()
+        raise
+    finally:
+        EXTERNAL_CALL_DURATION.labels(provider, operation).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def _track_node(node: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        NODE_ERRORS.labels(node).inc()
+        raise
+    finally:
+        NODE_DURATION.labels(node).observe(time.perf_counter() - started)
+
+
+def timed_node(node: str, func: Callable, afunc: Callable) -> Tuple[Callable, Callable]:
+    """Wrap a node's sync and async implementations with latency metrics."""
+    @functools.wraps(func)
+    def sync_node(state):
+        with _track_node(node):
+            return func(state)
+
+    @functools.wraps(afunc)
+    async def async_node(state):
+        with _track_node(node):
+            return await afunc(state)
+
+    return sync_node, async_node
+
+
+def register_cache_metrics(cache) -> None:
+    """Expose the LLM cache hit/miss counters as gauges."""
+    for result in ("memory_hits", "persistent_hits", "misses"):
+        LLM_CACHE_LOOKUPS.labels(result).set_function(lambda r=result: cache.stats()[r])
+
+
+# ==============================================================
+# 🔹 Per-Run Usage
+#    A ContextVar holds the usage of the workflow run currently
+#    executing; graph tasks inherit it, so concurrent runs on one
+#    event loop are accounted separately.
+# ==============================================================
+
+_current_run: ContextVar[Optional[Dict[str, Any]]] = ContextVar("agent_run_usage", default=None)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate USD cost from the per-1M-token price table (0 for unknown models)."""
+    price = LLM_PRICE_PER_1M_TOKENS.get(model)
+    if price is None:
+        # e.g. "gpt-4o-2024-08-06" → "gpt-4o"
+        price = next((p for name, p in LLM_PRICE_PER_1M_TOKENS.items() if model.startswith(name)), None)
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price["prompt"] + completion_tokens * price["completion"]) / 1_000_000
+
+
+@contextmanager
+def track_run() -> Iterator[Dict[str, Any]]:
+    """
+    Collect token/cost usage for one workflow run.
+
+    Yields the usage dict (prompt_tokens, completion_tokens, cost_usd,
+    models) and records run-level histograms on exit.
+    """
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "models": {}}
+    token = _current_run.set(usage)
+    started = time.perf_counter()
+    try:
+        yield usage
+    finally:
+        _current_run.reset(token)
+        usage["cost_usd"] = round(usage["cost_usd"], 6)
+        RUN_DURATION.observe(time.perf_counter() - started)
+        RUN_TOKENS.observe(usage["prompt_tokens"] + usage["completion_tokens"])
+        RUN_COST.observe(usage["cost_usd"])
+        logger.info("💰 Run usage: %s", usage)
+
+
+class LLMUsageCallback(BaseCallbackHandler):
+    """
+    LangChain callback that records OpenAI call latency, token counts
+    and estimated cost per model and graph node.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._calls: Dict[UUID, Tuple[str, str, float]] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or "unknown"
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        self._calls[run_id] = (model, node, time.perf_counter())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        model, node, started = self._calls.pop(run_id, ("unknown", "unknown", time.perf_counter()))
+        prompt_tokens, completion_tokens, cached = self._token_usage(response)
+        if cached:
+            return  # served by the LLM cache: no OpenAI call, no spend
+        EXTERNAL_CALL_DURATION.labels("openai", node).observe(time.perf_counter() - started)
+
+        LLM_TOKENS.labels(model, node, "prompt").inc(prompt_tokens)
+        LLM_TOKENS.labels(model, node, "completion").inc(completion_tokens)
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        LLM_COST.labels(model, node).inc(cost)
+
+        usage = _current_run.get()
+        if usage is not None:
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+            usage["cost_usd"] += cost
+            usage["models"][node] = model
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        model, node, started = self._calls.pop(run_id, ("unknown", "unknown", time.perf_counter()))
+        EXTERNAL_CALL_DURATION.labels("openai", node).observe(time.perf_counter() - started)
+        EXTERNAL_CALL_ERRORS.labels("openai", node).inc()
+
+    @staticmethod
+    def _token_usage(response: LLMResult) -> Tuple[int, int, bool]:
+        """Return (prompt_tokens, completion_tokens, served_from_cache)."""
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    # LangChain zeroes `total_cost` on cache hits
+                    cached = usage.get("total_cost", None) == 0
+                    return usage.get("input_tokens", 0), usage.get("output_tokens", 0), cached
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0), False
+
+
+llm_usage_callback = LLMUsageCallback()
@@ -1,25 +1,117 @@
+import threading
 from pymongo import MongoClient
-from typing import Optional
-from app.utils.config import MONGO_URI, DB_NAME, DB_COLLECTION_NAME
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from bson import ObjectId
+from app.utils.config import (
+    MONGO_URI,
+    DB_NAME,
+    DB_COLLECTION_NAME,
+    PROVIDER_MODE,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    POST_ARCHIVE_BATCH_SIZE,
+)
 from app.models.post import Post
-from app.utils.constants import POST_SAVE_ERROR
+from app.utils.constants import POST_SAVE_ERROR, POST_RETRIEVE_ERROR
 from app.utils.logger import get_logger
-from langchain.tools import tool
+from app.services.metrics import track_external
+from langchain_core.tools import tool
 
 logger = get_logger(__name__)
 
 # ==============================================================
-# 🔹 MongoDB Connection Helper
-#    Returns a reference to the main collection
+# 🔹 MongoDB Client
+#    One MongoClient (and connection pool) per process, opened in
+#    the app lifespan and closed at shutdown. Every helper below
+#    borrows a pooled connection instead of paying a new pool,
+#    TCP/TLS handshake and server discovery per call. Scripts that
+#    never run the lifespan get the same client on first use.
+# ==============================================================
+
+_shared_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+
+
+def _pool_options() -> dict:
+    """Pool size and timeouts shared by the sync and async clients."""
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS or None,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    }
+
+
+def open_mongo_client() -> MongoClient:
+    """Create the process-wide MongoClient (idempotent)."""
+    global _shared_client
+    with _client_lock:
+        if _shared_client is None:
+            _shared_client = MongoClient(MONGO_URI, **_pool_options())
+            logger.info("🍃 MongoDB client opened (maxPoolSize=%d)", MONGO_MAX_POOL_SIZE)
+        return _shared_client
+
+
+def close_mongo_client() -> None:
+    """Close the process-wide MongoClient and its pooled connections."""
+    global _shared_client
+    with _client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+            logger.info("🍃 MongoDB client closed")
+
+
+def get_client():
+    """Shared MongoDB client, or the in-memory fake in PROVIDER_MODE=fake."""
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import fake_mongo_client
+
+        return fake_mongo_client()
+    return _shared_client or open_mongo_client()
+
+
+# ==============================================================
+# 🔹 MongoDB Collection Helpers
+#    Return references to the app's collections
 # ==============================================================
 
 def get_collection():
     """
-    Establish a MongoDB connection and return the main collection.
+    Return the main collection on the shared client.
     """
-    client = MongoClient(MONGO_URI)
-    db = client[DB_NAME]
-    return db[DB_COLLECTION_NAME]
+    return get_client()[DB_NAME][DB_COLLECTION_NAME]
+
+
+def get_llm_cache_collection():
+    """
+    Return the collection used as the persistent LLM cache tier.
+    """
+    return get_client()[DB_NAME]["llm_cache"]
+
+
+def get_summary_collection():
+    """
+    Return the collection holding the job summary counters.
+    """
+    return get_client()[DB_NAME]["summary_collection"]
+
+
+def get_summary_buckets_collection():
+    """
+    Return the collection holding the hourly/daily per-niche job counters.
+    """
+    return get_client()[DB_NAME]["summary_buckets"]
 
 
 # ==============================================================
@@ -28,9 +120,21 @@ def get_collection():
 # ==============================================================
 
 @tool("save_post")
-def save_post(platform: str, content: str, image_data: Optional[bytes] = None) -> Optional[str]:
+def save_post(
+    platform: str,
+    content: str,
+    image: Optional[dict] = None,
+    niche: Optional[str] = None,
+    topic: Optional[str] = None,
+    image_urn: Optional[str] = None,
+    linkedin_response: Optional[str] = None,
+    models_used: Optional[Dict[str, str]] = None,
+    review_score: Optional[int] = None,
+    iteration_count: int = 0,
+    started_at: Optional[datetime] = None,
+) -> Optional[str]:
     """
-    Save a post to MongoDB.
+    Save a post, with the record of the run that produced it, to MongoDB.
 
     Flow:
         1️⃣ Get MongoDB collection.
@@ -41,7 +145,15 @@ def save_post(platform: str, content: str, image_data: Optional[bytes] = None) -
     Args:
         platform (str): Platform name (e.g., "LinkedIn").
         content (str): Post text.
-        image_data (Optional[bytes]): Optional image binary data.
+        image (Optional[dict]): Optional image blob metadata (hash, size,
+            width, height, content_type) from the image store.
+        niche, topic (Optional[str]): What the run was asked for and chose.
+        image_urn (Optional[str]): LinkedIn image asset URN.
+        linkedin_response (Optional[str]): LinkedIn publish response.
+        models_used (Optional[Dict[str, str]]): Model per LLM node.
+        review_score (Optional[int]): Final reviewer score.
+        iteration_count (int): Review/revision cycles.
+        started_at (Optional[datetime]): When the run started.
 
     Returns:
         Optional[str]: MongoDB inserted post ID if successful.
@@ -49,10 +161,15 @@ def save_post(platform: str, content: str, image_data: Optional[bytes] = None) -
     collection = get_collection()
     try:
         # Step 1: Build post model
-        post = Post(platform=platform, content=content, image_data=image_data)
+        post = Post(
+            platform=platform, content=content, image=image, niche=niche, topic=topic,
+            image_urn=image_urn, linkedin_response=linkedin_response, models_used=models_used or {},
+            review_score=review_score, iteration_count=iteration_count, started_at=started_at,
+        )
 
         # Step 2: Insert into collection
-        result = collection.insert_one(post.model_dump())
+        with track_external("mongo", "insert_post"):
+            result = collection.insert_one(post.model_dump())
 
         # Step 3: Log and return ID
         logger.info(f"Post saved successfully with ID: {result.inserted_id}")
@@ -74,128 +191,358 @@ def get_job_summary_from_summary_collection() -> dict:
     Fetch total completed and failed counts from the summary_collection.
 
     Flow:
-        1️⃣ Connect to MongoDB.
-        2️⃣ Access 'summary_collection'.
-        3️⃣ Retrieve the summary document (first record).
-        4️⃣ Extract total_completed and total_failed counts.
-        5️⃣ Return as a dictionary.
+        1️⃣ Get 'summary_collection' from the shared client.
+        2️⃣ Retrieve the summary document (first record).
+        3️⃣ Extract total_completed and total_failed counts.
+        4️⃣ Return as a dictionary.
 
     Returns:
-        dict: { "total_completed": int, "total_failed": int }
+        dict: { "total_completed": int, "total_failed": int,
+                "failures": { node: { reason: int } } }
     """
-    client = MongoClient(MONGO_URI)
-    db = client[DB_NAME]
-    collection = db["summary_collection"]  # The summary collection name
+    collection = get_summary_collection()
 
     try:
         # Step 1: Get first summary document
-        summary = collection.find_one()
+        with track_external("mongo", "read_summary"):
+            summary = collection.find_one()
 
         # Step 2: Extract values with defaults
         if summary:
             total_completed = summary.get("total_completed", 0)
             total_failed = summary.get("total_failed", 0)
+            failures = summary.get("failures", {})
         else:
             total_completed = 0
             total_failed = 0
+            failures = {}
 
         # Step 3: Log summary data
         logger.info("Fetched summary: completed=%d, failed=%d", total_completed, total_failed)
-        return {"total_completed": total_completed, "total_failed": total_failed}
+        return {"total_completed": total_completed, "total_failed": total_failed, "failures": failures}
 
     # Step 4: Handle DB read errors
     except Exception as e:
         logger.error("Failed to fetch summary: %s", e)
-        return {"total_completed": 0, "total_failed": 0}
+        return {"total_completed": 0, "total_failed": 0, "failures": {}}
 
 
 # ==============================================================
-# 🔹 Increment Total Completed
-#    Updates 'total_completed' counter in MongoDB
+# 🔹 Async MongoDB Client
+#    pymongo's native asyncio client for the async graph nodes and
+#    routes: round trips are awaited on the event loop instead of
+#    parking a worker thread per call. Same pool settings as the
+#    sync client; opened in the app lifespan and closed at shutdown.
 # ==============================================================
 
-def increment_total_completed() -> str:
+_shared_async_client = None
+
+
+def open_async_mongo_client():
+    """Create the process-wide AsyncMongoClient (idempotent)."""
+    global _shared_async_client
+    if _shared_async_client is None:
+        from pymongo import AsyncMongoClient
+
+        _shared_async_client = AsyncMongoClient(MONGO_URI, **_pool_options())
+        logger.info("🍃 Async MongoDB client opened (maxPoolSize=%d)", MONGO_MAX_POOL_SIZE)
+    return _shared_async_client
+
+
+async def close_async_mongo_client() -> None:
+    """Close the process-wide AsyncMongoClient and its pooled connections."""
+    global _shared_async_client
+    if _shared_async_client is not None:
+        client, _shared_async_client = _shared_async_client, None
+        await client.close()
+        logger.info("🍃 Async MongoDB client closed")
+
+
+def get_async_client():
+    """Shared async MongoDB client, or the in-memory fake in PROVIDER_MODE=fake."""
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import fake_async_mongo_client
+
+        return fake_async_mongo_client()
+    return _shared_async_client or open_async_mongo_client()
+
+
+def get_async_collection():
     """
-    Increment the 'total_completed' counter by 1 in MongoDB.
+    Return the main collection on the shared async client.
+    """
+    return get_async_client()[DB_NAME][DB_COLLECTION_NAME]
 
-    Flow:
-        1️⃣ Connect to MongoDB and get 'summary_collection'.
-        2️⃣ Atomically increment 'total_completed' by +1.
-        3️⃣ Retrieve the updated value.
-        4️⃣ Log success or failure and return a message.
 
-    Returns:
-        str: Log message indicating success or failure.
+def get_async_summary_collection():
+    """
+    Return the summary counters collection on the shared async client.
     """
+    return get_async_client()[DB_NAME]["summary_collection"]
+
+
+def get_async_summary_buckets_collection():
+    """
+    Return the time-bucketed counters collection on the shared async client.
+    """
+    return get_async_client()[DB_NAME]["summary_buckets"]
+
+
+# ==============================================================
+# 🔹 Async Persistence API
+#    Awaitable counterparts of the functions above for the async
+#    graph nodes and `async def` routes. Same results, logging and
+#    error handling as the sync versions.
+# ==============================================================
+
+async def asave_post(platform: str, content: str, image: Optional[dict] = None, **run: Any) -> Optional[str]:
+    """Async version of the `save_post` tool (`run`: its run record arguments)."""
     try:
-        # Step 1: Connect to MongoDB
-        client = MongoClient(MONGO_URI)
-        db = client[DB_NAME]
-        collection = db["summary_collection"]
-
-        # Step 2: Increment the field atomically
-        result = collection.find_one_and_update(
-            {},
-            {"$inc": {"total_completed": 1}},
-            upsert=True,
-            return_document=True
-        )
+        post = Post(platform=platform, content=content, image=image, **{k: v for k, v in run.items() if v is not None})
 
-        # Step 3: Extract updated value
-        new_value = result.get("total_completed", 0)
+        with track_external("mongo", "insert_post"):
+            result = await get_async_collection().insert_one(post.model_dump())
 
-        # Step 4: Log success
-        msg = f"✅ Incremented 'total_completed'. New value: {new_value}."
-        logger.info(msg)
-        return msg
+        logger.info(f"Post saved successfully with ID: {result.inserted_id}")
+        return str(result.inserted_id)
 
     except Exception as e:
-        msg = f"❌ Failed to increment 'total_completed': {e}"
-        logger.error(msg)
-        return msg
+        logger.error(POST_SAVE_ERROR.format(error=e))
+        return None
+
+
+async def aget_job_summary_from_summary_collection() -> dict:
+    """Async version of `get_job_summary_from_summary_collection`."""
+    try:
+        with track_external("mongo", "read_summary"):
+            summary = await get_async_summary_collection().find_one()
+
+        summary = summary or {}
+        total_completed = summary.get("total_completed", 0)
+        total_failed = summary.get("total_failed", 0)
+
+        logger.info("Fetched summary: completed=%d, failed=%d", total_completed, total_failed)
+        return {"total_completed": total_completed, "total_failed": total_failed, "failures": summary.get("failures", {})}
+
+    except Exception as e:
+        logger.error("Failed to fetch summary: %s", e)
+        return {"total_completed": 0, "total_failed": 0, "failures": {}}
+
+
+async def aget_summary_buckets(granularity: str, since: datetime) -> List[dict]:
+    """
+    Fetch the `granularity` ("hour" or "day") counter buckets starting at
+    or after `since`, oldest first, for every niche (served by the
+    (granularity, bucket) index).
+    """
+    with track_external("mongo", "read_summary_buckets"):
+        cursor = get_async_summary_buckets_collection().find(
+            {"granularity": granularity, "bucket": {"$gte": since}},
+            {"_id": 0, "granularity": 0},
+        ).sort("bucket", 1)
+        return await cursor.to_list(None)
 
 
 # ==============================================================
-# 🔹 Increment Total Failed
-#    Updates 'total_failed' counter in MongoDB
+# 🔹 Post History
+#    Newest-first pages of stored posts with keyset pagination:
+#    the cursor is the (timestamp, _id) of the last post returned,
+#    so every page is an index range scan, however deep.
 # ==============================================================
 
-def increment_total_failed() -> str:
+# Fields a caller may project; binary/legacy payloads are never returned
+POST_FIELDS = set(Post.model_fields) - {"timestamp"}
+POST_EXCLUDED_FIELDS = {"image_data": 0}
+
+# Compound indexes behind GET /agent/posts (filter fields first, then sort keys)
+POST_INDEXES = [
+    [("timestamp", -1), ("_id", -1)],
+    [("niche", 1), ("timestamp", -1), ("_id", -1)],
+    [("platform", 1), ("timestamp", -1), ("_id", -1)],
+]
+
+
+def encode_post_cursor(timestamp: datetime, post_id: ObjectId) -> str:
+    return f"{int(timestamp.replace(tzinfo=timezone.utc).timestamp() * 1000)}_{post_id}"
+
+
+def decode_post_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Inverse of `encode_post_cursor`; raises ValueError if malformed."""
+    millis, _, post_id = cursor.partition("_")
+    if not ObjectId.is_valid(post_id):
+        raise ValueError(f"invalid cursor: {cursor}")
+    return datetime.fromtimestamp(int(millis) / 1000, timezone.utc).replace(tzinfo=None), ObjectId(post_id)
+
+
+def _post_query(
+    niche: Optional[str], platform: Optional[str], since: Optional[datetime], until: Optional[datetime]
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    if niche:
+        query["niche"] = niche
+    if platform:
+        query["platform"] = platform
+    if since or until:
+        query["timestamp"] = {**({"$gte": since} if since else {}), **({"$lt": until} if until else {})}
+    return query
+
+
+async def aensure_post_indexes() -> None:
+    """Create the post history indexes (no-op for existing ones)."""
+    collection = get_async_collection()
+    try:
+        for keys in POST_INDEXES:
+            await collection.create_index(keys)
+        logger.info("🗂️ Post indexes ready")
+    except Exception as e:
+        logger.error("❌ Could not create post indexes: %s", e)
+
+
+async def aget_posts(
+    niche: Optional[str] = None,
+    platform: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[dict], Optional[str]]:
     """
-    Increment the 'total_failed' counter by 1 in MongoDB.
+    Fetch one page of posts, newest first.
 
-    Flow:
-        1️⃣ Connect to MongoDB and get 'summary_collection'.
-        2️⃣ Atomically increment 'total_failed' by +1.
-        3️⃣ Retrieve the updated value.
-        4️⃣ Log success or failure and return a message.
+    Args:
+        niche, platform: Exact-match filters.
+        since, until: Timestamp range (inclusive start, exclusive end).
+        cursor: `next_cursor` of the previous page.
+        limit: Page size.
+        fields: Post fields to return (default: all but binary ones);
+            `id` and `timestamp` are always included.
 
     Returns:
-        str: Log message indicating success or failure.
+        (posts, next_cursor), next_cursor None on the last page.
+
+    Raises:
+        ValueError: On a malformed cursor or unknown field.
     """
+    query = _post_query(niche, platform, since, until)
+    if cursor:
+        timestamp, post_id = decode_post_cursor(cursor)
+        query["$or"] = [{"timestamp": {"$lt": timestamp}}, {"timestamp": timestamp, "_id": {"$lt": post_id}}]
+
+    if fields:
+        unknown = set(fields) - POST_FIELDS
+        if unknown:
+            raise ValueError(f"unknown post fields: {', '.join(sorted(unknown))}")
+        projection = {field: 1 for field in fields} | {"timestamp": 1}
+    else:
+        projection = POST_EXCLUDED_FIELDS
+
     try:
-        # Step 1: Connect to MongoDB
-        client = MongoClient(MONGO_URI)
-        db = client[DB_NAME]
-        collection = db["summary_collection"]
-
-        # Step 2: Increment the field atomically
-        result = collection.find_one_and_update(
-            {},
-            {"$inc": {"total_failed": 1}},
-            upsert=True,
-            return_document=True
-        )
+        with track_external("mongo", "read_posts"):
+            docs = await get_async_collection().find(query, projection).sort(
+                [("timestamp", -1), ("_id", -1)]
+            ).limit(limit + 1).to_list(None)
+    except Exception as e:
+        logger.error(POST_RETRIEVE_ERROR.format(error=e))
+        raise
 
-        # Step 3: Extract updated value
-        new_value = result.get("total_failed", 0)
+    page, more = docs[:limit], len(docs) > limit
+    next_cursor = encode_post_cursor(page[-1]["timestamp"], page[-1]["_id"]) if more else None
+    return [{"id": str(doc.pop("_id")), **doc} for doc in page], next_cursor
 
-        # Step 4: Log success
-        msg = f"✅ Incremented 'total_failed'. New value: {new_value}."
-        logger.info(msg)
-        return msg
 
-    except Exception as e:
-        msg = f"❌ Failed to increment 'total_failed': {e}"
-        logger.error(msg)
-        return msg
\ No newline at end of file
+# ==============================================================
+# 🔹 Post Archive
+#    Streaming reads and batched writes behind the bulk export and
+#    import (app/services/post_archive.py). Reads go through one
+#    server-side cursor fetching `batch_size` posts per round trip,
+#    oldest first on the post history indexes, so memory stays flat
+#    however large the collection is. Inline legacy `image_data`
+#    bytes are left on the server unless explicitly requested.
+# ==============================================================
+
+POST_ARCHIVE_SORT = [("timestamp", 1), ("_id", 1)]
+DUPLICATE_KEY = 11000
+
+
+def iter_posts(
+    niche: Optional[str] = None,
+    platform: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    strip_images: bool = True,
+    batch_size: int = POST_ARCHIVE_BATCH_SIZE,
+) -> Iterator[dict]:
+    """
+    Yield stored posts (raw documents, `_id` included), oldest first.
+
+    Args:
+        niche, platform, since, until: Same filters as `aget_posts`.
+        strip_images: Leave inline `image_data` bytes out.
+        batch_size: Documents fetched per cursor round trip.
+    """
+    cursor = get_collection().find(
+        _post_query(niche, platform, since, until),
+        POST_EXCLUDED_FIELDS if strip_images else None,
+        batch_size=batch_size,
+    ).sort(POST_ARCHIVE_SORT)
+    try:
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+async def aiter_posts(
+    niche: Optional[str] = None,
+    platform: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    strip_images: bool = True,
+    batch_size: int = POST_ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    """Async version of `iter_posts`."""
+    cursor = get_async_collection().find(
+        _post_query(niche, platform, since, until),
+        POST_EXCLUDED_FIELDS if strip_images else None,
+        batch_size=batch_size,
+    ).sort(POST_ARCHIVE_SORT)
+    try:
+        async for doc in cursor:
+            yield doc
+    finally:
+        await cursor.close()
+
+
+def _insert_outcome(error: BulkWriteError) -> Tuple[int, int]:
+    """(inserted, duplicates) of a failed unordered insert; re-raises other write errors."""
+    errors = error.details.get("writeErrors", [])
+    if any(err.get("code") != DUPLICATE_KEY for err in errors):
+        raise error
+    return error.details.get("nInserted", 0), len(errors)
+
+
+def insert_posts(docs: Iterable[dict]) -> Tuple[int, int]:
+    """
+    Insert a batch of post documents with one unordered `insert_many`.
+    Documents whose `_id` already exists are skipped, so re-running an
+    import is safe.
+
+    Returns:
+        (inserted, skipped duplicates)
+    """
+    try:
+        with track_external("mongo", "import_posts"):
+            result = get_collection().insert_many(list(docs), ordered=False)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as e:
+        return _insert_outcome(e)
+
+
+async def ainsert_posts(docs: Iterable[dict]) -> Tuple[int, int]:
+    """Async version of `insert_posts`."""
+    try:
+        with track_external("mongo", "import_posts"):
+            result = await get_async_collection().insert_many(list(docs), ordered=False)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as e:
+        return _insert_outcome(e)
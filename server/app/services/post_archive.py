@@ -0,0 +1,332 @@
+"""
+Bulk export and import of the post history.
+
+    python -m app.services.post_archive export posts.ndjson [--niche AI] [--since 2025-01-01] [--keep-images]
+    python -m app.services.post_archive export posts.parquet
+    python -m app.services.post_archive import posts.ndjson
+
+NDJSON lines are MongoDB Extended JSON (ObjectIds, dates and binary
+round-trip exactly); Parquet uses a fixed columnar schema of the Post
+fields and needs the optional `pyarrow` package. Both are written and
+read in batches of POST_ARCHIVE_BATCH_SIZE posts, in constant memory.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from bson import ObjectId, json_util
+from bson.json_util import RELAXED_JSON_OPTIONS
+
+from app.services.mongodb_service import ainsert_posts, aiter_posts, insert_posts, iter_posts
+from app.utils.config import POST_ARCHIVE_BATCH_SIZE
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMATS = ("ndjson", "parquet")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+
+# ==============================================================
+# 🔹 Formats
+# ==============================================================
+
+def check_format(fmt: str) -> None:
+    """Raise ValueError for an unknown format or Parquet without pyarrow."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format: {fmt} (expected one of: {', '.join(FORMATS)})")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ValueError("parquet needs the optional pyarrow package: pip install pyarrow") from e
+
+
+def format_from_path(path: str) -> str:
+    return "parquet" if path.endswith(".parquet") else "ndjson"
+
+
+def _batched(docs: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    docs = iter(docs)
+    while batch := list(islice(docs, size)):
+        yield batch
+
+
+async def _abatched(docs: AsyncIterable[dict], size: int) -> AsyncIterator[List[dict]]:
+    batch: List[dict] = []
+    async for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_ndjson(batch: List[dict]) -> bytes:
+    return "".join(json_util.dumps(doc, json_options=RELAXED_JSON_OPTIONS) + "\n" for doc in batch).encode()
+
+
+def decode_ndjson_line(line: bytes, line_number: int) -> Optional[dict]:
+    """One exported post, or None for a blank line; ValueError if malformed."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        doc = json_util.loads(line)
+    except ValueError as e:
+        raise ValueError(f"line {line_number}: invalid JSON ({e})") from e
+    if not isinstance(doc, dict):
+        raise ValueError(f"line {line_number}: expected a JSON object")
+    return doc
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    utc = pa.timestamp("ms", tz="UTC")
+    return pa.schema([
+        ("_id", pa.string()),
+        ("platform", pa.string()),
+        ("content", pa.string()),
+        ("image", pa.struct([
+            ("hash", pa.string()), ("size", pa.int64()), ("width", pa.int64()),
+            ("height", pa.int64()), ("content_type", pa.string()),
+        ])),
+        ("image_data", pa.binary()),
+        ("niche", pa.string()),
+        ("topic", pa.string()),
+        ("image_urn", pa.string()),
+        ("linkedin_response", pa.string()),
+        ("models_used", pa.map_(pa.string(), pa.string())),
+        ("review_score", pa.int64()),
+        ("iteration_count", pa.int64()),
+        ("started_at", utc),
+        ("timestamp", utc),
+    ])
+
+
+class _ChunkSink:
+    """Write-only file object collecting what the Parquet writer emits."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class ParquetEncoder:
+    """
+    Incremental Parquet writer: each `encode(batch)` writes one row
+    group and returns the bytes produced so far; `close()` returns the
+    footer. Fields outside the schema are dropped.
+    """
+
+    def __init__(self):
+        import pyarrow.parquet as pq
+
+        self._schema = _parquet_schema()
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def _row(self, doc: dict) -> Dict[str, Any]:
+        row = {name: doc.get(name) for name in self._schema.names}
+        row["_id"] = str(doc["_id"])
+        return row
+
+    def encode(self, batch: List[dict]) -> bytes:
+        import pyarrow as pa
+
+        self._writer.write_batch(pa.RecordBatch.from_pylist([self._row(doc) for doc in batch], schema=self._schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def _from_parquet_row(row: Dict[str, Any]) -> dict:
+    doc = {name: value for name, value in row.items() if value is not None}
+    if ObjectId.is_valid(doc.get("_id", "")):
+        doc["_id"] = ObjectId(doc["_id"])
+    if "models_used" in doc:
+        doc["models_used"] = dict(doc["models_used"])
+    for field in ("started_at", "timestamp"):
+        if field in doc:
+            doc[field] = doc[field].replace(tzinfo=None)
+    return doc
+
+
+def read_parquet(source, batch_size: int = POST_ARCHIVE_BATCH_SIZE) -> Iterator[dict]:
+    """Posts of a Parquet export (path or seekable file), read `batch_size` rows at a time."""
+    import pyarrow.parquet as pq
+
+    for record_batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+        for row in record_batch.to_pylist():
+            yield _from_parquet_row(row)
+
+
+def read_ndjson(lines: Iterable[bytes]) -> Iterator[dict]:
+    """Posts of an NDJSON export."""
+    for line_number, line in enumerate(lines, 1):
+        doc = decode_ndjson_line(line, line_number)
+        if doc is not None:
+            yield doc
+
+
+async def aread_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict]:
+    """Posts of an NDJSON export arriving as arbitrary byte chunks (e.g. a request body)."""
+    pending, line_number = b"", 0
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            doc = decode_ndjson_line(line, line_number)
+            if doc is not None:
+                yield doc
+    doc = decode_ndjson_line(pending, line_number + 1)
+    if doc is not None:
+        yield doc
+
+
+# ==============================================================
+# 🔹 Export
+# ==============================================================
+
+def export_posts(
+    fmt: str = "ndjson", batch_size: int = POST_ARCHIVE_BATCH_SIZE, **filters: Any
+) -> Iterator[bytes]:
+    """
+    Stream the posts matching `filters` (see `iter_posts`) as `fmt`,
+    one chunk per batch of `batch_size` posts.
+    """
+    check_format(fmt)
+    batches = _batched(iter_posts(batch_size=batch_size, **filters), batch_size)
+    if fmt == "ndjson":
+        for batch in batches:
+            yield encode_ndjson(batch)
+        return
+    encoder = ParquetEncoder()
+    for batch in batches:
+        yield encoder.encode(batch)
+    yield encoder.close()
+
+
+async def aexport_posts(
+    fmt: str = "ndjson", batch_size: int = POST_ARCHIVE_BATCH_SIZE, **filters: Any
+) -> AsyncIterator[bytes]:
+    """Async version of `export_posts` (Parquet encoding runs in a worker thread)."""
+    check_format(fmt)
+    batches = _abatched(aiter_posts(batch_size=batch_size, **filters), batch_size)
+    if fmt == "ndjson":
+        async for batch in batches:
+            yield encode_ndjson(batch)
+        return
+    encoder = await asyncio.to_thread(ParquetEncoder)
+    async for batch in batches:
+        yield await asyncio.to_thread(encoder.encode, batch)
+    yield await asyncio.to_thread(encoder.close)
+
+
+# ==============================================================
+# 🔹 Import
+# ==============================================================
+
+def import_posts(docs: Iterable[dict], batch_size: int = POST_ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Insert exported posts with one unordered `insert_many` per batch.
+    Posts already present (same `_id`) are skipped.
+
+    Returns:
+        {"inserted": ..., "skipped": ...}
+    """
+    totals = {"inserted": 0, "skipped": 0}
+    for batch in _batched(docs, batch_size):
+        inserted, skipped = insert_posts(batch)
+        totals["inserted"] += inserted
+        totals["skipped"] += skipped
+    logger.info("📥 Imported %d posts (%d already present)", totals["inserted"], totals["skipped"])
+    return totals
+
+
+async def aimport_posts(docs: AsyncIterable[dict], batch_size: int = POST_ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """Async version of `import_posts`."""
+    totals = {"inserted": 0, "skipped": 0}
+    async for batch in _abatched(docs, batch_size):
+        inserted, skipped = await ainsert_posts(batch)
+        totals["inserted"] += inserted
+        totals["skipped"] += skipped
+    logger.info("📥 Imported %d posts (%d already present)", totals["inserted"], totals["skipped"])
+    return totals
+
+
+# ==============================================================
+# 🔹 CLI
+# ==============================================================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Write posts to an NDJSON or Parquet file ('-': NDJSON to stdout)")
+    export.add_argument("path")
+    export.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+    export.add_argument("--niche")
+    export.add_argument("--platform")
+    export.add_argument("--since", type=datetime.fromisoformat, help="ISO 8601, inclusive")
+    export.add_argument("--until", type=datetime.fromisoformat, help="ISO 8601, exclusive")
+    export.add_argument("--keep-images", action="store_true", help="Include inline legacy image bytes")
+    export.add_argument("--batch-size", type=int, default=POST_ARCHIVE_BATCH_SIZE)
+
+    load = commands.add_parser("import", help="Insert posts from an NDJSON or Parquet export ('-': NDJSON from stdin)")
+    load.add_argument("path")
+    load.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+    load.add_argument("--batch-size", type=int, default=POST_ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or format_from_path(args.path)
+    check_format(fmt)
+    if args.command == "export":
+        chunks = export_posts(
+            fmt, args.batch_size, niche=args.niche, platform=args.platform,
+            since=args.since, until=args.until, strip_images=not args.keep_images,
+        )
+        out = sys.stdout.buffer if args.path == "-" else open(args.path, "wb")
+        with out:
+            for chunk in chunks:
+                out.write(chunk)
+        return
+
+    if fmt == "parquet":
+        docs = read_parquet(args.path, args.batch_size)
+        totals = import_posts(docs, args.batch_size)
+    else:
+        with (sys.stdin.buffer if args.path == "-" else open(args.path, "rb")) as lines:
+            totals = import_posts(read_ndjson(lines), args.batch_size)
+    print(f"inserted={totals['inserted']} skipped={totals['skipped']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
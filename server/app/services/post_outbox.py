@@ -0,0 +1,263 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.models.post import Post
+from app.services.metrics import POST_OUTBOX_DEPTH, track_external
+from app.utils.config import (
+    POST_OUTBOX_ENABLED,
+    POST_OUTBOX_PATH,
+    POST_OUTBOX_BATCH_SIZE,
+    POST_OUTBOX_RETRY_MAX_SECONDS,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+# ==============================================================
+# 🔹 Post Outbox
+#    Write-behind persistence for published posts. The post
+#    executor commits the record to a local SQLite file (WAL, no
+#    fsync per commit: tens of microseconds) and moves on; a
+#    background drainer writes batches to MongoDB with
+#    `insert_many` and retries failures with backoff. Posts keep
+#    the ObjectId assigned at enqueue time, so a retried batch
+#    that partly landed before is de-duplicated by `_id`.
+# ==============================================================
+
+class PostOutbox:
+    """
+    Durable local queue of post documents awaiting MongoDB.
+
+    Flow:
+        1️⃣ `save()` / `asave()` validate the record as a Post and
+           commit it to the outbox with a fresh ObjectId.
+        2️⃣ The drainer wakes up, reads up to `batch_size` due rows
+           and inserts them with one unordered `insert_many`.
+        3️⃣ Inserted (or already present) posts are deleted from the
+           outbox; failed ones are retried with exponential backoff.
+           Rows that no longer validate as a Post (e.g. after a schema
+           change) are moved to `post_outbox_dead` instead of blocking
+           the rows behind them.
+        4️⃣ `stop()` makes a last drain pass; anything left stays on
+           disk and is delivered after the next start.
+
+    While the outbox is not running (disabled, scripts) posts are
+    written to MongoDB directly.
+    """
+
+    def __init__(self, path: str, batch_size: int, retry_max_seconds: float, enabled: bool = True):
+        self.path = path
+        self.batch_size = batch_size
+        self.retry_max_seconds = retry_max_seconds
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Open the outbox file and start the drainer."""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self._open)
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="post-outbox-drain")
+        logger.info("📮 Post outbox started: %s (%d pending)", self.path, self.depth())
+
+    async def stop(self) -> None:
+        """Stop the drainer after a final drain pass and close the file."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await self._drain_once()
+        except Exception as e:
+            logger.error("❌ Final outbox drain failed: %s", e)
+        logger.info("📮 Post outbox stopped (%d pending)", self.depth())
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    # ----------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------
+    def save(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Persist a post record (the `save_post` arguments). Returns the
+        post ID; falls back to a direct insert if the outbox is not
+        running or cannot be written.
+        """
+        if self.running:
+            try:
+                return self._enqueue(record)
+            except Exception as e:
+                logger.error("❌ Post outbox write failed, saving directly: %s", e)
+        from app.services.mongodb_service import save_post
+
+        return save_post.invoke(record)
+
+    async def asave(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Async version of `save`. The commit runs in a worker thread: it
+        shares a lock with the drainer's reads and writes.
+        """
+        if self.running:
+            try:
+                return await asyncio.to_thread(self._enqueue, record)
+            except Exception as e:
+                logger.error("❌ Post outbox write failed, saving directly: %s", e)
+        from app.services.mongodb_service import asave_post
+
+        return await asave_post(**record)
+
+    def depth(self) -> int:
+        """Posts waiting in the outbox."""
+        with self._lock:
+            if self._conn is None:
+                return 0
+            return self._conn.execute("SELECT COUNT(*) FROM post_outbox").fetchone()[0]
+
+    # ----------------------------------------------------------
+    # Outbox file
+    # ----------------------------------------------------------
+    def _open(self) -> None:
+        with self._lock:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS post_outbox ("
+                "id TEXT PRIMARY KEY, post TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS post_outbox_dead ("
+                "id TEXT PRIMARY KEY, post TEXT NOT NULL, error TEXT NOT NULL, failed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _enqueue(self, record: Dict[str, Any]) -> str:
+        post = Post(**{k: v for k, v in record.items() if v is not None})
+        post_id = str(ObjectId())
+        with self._lock:
+            self._conn.execute("INSERT INTO post_outbox (id, post) VALUES (?, ?)", (post_id, post.model_dump_json()))
+            self._conn.commit()
+        self._loop.call_soon_threadsafe(self._wake.set)
+        logger.info("📮 Post %s queued for MongoDB", post_id)
+        return post_id
+
+    def _due(self) -> List[Tuple[str, str, int]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, post, attempts FROM post_outbox WHERE next_attempt_at <= ? ORDER BY rowid LIMIT ?",
+                (time.time(), self.batch_size),
+            ).fetchall()
+
+    def _settle(self, delivered: Set[str], failed: List[Tuple[str, int]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("DELETE FROM post_outbox WHERE id = ?", [(i,) for i in delivered])
+            self._conn.executemany(
+                "UPDATE post_outbox SET attempts = ?, next_attempt_at = ? WHERE id = ?",
+                [(n + 1, now + min(self.retry_max_seconds, 2 ** n), i) for i, n in failed],
+            )
+            self._conn.commit()
+
+    def _bury(self, invalid: List[Tuple[str, str, str]]) -> None:
+        """Move rows that cannot be turned into post documents to the dead-letter table."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO post_outbox_dead (id, post, error, failed_at) VALUES (?, ?, ?, ?)",
+                [(i, post, error, now) for i, post, error in invalid],
+            )
+            self._conn.executemany("DELETE FROM post_outbox WHERE id = ?", [(i,) for i, _, _ in invalid])
+            self._conn.commit()
+
+    # ----------------------------------------------------------
+    # Drainer
+    # ----------------------------------------------------------
+    async def _drain_once(self) -> int:
+        """
+        Insert one batch of due posts; returns how many rows left the
+        outbox (delivered or dead-lettered).
+        """
+        rows = await asyncio.to_thread(self._due)
+        if not rows:
+            return 0
+        from app.services.mongodb_service import get_async_collection
+
+        docs, invalid = [], []
+        for i, post, _ in rows:
+            try:
+                docs.append({"_id": ObjectId(i), **Post.model_validate_json(post).model_dump()})
+            except Exception as e:
+                invalid.append((i, post, str(e)))
+        if invalid:
+            await asyncio.to_thread(self._bury, invalid)
+            logger.error("❌ %d outbox post(s) are invalid, moved to post_outbox_dead: %s", len(invalid), invalid[0][2])
+            dead = {i for i, _, _ in invalid}
+            rows = [row for row in rows if row[0] not in dead]
+            if not rows:
+                return len(invalid)
+
+        failed_ids: Set[str] = set()
+        try:
+            with track_external("mongo", "insert_posts"):
+                await get_async_collection().insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Duplicate _id: delivered by an earlier, partly failed attempt
+            failed_ids = {
+                str(docs[err["index"]]["_id"])
+                for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY
+            }
+            if failed_ids:
+                logger.error("❌ %d outbox post(s) rejected by MongoDB, will retry: %s", len(failed_ids), e)
+        except Exception as e:
+            failed_ids = {i for i, _, _ in rows}
+            logger.error("❌ Outbox drain failed (%d posts), will retry: %s", len(rows), e)
+
+        delivered = {i for i, _, _ in rows} - failed_ids
+        await asyncio.to_thread(self._settle, delivered, [(i, n) for i, _, n in rows if i in failed_ids])
+        if delivered:
+            logger.info("📮 %d outbox post(s) written to MongoDB", len(delivered))
+        return len(delivered) + len(invalid)
+
+    async def _run(self) -> None:
+        while True:
+            # Cleared before draining so posts queued meanwhile wake the next pass
+            self._wake.clear()
+            try:
+                drained = await self._drain_once()
+            except Exception as e:
+                logger.error("❌ Outbox drain error: %s", e)
+                drained = 0
+            if drained >= self.batch_size:
+                continue
+            # Sleep until new posts arrive, re-checking retries every second
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Process-wide outbox, started in the app lifespan
+post_outbox = PostOutbox(POST_OUTBOX_PATH, POST_OUTBOX_BATCH_SIZE, POST_OUTBOX_RETRY_MAX_SECONDS, POST_OUTBOX_ENABLED)
+POST_OUTBOX_DEPTH.set_function(post_outbox.depth)
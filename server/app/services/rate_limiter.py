@@ -0,0 +1,259 @@
+import asyncio
+import functools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from app.services.metrics import RATE_LIMIT_WAIT, RATE_LIMITED, RATE_LIMIT_RPM
+from app.utils.config import RATE_LIMITS
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# AIMD tuning: halve the rate on a 429, win back 5% of the configured
+# rate per successful call, never drop below 10% of it.
+_DECREASE_FACTOR = 0.5
+_INCREASE_STEP = 0.05
+_MIN_RATE_FRACTION = 0.1
+_DEFAULT_RETRY_AFTER = 5.0
+
+
+# ==============================================================
+# 🔹 Token Bucket
+#    Reservation-based: callers take capacity immediately (the level
+#    may go negative) and are told how long to wait for it. Debt is
+#    paid back in arrival order, so concurrent workflows are served
+#    first-come-first-served and nobody starves.
+# ==============================================================
+
+class _Bucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0          # units per second
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` units and return the seconds until they are covered."""
+        self._refill(now)
+        self.level -= amount
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def refund(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+class ProviderLimiter:
+    """
+    Requests/min + tokens/min limits for one provider.
+
+    Honors Retry-After by pausing the whole provider, and adapts its
+    request rate AIMD-style: 429s cut it, successes restore it.
+    """
+
+    def __init__(self, provider: str, rpm: float, tpm: float = 0):
+        self.provider = provider
+        self.configured_rpm = rpm
+        self._requests = _Bucket(rpm) if rpm else None
+        self._tokens = _Bucket(tpm) if tpm else None
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        if rpm:
+            RATE_LIMIT_RPM.labels(provider).set(rpm)
+
+    # ----------------------------------------------------------
+    # Capacity accounting
+    # ----------------------------------------------------------
+    def _reserve(self, tokens: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            delay = max(0.0, self._blocked_until - now)
+            if self._requests:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens and tokens:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+        if delay > 0:
+            RATE_LIMIT_WAIT.labels(self.provider).observe(delay)
+        return delay
+
+    def _release(self, tokens: int) -> None:
+        """Give back a reservation that was never used (cancelled waiter)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._requests:
+                self._requests.refund(1, now)
+            if self._tokens and tokens:
+                self._tokens.refund(tokens, now)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the real usage of a call is known."""
+        if not self._tokens or actual <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._tokens.refund(estimated - actual, now)
+
+    # ----------------------------------------------------------
+    # Feedback from responses
+    # ----------------------------------------------------------
+    def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        """A 429 was observed: pause the provider and cut its rate."""
+        pause = retry_after if retry_after is not None else _DEFAULT_RETRY_AFTER
+        now = time.monotonic()
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, now + pause)
+            if self._requests:
+                floor = self.configured_rpm * _MIN_RATE_FRACTION / 60.0
+                self._requests.rate = max(floor, self._requests.rate * _DECREASE_FACTOR)
+                RATE_LIMIT_RPM.labels(self.provider).set(self._requests.rate * 60.0)
+        RATE_LIMITED.labels(self.provider).inc()
+        logger.warning("⏳ %s rate limited, pausing %.1fs", self.provider, pause)
+
+    def on_success(self) -> None:
+        if not self._requests:
+            return
+        with self._lock:
+            ceiling = self.configured_rpm / 60.0
+            if self._requests.rate < ceiling:
+                self._requests.rate = min(ceiling, self._requests.rate + ceiling * _INCREASE_STEP)
+                RATE_LIMIT_RPM.labels(self.provider).set(self._requests.rate * 60.0)
+
+    # ----------------------------------------------------------
+    # Call wrappers
+    # ----------------------------------------------------------
+    @contextmanager
+    def limit(self, tokens: int = 0) -> Iterator["Permit"]:
+        """Block until the call may proceed, then report its outcome."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        permit = Permit(self, tokens)
+        with permit:
+            yield permit
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int = 0) -> AsyncIterator["Permit"]:
+        """Async version of `limit`; waiting never blocks the event loop."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release(tokens)
+                raise
+        permit = Permit(self, tokens)
+        with permit:
+            yield permit
+
+
+class Permit:
+    """
+    One admitted call. Use `observe(response)` for HTTP responses that
+    report 429 without raising, and `settle(actual_tokens)` once usage
+    is known; rate-limit exceptions are detected automatically.
+    """
+
+    def __init__(self, limiter: ProviderLimiter, tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.limited = False
+
+    def observe(self, response) -> None:
+        if getattr(response, "status_code", None) == 429:
+            self.limited = True
+            self.limiter.on_rate_limited(_retry_after(getattr(response, "headers", None)))
+
+    def settle(self, actual_tokens: int) -> None:
+        self.limiter.settle(self.tokens, actual_tokens)
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and is_rate_limit_error(exc):
+            self.limited = True
+            response = getattr(exc, "response", None)
+            self.limiter.on_rate_limited(_retry_after(getattr(response, "headers", None)))
+        elif exc is None and not self.limited:
+            self.limiter.on_success()
+
+
+# ==============================================================
+# 🔹 Error / Header Helpers
+# ==============================================================
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for 429s from openai, httpx/requests and google-api-core."""
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "code", None) == 429:
+        return True
+    return getattr(getattr(exc, "response", None), "status_code", None) == 429
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds to wait from `retry-after-ms` / `retry-after` (seconds or HTTP date)."""
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding():
+    """
+    tiktoken encoding, or None if it cannot be loaded. The failure is
+    cached too: tiktoken downloads the BPE file on first use, and
+    retrying that per call would block the event loop on the network.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("⚠️ tiktoken unavailable (%s), estimating ~4 chars/token", e)
+        return None
+
+
+def estimate_tokens(text: str, completion_tokens: int = 0) -> int:
+    """Token estimate for TPM budgeting (tiktoken, or ~4 chars/token offline)."""
+    encoding = _encoding()
+    prompt_tokens = len(encoding.encode(text)) if encoding is not None else len(text) // 4 + 1
+    return prompt_tokens + completion_tokens
+
+
+# ==============================================================
+# 🔹 Registry
+#    One limiter per provider, shared by every service module and
+#    every concurrent workflow in the process.
+# ==============================================================
+
+limiters: Dict[str, ProviderLimiter] = {
+    provider: ProviderLimiter(provider, limits["rpm"], limits["tpm"])
+    for provider, limits in RATE_LIMITS.items()
+}
+
+
+def rate_limit(provider: str, tokens: int = 0):
+    """`with rate_limit("linkedin") as permit:` around a blocking call."""
+    return limiters[provider].limit(tokens)
+
+
+def arate_limit(provider: str, tokens: int = 0):
+    """`async with arate_limit("gemini") as permit:` around an awaited call."""
+    return limiters[provider].alimit(tokens)
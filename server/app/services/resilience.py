@@ -0,0 +1,288 @@
+import asyncio
+import random
+import sys
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import requests
+
+from app.services.metrics import CIRCUIT_STATE, EXTERNAL_RETRIES, HEDGED_REQUESTS
+from app.utils.config import (
+    PROVIDER_TIMEOUTS,
+    EXTERNAL_MAX_RETRIES,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying. 500 may mean the request was applied, so
+# it is only retried for idempotent operations.
+_SAFE_RETRY_STATUS = {429, 502, 503, 504}
+_IDEMPOTENT_RETRY_STATUS = _SAFE_RETRY_STATUS | {500}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit is open."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit open, retry in {retry_in:.0f}s")
+        self.provider = provider
+
+
+# ==============================================================
+# 🔹 Circuit Breaker
+#    closed → open after N consecutive transient failures; after
+#    CIRCUIT_RESET_SECONDS one trial call is let through (half-open):
+#    success closes the circuit, failure re-opens it.
+# ==============================================================
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+
+    def __init__(self, provider: str, failure_threshold: int, reset_seconds: float):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(provider).set(self.CLOSED)
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        CIRCUIT_STATE.labels(self.provider).set(state)
+
+    def before_call(self) -> None:
+        """Raise `CircuitOpenError` unless a call may go to the provider now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_seconds:
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(self.provider, max(0.0, self.reset_seconds - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                logger.info("🟢 %s circuit closed", self.provider)
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("🔴 %s circuit opened after %d failures", self.provider, self.failures)
+                self._set_state(self.OPEN)
+                self.opened_at = time.monotonic()
+
+    def record_neutral(self) -> None:
+        """Non-transient error (e.g. 400): says nothing about provider health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+breakers: Dict[str, CircuitBreaker] = {
+    provider: CircuitBreaker(provider, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+    for provider in PROVIDER_TIMEOUTS
+}
+
+
+# ==============================================================
+# 🔹 Error Classification
+# ==============================================================
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for candidate in (getattr(exc, "status_code", None), getattr(exc, "code", None),
+                      getattr(getattr(exc, "response", None), "status_code", None)):
+        try:
+            if candidate is not None:
+                return int(candidate)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_transient(exc: BaseException, idempotent: bool = True) -> bool:
+    """
+    True if `exc` is worth retrying. For non-idempotent calls only errors
+    that guarantee the request was not applied (connect failures, 429,
+    502-504) qualify; read timeouts could otherwise duplicate the effect.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, requests.exceptions.ConnectTimeout)):
+        return True
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError, httpx.TimeoutException,
+                        requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                        httpx.NetworkError)):
+        return idempotent
+    # The OpenAI SDK is slow to import; if it is not loaded, exc cannot be one of its errors
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(exc, openai.APIConnectionError):
+        return idempotent
+
+    status = _status_code(exc)
+    if status is None:
+        return False
+    return status in (_IDEMPOTENT_RETRY_STATUS if idempotent else _SAFE_RETRY_STATUS)
+
+
+def raise_for_retryable(response, idempotent: bool = True) -> None:
+    """Raise for HTTP responses the retry layer should see as transient."""
+    if response.status_code in (_IDEMPOTENT_RETRY_STATUS if idempotent else _SAFE_RETRY_STATUS):
+        response.raise_for_status()
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+
+
+def _record(breaker: CircuitBreaker, exc: BaseException, transient: bool) -> None:
+    # Timeouts only cover the provider call (see `within_timeout`), never
+    # waiting for rate-limit capacity, so they are the provider's failures
+    if transient or isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        breaker.record_failure()
+    elif not isinstance(exc, CircuitOpenError):
+        breaker.record_neutral()
+
+
+# ==============================================================
+# 🔹 Resilient Calls
+# ==============================================================
+
+def resilient(provider: str, operation: str, func: Callable[[], T], idempotent: bool = True) -> T:
+    """
+    Call `func()` behind `provider`'s circuit breaker, retrying transient
+    failures with jittered exponential backoff. Blocking calls cannot be
+    pre-empted, so `func` should pass `timeout(provider)` to its client.
+    """
+    breaker = breakers[provider]
+    for attempt in range(EXTERNAL_MAX_RETRIES + 1):
+        breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            transient = is_transient(e, idempotent)
+            _record(breaker, e, transient)
+            if not transient or attempt == EXTERNAL_MAX_RETRIES:
+                raise
+            delay = _backoff(attempt)
+            EXTERNAL_RETRIES.labels(provider, operation).inc()
+            logger.warning("🔁 %s %s failed (%s), retry %d in %.2fs", provider, operation, e, attempt + 1, delay)
+            time.sleep(delay)
+        except BaseException:
+            # Cancelled (e.g. an abandoned run): free a half-open trial
+            # slot without counting it against the provider
+            breaker.record_neutral()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+async def aresilient(
+    provider: str,
+    operation: str,
+    factory: Callable[[], Awaitable[T]],
+    idempotent: bool = True,
+    hedge_after: Optional[float] = None,
+    hedge_factory: Optional[Callable[[], Awaitable[T]]] = None,
+) -> T:
+    """
+    Async version of `resilient`. Like there, the timeout belongs to
+    the provider call: `factory` should wrap it in `within_timeout`
+    once its rate-limit permit is granted, so time spent queueing for
+    capacity neither times out nor trips the breaker. With
+    `hedge_after`, a second request (`hedge_factory`, or another
+    `factory()` call) is raced against one that has not answered
+    within that many seconds.
+    """
+    breaker = breakers[provider]
+    for attempt in range(EXTERNAL_MAX_RETRIES + 1):
+        breaker.before_call()
+        try:
+            if hedge_after:
+                result = await _hedged(provider, factory, hedge_after, hedge_factory or factory)
+            else:
+                result = await factory()
+        except Exception as e:
+            transient = is_transient(e, idempotent)
+            _record(breaker, e, transient)
+            if not transient or attempt == EXTERNAL_MAX_RETRIES:
+                raise
+            delay = _backoff(attempt)
+            EXTERNAL_RETRIES.labels(provider, operation).inc()
+            logger.warning("🔁 %s %s failed (%s), retry %d in %.2fs", provider, operation, e, attempt + 1, delay)
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled (e.g. an abandoned run): free a half-open trial
+            # slot without counting it against the provider
+            breaker.record_neutral()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+async def _hedged(
+    provider: str,
+    factory: Callable[[], Awaitable[T]],
+    hedge_after: float,
+    hedge_factory: Callable[[], Awaitable[T]],
+) -> T:
+    """First successful result of the primary and (if slow) a hedge request."""
+    primary = asyncio.ensure_future(factory())
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    HEDGED_REQUESTS.labels(provider, "launched").inc()
+    hedge = asyncio.ensure_future(hedge_factory())
+    pending = {primary, hedge}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        HEDGED_REQUESTS.labels(provider, "won").inc()
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def timeout(provider: str) -> float:
+    """Per-call timeout in seconds for `provider`."""
+    return PROVIDER_TIMEOUTS[provider]
+
+
+async def within_timeout(provider: str, awaitable: Awaitable[T]) -> T:
+    """
+    Await one provider call, bounded by `provider`'s timeout. Use it
+    inside the rate-limit permit: `async with arate_limit(...)` first,
+    then `await within_timeout(provider, client.call(...))`.
+    """
+    return await asyncio.wait_for(awaitable, timeout(provider))
@@ -0,0 +1,301 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.metrics import track_external
+from app.services.rate_limiter import rate_limit, arate_limit, estimate_tokens
+from app.services.resilience import resilient, aresilient, timeout, within_timeout
+from app.utils.config import (
+    OPENAI_API_KEY,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSIONS,
+    TOPIC_DEDUP_ENABLED,
+    TOPIC_INDEX_PATH,
+    TOPIC_INDEX_IVF_MIN_ROWS,
+    TOPIC_INDEX_IVF_PROBES,
+    PROVIDER_MODE,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def embeddings():
+    """OpenAI embeddings client, created on first use."""
+    if PROVIDER_MODE == "fake":
+        from app.services.fake_providers import FakeEmbeddings
+
+        return FakeEmbeddings(EMBEDDING_DIMENSIONS)
+
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        model=EMBEDDING_MODEL,
+        dimensions=EMBEDDING_DIMENSIONS,
+        openai_api_key=OPENAI_API_KEY,
+        timeout=timeout("openai"),
+        max_retries=0,
+    )
+
+
+# ==============================================================
+# 🔹 Topic Index
+#    Local vector index of already-posted topics. Vectors are
+#    unit-normalized float32 rows, so cosine similarity is a single
+#    matrix-vector product over the whole history.
+#
+#    On disk:
+#      <path>.f32    raw float32 rows, appended as posts are made
+#      <path>.jsonl  one JSON string per row (the indexed text)
+#
+#    History loaded at startup is memory-mapped (no copy); rows added
+#    while running live in an in-memory tail until the next restart.
+#    Large histories (>= TOPIC_INDEX_IVF_MIN_ROWS) are additionally
+#    partitioned into k-means cells at load time, and lookups only
+#    scan the TOPIC_INDEX_IVF_PROBES cells closest to the query.
+# ==============================================================
+
+class TopicIndex:
+    """
+    Append-only cosine-similarity index over past topics/posts.
+    """
+
+    def __init__(self, path: str, dim: int):
+        self.path = path
+        self.dim = dim
+        self._base = np.empty((0, dim), dtype=np.float32)
+        self._tail = np.empty((16, dim), dtype=np.float32)
+        self._tail_size = 0
+        self._texts: List[str] = []
+        self._ivf: Optional[Tuple[np.ndarray, List[np.ndarray]]] = None
+        self._lock = threading.Lock()
+        self._bootstrap: Optional[asyncio.Task] = None
+
+    @property
+    def _vectors_path(self) -> str:
+        return f"{self.path}.f32"
+
+    @property
+    def _texts_path(self) -> str:
+        return f"{self.path}.jsonl"
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    # ----------------------------------------------------------
+    # Persistence
+    # ----------------------------------------------------------
+    def load(self) -> None:
+        """
+        Memory-map the persisted vectors and read their texts. If the two
+        files disagree (a crash between the two appends, a deleted
+        .jsonl) both are cut back to the rows they have in common, so
+        later appends stay aligned; with no rows left the index starts
+        empty and is rebuilt by `start()`.
+        """
+        if not os.path.exists(self._vectors_path) or os.path.getsize(self._vectors_path) == 0:
+            return
+
+        texts: List[str] = []
+        if os.path.exists(self._texts_path):
+            with open(self._texts_path, encoding="utf-8") as f:
+                texts = [json.loads(line) for line in f if line.strip()]
+        rows = min(os.path.getsize(self._vectors_path) // (4 * self.dim), len(texts))
+
+        if os.path.getsize(self._vectors_path) != rows * 4 * self.dim or len(texts) != rows:
+            logger.warning(
+                "⚠️ Topic index files out of sync (%d vectors, %d texts); keeping %d rows",
+                os.path.getsize(self._vectors_path) // (4 * self.dim), len(texts), rows,
+            )
+            os.truncate(self._vectors_path, rows * 4 * self.dim)
+            with open(self._texts_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(t) + "\n" for t in texts[:rows])
+        if rows == 0:
+            return
+
+        base = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        ivf = _build_ivf(base) if rows >= TOPIC_INDEX_IVF_MIN_ROWS else None
+
+        with self._lock:
+            self._base, self._ivf = base, ivf
+            self._texts = texts[:rows]
+        logger.info("🧭 Topic index loaded: %d entries (%s)", rows, "ivf" if ivf else "exact")
+
+    def add(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Append normalized `vectors` for `texts` in memory and on disk."""
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+
+        with self._lock:
+            needed = self._tail_size + len(vectors)
+            if needed > len(self._tail):
+                grown = np.empty((max(needed, 2 * len(self._tail)), self.dim), dtype=np.float32)
+                grown[: self._tail_size] = self._tail[: self._tail_size]
+                self._tail = grown
+            self._tail[self._tail_size:needed] = vectors
+            self._tail_size = needed
+            self._texts.extend(texts)
+
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._texts_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(t) + "\n" for t in texts)
+
+    # ----------------------------------------------------------
+    # Lookup
+    # ----------------------------------------------------------
+    def nearest(self, vector: np.ndarray) -> Tuple[float, Optional[str]]:
+        """
+        Return (cosine similarity, text) of the closest indexed entry,
+        or (0.0, None) when the index is empty.
+        """
+        query = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, self.dim))[0]
+
+        with self._lock:
+            base, tail, ivf = self._base, self._tail[: self._tail_size], self._ivf
+            texts = self._texts
+
+        best_score, best_idx = 0.0, None
+        if ivf is not None:
+            centroids, lists = ivf
+            cells = np.argsort(centroids @ query)[-TOPIC_INDEX_IVF_PROBES:]
+            rows = np.concatenate([lists[c] for c in cells])
+            if len(rows):
+                scores = base[rows] @ query
+                i = int(np.argmax(scores))
+                best_score, best_idx = float(scores[i]), int(rows[i])
+            base = base[:0]
+
+        for offset, block in ((0, base), (len(self._base), tail)):
+            if len(block) == 0:
+                continue
+            scores = block @ query
+            i = int(np.argmax(scores))
+            if best_idx is None or scores[i] > best_score:
+                best_score, best_idx = float(scores[i]), offset + i
+
+        return (best_score, texts[best_idx]) if best_idx is not None else (0.0, None)
+
+    # ----------------------------------------------------------
+    # Embedding helpers
+    # ----------------------------------------------------------
+    def embed(self, text: str) -> np.ndarray:
+        def attempt():
+            with rate_limit("openai", estimate_tokens(text)), track_external("openai", "embeddings"):
+                return embeddings().embed_query(text)
+
+        return np.asarray(resilient("openai", "embeddings", attempt), dtype=np.float32)
+
+    async def aembed(self, text: str) -> np.ndarray:
+        async def attempt():
+            async with arate_limit("openai", estimate_tokens(text)):
+                with track_external("openai", "embeddings"):
+                    return await within_timeout("openai", embeddings().aembed_query(text))
+
+        return np.asarray(await aresilient("openai", "embeddings", attempt), dtype=np.float32)
+
+    def remember(self, text: str, vector: Optional[np.ndarray] = None) -> None:
+        """Index `text`, embedding it unless `vector` is already known."""
+        self.add([text], vector if vector is not None else self.embed(text))
+
+    async def aremember(self, text: str, vector: Optional[np.ndarray] = None) -> None:
+        """Async version of `remember`."""
+        if vector is None:
+            vector = await self.aembed(text)
+        await asyncio.to_thread(self.add, [text], vector)
+
+    # ----------------------------------------------------------
+    # Bootstrap from MongoDB
+    # ----------------------------------------------------------
+    def build_from_posts(self, docs: Iterable[dict], batch_size: int = 500) -> int:
+        """Embed and index the topic (or content) of every post in `docs`."""
+        added = 0
+        batch: List[str] = []
+        for doc in docs:
+            text = doc.get("topic") or doc.get("content")
+            if text:
+                batch.append(text)
+            if len(batch) >= batch_size:
+                added += self._embed_and_add(batch)
+                batch = []
+        if batch:
+            added += self._embed_and_add(batch)
+        return added
+
+    def _embed_and_add(self, texts: List[str]) -> int:
+        tokens = sum(estimate_tokens(t) for t in texts)
+
+        def attempt():
+            with rate_limit("openai", tokens), track_external("openai", "embeddings"):
+                return embeddings().embed_documents(texts)
+
+        vectors = resilient("openai", "embeddings", attempt)
+        self.add(texts, np.asarray(vectors, dtype=np.float32))
+        return len(texts)
+
+    async def start(self) -> None:
+        """Load the persisted index; bootstrap it from MongoDB in the background if empty."""
+        if not TOPIC_DEDUP_ENABLED:
+            return
+        await asyncio.to_thread(self.load)
+        if len(self) == 0:
+            self._bootstrap = asyncio.create_task(self._abootstrap())
+
+    async def stop(self) -> None:
+        if self._bootstrap is not None and not self._bootstrap.done():
+            self._bootstrap.cancel()
+        self._bootstrap = None
+
+    async def _abootstrap(self) -> None:
+        from app.services.mongodb_service import get_collection
+
+        def build() -> int:
+            docs = get_collection().find({}, {"topic": 1, "content": 1, "_id": 0})
+            return self.build_from_posts(docs)
+
+        try:
+            added = await asyncio.to_thread(build)
+            logger.info("🧭 Topic index built from post history: %d entries", added)
+        except Exception as e:
+            logger.error("❌ Topic index bootstrap failed: %s", e)
+
+
+def _build_ivf(vectors: np.ndarray, iterations: int = 8, seed: int = 0) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Partition unit `vectors` into ~sqrt(n) cells with spherical k-means
+    (trained on a sample). Returns (centroids, row indices per cell).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    k = max(1, int(np.sqrt(n)))
+    sample = np.asarray(vectors[rng.choice(n, size=min(n, 64 * k), replace=False)])
+    centroids = sample[rng.choice(len(sample), size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(k):
+            members = sample[assign == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = _normalize(centroids)
+
+    assign = np.empty(n, dtype=np.int64)
+    for start in range(0, n, 8192):
+        assign[start:start + 8192] = np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+    order = np.argsort(assign, kind="stable")
+    bounds = np.searchsorted(assign[order], np.arange(k + 1))
+    return centroids, [order[bounds[c]:bounds[c + 1]] for c in range(k)]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+topic_index = TopicIndex(TOPIC_INDEX_PATH, EMBEDDING_DIMENSIONS)
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 from app.utils.constants import MISSING_ENV_VARS_ERROR
@@ -33,9 +34,166 @@ required_vars = [
     "REDIRECT_URI",
 ]
 
-missing_vars = [var for var in required_vars if not os.getenv(var)]
 
-if missing_vars:
-    # Format the message from constant.py
-    error_message = MISSING_ENV_VARS_ERROR.format(vars=", ".join(missing_vars))
-    raise EnvironmentError(error_message)
+def validate_config() -> None:
+    """
+    Raise EnvironmentError if any required variable is missing.
+    Called from the FastAPI lifespan, so importing modules (tests,
+    tooling, benchmarks) never requires a complete .env.
+    """
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+
+    if missing_vars:
+        # Format the message from constant.py
+        error_message = MISSING_ENV_VARS_ERROR.format(vars=", ".join(missing_vars))
+        raise EnvironmentError(error_message)
+
+
+# === Optional Tuning (with defaults) ===
+# Number of concurrent workflow workers and the max number of queued runs.
+# Tune against OpenAI/Gemini quotas.
+AGENT_WORKER_COUNT = int(os.getenv("AGENT_WORKER_COUNT", "4"))
+AGENT_QUEUE_MAXSIZE = int(os.getenv("AGENT_QUEUE_MAXSIZE", "100"))
+# Number of finished jobs kept in memory for status polling.
+AGENT_JOB_HISTORY_LIMIT = int(os.getenv("AGENT_JOB_HISTORY_LIMIT", "1000"))
+# Max workflow runs executed concurrently by POST /agent/batch.
+BATCH_MAX_PARALLELISM = int(os.getenv("BATCH_MAX_PARALLELISM", "8"))
+# Graph mode: "sequential" or "speculative" (image generated in parallel
+# with drafting/review), what to do when the approved post drifted away
+# from the image prompt ("regenerate" or "text_only"), and the drift cutoff.
+AGENT_GRAPH_MODE = os.getenv("AGENT_GRAPH_MODE", "sequential")
+SPECULATIVE_IMAGE_ON_DRIFT = os.getenv("SPECULATIVE_IMAGE_ON_DRIFT", "regenerate")
+IMAGE_DRIFT_THRESHOLD = float(os.getenv("IMAGE_DRIFT_THRESHOLD", "0.5"))
+# LLM response cache: graph nodes that may reuse cached completions
+# (creative drafting is not cached unless listed), memory LRU size,
+# persistent tier ("memory" = none, "sqlite" or "mongo") and its TTL.
+LLM_CACHE_NODES = [n.strip() for n in os.getenv("LLM_CACHE_NODES", "reviewer").split(",") if n.strip()]
+LLM_CACHE_MAXSIZE = int(os.getenv("LLM_CACHE_MAXSIZE", "1024"))
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "llm_cache.sqlite3")
+# Graph checkpointing: "sqlite" (local file), "mongo", "memory" or "none".
+# TTL (seconds) only applies to the Mongo backend; 0 keeps checkpoints forever.
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH", "checkpoints.sqlite3")
+CHECKPOINT_TTL_SECONDS = int(os.getenv("CHECKPOINT_TTL_SECONDS", "0"))
+# Graph state schema: "pydantic" validates AgentState before every node;
+# "lean" uses the slotted LeanAgentState dataclass (no per-step validation,
+# inputs are still validated at the API). See benchmarks/graph_overhead.py.
+AGENT_STATE_SCHEMA = os.getenv("AGENT_STATE_SCHEMA", "pydantic")
+# MongoDB connection pool: one client per process, opened in the app lifespan
+# and shared by every collection helper and the Mongo checkpointer. Timeouts
+# in milliseconds; MONGO_SOCKET_TIMEOUT_MS=0 waits on a reply indefinitely.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+# Job counters (completed/failed and per-node failure reasons) are buffered
+# in memory and written to summary_collection every N seconds and at shutdown.
+JOB_COUNTER_FLUSH_SECONDS = float(os.getenv("JOB_COUNTER_FLUSH_SECONDS", "5"))
+# Job summary: hourly/daily per-niche counters are kept in summary_buckets
+# (hourly ones expire after N days, 0 keeps them) and GET /agent/summary
+# answers from an in-memory cache refreshed at most every N seconds.
+SUMMARY_HOURLY_RETENTION_DAYS = int(os.getenv("SUMMARY_HOURLY_RETENTION_DAYS", "30"))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "10"))
+# Generated images are stored once per content hash, outside post documents:
+# "local" (files under IMAGE_BLOB_PATH) or "gridfs" (bucket "images" in DB_NAME).
+IMAGE_BLOB_BACKEND = os.getenv("IMAGE_BLOB_BACKEND", "local")
+IMAGE_BLOB_PATH = os.getenv("IMAGE_BLOB_PATH", "image_blobs")
+# Post outbox: published posts are committed to a local SQLite file and
+# written to MongoDB in batches (insert_many) by a background drainer that
+# retries with exponential backoff up to POST_OUTBOX_RETRY_MAX_SECONDS.
+POST_OUTBOX_ENABLED = os.getenv("POST_OUTBOX_ENABLED", "true").lower() in ("1", "true", "yes")
+POST_OUTBOX_PATH = os.getenv("POST_OUTBOX_PATH", "post_outbox.sqlite3")
+POST_OUTBOX_BATCH_SIZE = int(os.getenv("POST_OUTBOX_BATCH_SIZE", "100"))
+POST_OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("POST_OUTBOX_RETRY_MAX_SECONDS", "60"))
+# Bulk export/import of post history (GET /agent/posts/export, POST
+# /agent/posts/import, python -m app.services.post_archive): posts per
+# cursor round trip, insert_many call and Parquet row group.
+POST_ARCHIVE_BATCH_SIZE = int(os.getenv("POST_ARCHIVE_BATCH_SIZE", "1000"))
+
+# Reviewer output: "structured" (JSON verdict with score and revised draft)
+# or "text" (legacy APPROVED/critique). CONTENT_SELF_REVIEW lets the content
+# creator draft, self-critique and finalize in one completion (skips reviewer).
+REVIEWER_MODE = os.getenv("REVIEWER_MODE", "structured")
+CONTENT_SELF_REVIEW = os.getenv("CONTENT_SELF_REVIEW", "false").lower() in ("1", "true", "yes")
+
+# Topic de-duplication: candidate topics are embedded and compared (cosine)
+# against the local index of already-posted topics; near-duplicates are
+# regenerated up to TOPIC_DEDUP_MAX_RETRIES times before drafting starts.
+# Off by default: the first start with it on embeds every stored post once
+# (one embeddings call per 500 posts) to build the index.
+TOPIC_DEDUP_ENABLED = os.getenv("TOPIC_DEDUP_ENABLED", "false").lower() in ("1", "true", "yes")
+TOPIC_DEDUP_THRESHOLD = float(os.getenv("TOPIC_DEDUP_THRESHOLD", "0.85"))
+TOPIC_DEDUP_MAX_RETRIES = int(os.getenv("TOPIC_DEDUP_MAX_RETRIES", "2"))
+TOPIC_INDEX_PATH = os.getenv("TOPIC_INDEX_PATH", "topic_index")
+TOPIC_INDEX_IVF_MIN_ROWS = int(os.getenv("TOPIC_INDEX_IVF_MIN_ROWS", "20000"))
+TOPIC_INDEX_IVF_PROBES = int(os.getenv("TOPIC_INDEX_IVF_PROBES", "8"))
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "256"))
+
+# Per-provider rate limits shared by all concurrent runs (0 = unlimited).
+# Requests/min adapt down on 429s and recover on success; tokens/min
+# budgets LLM calls by estimated prompt + completion tokens.
+RATE_LIMITS = {
+    "openai": {
+        "rpm": float(os.getenv("OPENAI_RPM", "500")),
+        "tpm": float(os.getenv("OPENAI_TPM", "30000")),
+    },
+    "gemini": {"rpm": float(os.getenv("GEMINI_RPM", "10")), "tpm": 0},
+    "linkedin": {"rpm": float(os.getenv("LINKEDIN_RPM", "60")), "tpm": 0},
+}
+LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "500"))
+
+# Resilience: per-call timeouts, jittered exponential retries for transient
+# errors, per-provider circuit breakers, and optional LLM request hedging
+# (a duplicate request is raced against one slower than the threshold; 0 = off).
+PROVIDER_TIMEOUTS = {
+    "openai": float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60")),
+    "gemini": float(os.getenv("GEMINI_TIMEOUT_SECONDS", "90")),
+    "linkedin": float(os.getenv("LINKEDIN_TIMEOUT_SECONDS", "30")),
+}
+EXTERNAL_MAX_RETRIES = int(os.getenv("EXTERNAL_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "0.5"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "8"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))
+
+# Shared HTTP clients (LinkedIn API and OAuth): one keep-alive pool per
+# provider and process. HTTP_MAX_CONNECTIONS_PER_HOST caps open connections
+# (callers wait for a free one); the async client keeps up to
+# HTTP_MAX_KEEPALIVE_CONNECTIONS idle ones for HTTP_KEEPALIVE_EXPIRY_SECONDS.
+# The read timeout is the provider's *_TIMEOUT_SECONDS. HTTP2_ENABLED (async
+# client only) needs the optional `h2` package.
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Per-node model routing overrides as JSON, merged over DEFAULT_LLM_ROUTES, e.g.
+# {"reviewer": {"model": "gpt-4o", "fallback_model": "gpt-4o-mini", "latency_slo_seconds": 8}}
+LLM_ROUTES = json.loads(os.getenv("LLM_ROUTES", "{}"))
+
+# Provider mode: "live" talks to OpenAI, Gemini, LinkedIn and MongoDB; "fake"
+# swaps in the local stand-ins from app.services.fake_providers (load tests,
+# offline development). Fakes sleep for their provider's mean latency
+# (± FAKE_LATENCY_JITTER as a fraction) and fail at its error rate (0-1).
+PROVIDER_MODE = os.getenv("PROVIDER_MODE", "live")
+FAKE_LATENCY_SECONDS = {
+    "openai": float(os.getenv("FAKE_OPENAI_LATENCY_SECONDS", "0.8")),
+    "gemini": float(os.getenv("FAKE_GEMINI_LATENCY_SECONDS", "3")),
+    "linkedin": float(os.getenv("FAKE_LINKEDIN_LATENCY_SECONDS", "0.3")),
+    "mongo": float(os.getenv("FAKE_MONGO_LATENCY_SECONDS", "0.005")),
+}
+FAKE_LATENCY_JITTER = float(os.getenv("FAKE_LATENCY_JITTER", "0.25"))
+FAKE_ERROR_RATES = {
+    "openai": float(os.getenv("FAKE_OPENAI_ERROR_RATE", "0")),
+    "gemini": float(os.getenv("FAKE_GEMINI_ERROR_RATE", "0")),
+    "linkedin": float(os.getenv("FAKE_LINKEDIN_ERROR_RATE", "0")),
+    "mongo": float(os.getenv("FAKE_MONGO_ERROR_RATE", "0")),
+}
@@ -31,6 +31,11 @@ GEMINI_IMAGE_GEN_FAIL = "❌ Gemini image generation failed: {error}"
 GEMINI_NO_IMAGE_DATA = "⚠️ No image data returned by Gemini. Skipping image upload."
 GEMINI_IMAGE_SAVE_FAIL = "❌ Error saving Gemini image locally: {error}"
 
+# --- Job Queue Messages ---
+JOB_QUEUE_FULL = "🚦 Agent job queue is full ({maxsize} pending runs). Try again later."
+JOB_NOT_FOUND = "🔍 Job {job_id} not found."
+IMAGE_NOT_FOUND = "🔍 Image {image_hash} not found."
+
 # --- General ---
 TEMP_FILE_REMOVED = "🧹 Temporary image file removed."
 OPERATION_SUCCESS = "✅ Operation completed successfully."
@@ -42,6 +47,10 @@ TOPIC_GENERATOR_SYSTEM_PROMPT = (
     "Return ONLY the title, no additional explanation."
 )
 TOPIC_GENERATOR_USER_PROMPT = "Generate a unique, actionable topic for the niche: {niche}"
+TOPIC_GENERATOR_RETRY_USER_PROMPT = (
+    "Generate a unique, actionable topic for the niche: {niche}\n"
+    "It must be clearly different from these already-covered topics:\n{avoid}"
+)
 
 # Content creation
 CONTENT_CREATOR_SYSTEM_PROMPT = (
@@ -60,6 +69,36 @@ REVIEWER_SYSTEM_PROMPT = (
     "Do not include the original post content in the critique."
 )
 
+# Structured reviewer (REVIEWER_MODE=structured)
+REVIEWER_STRUCTURED_SYSTEM_PROMPT = (
+    "You are a strict LinkedIn post reviewer. "
+    "Score the draft from 1 to 10 and decide whether it is ready to publish. "
+    "Respond with a JSON object containing exactly these keys: "
+    "\"score\" (integer 1-10), \"approved\" (boolean), "
+    "\"critique\" (concise actionable improvements, empty string if approved), "
+    "\"revised_draft\" (the complete improved post with your critique applied, or null if approved). "
+    "Do not write anything outside the JSON object."
+)
+REVIEWER_USER_PROMPT = "Critique this draft:\n\n{post_draft}"
+
+# Content revision (after a reviewer critique)
+CONTENT_REVISION_USER_PROMPT = (
+    "Revise this LinkedIn post draft for: {topic}\n\n"
+    "Previous draft:\n{post_draft}\n\n"
+    "Reviewer feedback:\n{feedback}"
+)
+
+# Content creation with self-review (CONTENT_SELF_REVIEW=true)
+CONTENT_SELF_REVIEW_SYSTEM_PROMPT = (
+    "You are a professional LinkedIn content writer and a strict reviewer. "
+    "Write a concise, engaging post with relevant hashtags, then critique it "
+    "for readability and actionable insights, then produce the improved final post. "
+    "Respond with a JSON object containing exactly these keys: "
+    "\"draft\" (first version), \"critique\" (your review), "
+    "\"final_draft\" (the improved post to publish), \"score\" (integer 1-10 for the final post). "
+    "Do not write anything outside the JSON object."
+)
+
 # Image generation
 IMAGE_GENERATION_INSTRUCTION = (
     "Generate an AI image that visually represents the content or theme of the LinkedIn post. "
@@ -72,6 +111,24 @@ POST_EXECUTOR_SUCCESS_MESSAGE = "LinkedIn post succeeded and saved to MongoDB."
 
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# Per-node model routing (overridable per node with the LLM_ROUTES env var).
+# Topic titles and review verdicts are short, so they use the smaller model;
+# the content step keeps gpt-4o.
+DEFAULT_LLM_ROUTES = {
+    "default": {"model": "gpt-4o", "temperature": 0.7},
+    "topic_generator": {"model": "gpt-4o-mini", "temperature": 0.9, "max_tokens": 64},
+    "content_creator": {"model": "gpt-4o", "temperature": 0.7},
+    "reviewer": {"model": "gpt-4o-mini", "temperature": 0.2, "max_tokens": 1024},
+}
+
+# LLM pricing (USD per 1M tokens) used for cost estimates on /metrics
+LLM_PRICE_PER_1M_TOKENS = {
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+    "gpt-4o": {"prompt": 2.50, "completion": 10.00},
+    "gpt-4.1-mini": {"prompt": 0.40, "completion": 1.60},
+    "gpt-4.1": {"prompt": 2.00, "completion": 8.00},
+}
+
 # Logging & error messages
 GEMINI_CLIENT_INIT_FAIL = "❌ Failed to initialize Gemini client: {error}"
 GEMINI_IMAGE_GEN_FAIL = "❌ Gemini image generation failed: {error}"
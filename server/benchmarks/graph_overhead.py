@@ -0,0 +1,214 @@
+"""
+Micro-benchmarks for graph orchestration overhead.
+
+Measures what a run pays outside of provider calls:
+  state      building the state object LangGraph hands to every node and
+             routing function (Pydantic validation vs. slotted dataclass),
+             by number of messages carried in the state
+  step       per-node overhead of a compiled graph of pass-through nodes,
+             without and with an in-memory checkpointer
+  prompts    ChatPromptTemplate construction per call vs. the hoisted
+             module-level templates
+  compile    build_graph() per mode and state schema, and compile time
+             by schema width (number of state fields)
+
+Usage (from the server/ directory):
+    python -m benchmarks.graph_overhead
+    python -m benchmarks.graph_overhead --quick --json graph_overhead.json
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from dataclasses import field, make_dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langchain_core.prompts import ChatPromptTemplate  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+from pydantic import create_model  # noqa: E402
+
+from app.models.agent import AgentState, LeanAgentState  # noqa: E402
+from app.services import agent_graph  # noqa: E402
+from app.utils.constants import (  # noqa: E402
+    TOPIC_GENERATOR_SYSTEM_PROMPT,
+    TOPIC_GENERATOR_USER_PROMPT,
+    CONTENT_CREATOR_SYSTEM_PROMPT,
+    CONTENT_CREATOR_USER_PROMPT,
+)
+
+SCHEMAS = {"pydantic": AgentState, "lean": LeanAgentState}
+STEP_NODES = 20
+
+
+def per_call(fn: Callable[[], Any], repeat: int) -> float:
+    """Best-of-`repeat` seconds per call of `fn` (timeit autorange batches)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def _messages(count: int) -> List[Any]:
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 7
+    return [(HumanMessage if i % 2 == 0 else AIMessage)(content=text) for i in range(count)]
+
+
+def _values(messages: int) -> Dict[str, Any]:
+    """Channel values of a run midway through the graph."""
+    return {
+        "niche": "Artificial Intelligence",
+        "messages": _messages(messages),
+        "topic": "How retrieval-augmented generation changes enterprise search",
+        "post_draft": "Draft " * 120,
+        "review_feedback": "Tighten the hook.",
+        "review_score": 7,
+        "models_used": {"topic_generator": "gpt-4o-mini", "content_creator": "gpt-4o"},
+        "current_node": "reviewer",
+        "iteration_count": 1,
+    }
+
+
+# ==============================================================
+# 🔹 Benchmarks
+# ==============================================================
+
+def bench_state(sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        values = _values(size)
+        results[str(size)] = {name: per_call(lambda s=schema: s(**values), repeat) for name, schema in SCHEMAS.items()}
+    return results
+
+
+def _step_graph(schema: type, checkpointer: Optional[Any]):
+    builder = StateGraph(schema)
+    names = [f"step_{i}" for i in range(STEP_NODES)]
+    for i, name in enumerate(names):
+        builder.add_node(name, lambda state, name=name, i=i: {"current_node": name, "iteration_count": i})
+    builder.set_entry_point(names[0])
+    for a, b in zip(names, names[1:]):
+        builder.add_edge(a, b)
+    builder.add_edge(names[-1], END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def bench_steps(sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        initial = AgentState(**_values(size))
+        row = {}
+        for name, schema in SCHEMAS.items():
+            plain = _step_graph(schema, None)
+            row[name] = per_call(lambda: plain.invoke(initial), repeat) / STEP_NODES
+
+            saved = _step_graph(schema, InMemorySaver())
+            config = {"configurable": {"thread_id": "bench"}}
+            row[f"{name}+checkpoint"] = per_call(lambda: saved.invoke(initial, config), repeat) / STEP_NODES
+        results[str(size)] = row
+    return results
+
+
+def bench_prompts(repeat: int) -> Dict[str, Dict[str, float]]:
+    niche, topic = "Artificial Intelligence", "How RAG changes enterprise search"
+    cases = {
+        "topic_generator": (
+            lambda: ChatPromptTemplate.from_messages([
+                ("system", TOPIC_GENERATOR_SYSTEM_PROMPT),
+                ("user", TOPIC_GENERATOR_USER_PROMPT.format(niche=niche)),
+            ]).format_messages(),
+            lambda: agent_graph.TOPIC_PROMPT.format_messages(niche=niche),
+        ),
+        "content_creator": (
+            lambda: ChatPromptTemplate.from_messages([
+                ("system", CONTENT_CREATOR_SYSTEM_PROMPT),
+                ("user", CONTENT_CREATOR_USER_PROMPT.format(topic=topic)),
+            ]).format_messages(),
+            lambda: agent_graph.CONTENT_PROMPT.format_messages(topic=topic),
+        ),
+    }
+    return {
+        node: {"build_per_call": per_call(build, repeat), "hoisted": per_call(hoisted, repeat)}
+        for node, (build, hoisted) in cases.items()
+    }
+
+
+def _wide_schemas(width: int) -> Dict[str, type]:
+    fields = {f"field_{i}": (Optional[str], None) for i in range(width)}
+    return {
+        "pydantic": create_model(f"Wide{width}", niche=(str, ...), **fields),
+        "lean": make_dataclass(
+            f"LeanWide{width}", [("niche", str)] + [(f"field_{i}", Optional[str], field(default=None)) for i in range(width)],
+            slots=True,
+        ),
+    }
+
+
+def bench_compile(widths: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for mode in ("sequential", "speculative"):
+        results[f"agent_graph/{mode}"] = {
+            name: per_call(lambda m=mode, s=schema: agent_graph.build_graph(m, s), repeat)
+            for name, schema in SCHEMAS.items()
+        }
+    for width in widths:
+        row = {}
+        for name, schema in _wide_schemas(width).items():
+            def compile_chain(schema=schema):
+                builder = StateGraph(schema)
+                for i in range(5):
+                    builder.add_node(f"n{i}", lambda state: {})
+                builder.set_entry_point("n0")
+                for i in range(4):
+                    builder.add_edge(f"n{i}", f"n{i + 1}")
+                builder.add_edge("n4", END)
+                return builder.compile()
+            row[name] = per_call(compile_chain, repeat)
+        results[f"{width} fields/5 nodes"] = row
+    return results
+
+
+# ==============================================================
+# 🔹 Report
+# ==============================================================
+
+def _print_table(title: str, rows: Dict[str, Dict[str, float]], unit: float = 1e6, suffix: str = "µs") -> None:
+    columns = list(next(iter(rows.values())))
+    width = max(len(c) for c in columns) + len(suffix) + 5
+    print(f"\n{title:28}" + "".join(f"{c + ' (' + suffix + ')':>{width}}" for c in columns))
+    for label, row in rows.items():
+        print(f"{label:28}" + "".join(f"{row[c] * unit:{width}.1f}" for c in columns))
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repeats")
+    parser.add_argument("--json", help="also write the results (seconds) to this file")
+    args = parser.parse_args(argv)
+
+    repeat = 3 if args.quick else 5
+    sizes = [0, 100] if args.quick else [0, 10, 100, 1000]
+    widths = [16, 128] if args.quick else [16, 64, 256]
+
+    results = {
+        "state": bench_state(sizes, repeat),
+        "step": bench_steps(sizes, repeat),
+        "prompts": bench_prompts(repeat),
+        "compile": bench_compile(widths, repeat),
+    }
+    _print_table("state build, by messages", results["state"])
+    _print_table("per-node step, by messages", results["step"])
+    _print_table("prompt per node call", results["prompts"])
+    _print_table("graph compile", results["compile"], unit=1e3, suffix="ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+HTTP client benchmark: a new connection per call vs. the shared pools.
+
+Sends the same request the old way (bare `requests.post`, or a fresh
+`httpx.AsyncClient` per call, so every call pays TCP and, for https, TLS
+setup) and through the pooled clients from app.services.http_client
+(keep-alive connections reused across calls). Reports per-call latency
+for each, sequentially and with concurrent callers.
+
+By default the target is a local keep-alive HTTP server started by the
+benchmark (it shows the TCP setup cost only). Pass an https --url to
+include TLS handshakes and real network round trips, e.g. LinkedIn's API
+(an unauthenticated request is answered with 401, which is fine here).
+
+Usage (from the server/ directory):
+    python -m benchmarks.http_client
+    python -m benchmarks.http_client --url https://api.linkedin.com/v2/userinfo --calls 50
+    python -m benchmarks.http_client --calls 500 --concurrency 16 --json http_client.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, Dict, List
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+PAYLOAD = {"author": "urn:li:person:benchmark", "lifecycleState": "PUBLISHED"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers every request with a small JSON body, keeping the connection open."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes: without TCP_NODELAY the body waits
+    # on the client's delayed ACK (~40 ms) on every reused connection
+    disable_nagle_algorithm = True
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = b'{"id": "urn:li:share:benchmark"}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_local_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _per_call_requests(url: str) -> Callable[[], None]:
+    """The old sync pattern: module-level requests.post, a new connection every call."""
+    import requests
+
+    return lambda: requests.post(url, json=PAYLOAD, timeout=30).content
+
+
+def _pooled_session(url: str) -> Callable[[], None]:
+    from app.services.http_client import get_session
+
+    return lambda: get_session("linkedin").post(url, json=PAYLOAD).content
+
+
+def _per_call_httpx(url: str) -> Callable[[], Awaitable[None]]:
+    """The old async pattern: a new AsyncClient (and pool) per call."""
+    import httpx
+
+    async def call() -> None:
+        async with httpx.AsyncClient(timeout=30) as client:
+            (await client.post(url, json=PAYLOAD)).content
+    return call
+
+
+def _pooled_async_client(url: str) -> Callable[[], Awaitable[None]]:
+    from app.services.http_client import get_async_http_client
+
+    async def call() -> None:
+        (await get_async_http_client("linkedin").post(url, json=PAYLOAD)).content
+    return call
+
+
+def measure(call: Callable[[], None], calls: int, concurrency: int) -> Dict[str, float]:
+    """Latency summary of `calls` invocations spread over `concurrency` threads."""
+    from app.utils.stats import latency_summary
+
+    def timed(_) -> float:
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies: List[float] = list(pool.map(timed, range(calls)))
+    elapsed = time.perf_counter() - started
+    return {**latency_summary(latencies), "calls_per_second": round(calls / elapsed, 1)}
+
+
+async def ameasure(call: Callable[[], Awaitable[None]], calls: int, concurrency: int) -> Dict[str, float]:
+    """Latency summary of `calls` coroutine invocations, at most `concurrency` in flight."""
+    from app.utils.stats import latency_summary
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            return time.perf_counter() - start
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    return {**latency_summary(list(latencies)), "calls_per_second": round(calls / elapsed, 1)}
+
+
+async def _run_async(url: str, calls: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    from app.services.http_client import aclose_http_clients
+
+    results = {}
+    try:
+        for name, call in (("per_call_httpx", _per_call_httpx(url)), ("pooled_async_client", _pooled_async_client(url))):
+            await call()  # first call outside the timings (imports, DNS)
+            for level in (1, concurrency):
+                results[f"{name}/{level} concurrent"] = await ameasure(call, calls, level)
+    finally:
+        await aclose_http_clients()
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="target URL (default: a local keep-alive server)")
+    parser.add_argument("--calls", type=int, default=200, help="calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="callers for the concurrent scenarios")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    os.environ["PROVIDER_MODE"] = "live"
+    from app.services.http_client import close_http_clients
+
+    server = None if args.url else start_local_server()
+    url = args.url or f"http://127.0.0.1:{server.server_address[1]}/v2/ugcPosts"
+
+    results = {}
+    try:
+        for name, call in (("per_call_requests", _per_call_requests(url)), ("pooled_session", _pooled_session(url))):
+            call()  # first call outside the timings (imports, DNS)
+            for level in (1, args.concurrency):
+                results[f"{name}/{level} concurrent"] = measure(call, args.calls, level)
+        results.update(asyncio.run(_run_async(url, args.calls, args.concurrency)))
+    finally:
+        close_http_clients()
+        if server is not None:
+            server.shutdown()
+
+    print(f"\ntarget: {url}")
+    print(f"{'scenario':36}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>10}")
+    for name, row in results.items():
+        print(
+            f"{name:36}" + "".join(f"{row[k] * 1e3:10.2f}" for k in ("mean", "p50", "p95", "p99"))
+            + f"{row['calls_per_second']:10.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
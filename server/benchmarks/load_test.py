@@ -0,0 +1,316 @@
+"""
+Load test for the full agent pipeline through the HTTP API.
+
+Virtual users submit POST /agent/start and poll GET /agent/jobs/{id}
+until the run finishes, keeping `--concurrency` runs in flight. Reports
+throughput, run latency (client-side, queue wait, execution), p50/p95/p99
+per graph node and error rates.
+
+Usage (from the server/ directory):
+    python -m benchmarks.load_test --concurrency 20 --runs 200
+    python -m benchmarks.load_test --duration 60 --json load.json
+    python -m benchmarks.load_test --url http://localhost:8000 --runs 50
+
+Without --url a server is started (uvicorn subprocess, in a scratch
+directory) with PROVIDER_MODE=fake, in-memory checkpoints/cache, one job
+worker per virtual user and provider rate limits disabled, so results
+measure orchestration rather than quotas. Any of those (and the
+FAKE_*_LATENCY_SECONDS / FAKE_*_ERROR_RATE knobs) can be overridden by
+exporting them before running.
+
+Per-node percentiles come from the server's agent_node_duration_seconds
+histogram (scraped from /metrics before and after the run) and are
+interpolated within its buckets.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+from app.utils.stats import latency_summary  # noqa: E402
+
+NICHES = ["Artificial Intelligence", "Cloud Computing", "Developer Productivity", "Data Engineering"]
+
+# Defaults for the spawned server; exported variables take precedence
+FAKE_SERVER_ENV = {
+    "PROVIDER_MODE": "fake",
+    "CHECKPOINT_BACKEND": "memory",
+    "LLM_CACHE_BACKEND": "memory",
+    "OPENAI_RPM": "0",
+    "OPENAI_TPM": "0",
+    "GEMINI_RPM": "0",
+    "LINKEDIN_RPM": "0",
+}
+
+
+# ==============================================================
+# 🔹 Server Under Test
+# ==============================================================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(concurrency: int, workdir: str) -> Tuple[subprocess.Popen, str]:
+    """Launch uvicorn with fake providers and wait until it answers."""
+    from app.utils.config import required_vars
+
+    env = dict(os.environ)
+    for var, value in FAKE_SERVER_ENV.items():
+        env.setdefault(var, value)
+    env.setdefault("AGENT_WORKER_COUNT", str(concurrency))
+    env.setdefault("AGENT_QUEUE_MAXSIZE", str(max(100, 2 * concurrency)))
+    for var in required_vars:
+        env.setdefault(var, "load-test")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SERVER_DIR, env.get("PYTHONPATH")]))
+
+    port = _free_port()
+    log_path = os.path.join(workdir, "server.log")
+    with open(log_path, "w") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            with open(log_path) as log:
+                raise RuntimeError(f"server exited with code {proc.returncode}:\n{log.read()[-2000:]}")
+        try:
+            if httpx.get(url + "/", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("server did not become ready within 60s")
+
+
+# ==============================================================
+# 🔹 Metrics Scraping
+# ==============================================================
+
+def _scrape(client: httpx.Client) -> Dict[str, Dict[Tuple, float]]:
+    """Samples of /metrics as {sample name: {label tuple: value}}."""
+    samples: Dict[str, Dict[Tuple, float]] = defaultdict(dict)
+    for family in text_string_to_metric_families(client.get("/metrics").text):
+        for sample in family.samples:
+            samples[sample.name][tuple(sorted(sample.labels.items()))] = sample.value
+    return samples
+
+
+def _delta(before: Dict, after: Dict, name: str) -> Dict[Tuple, float]:
+    old = before.get(name, {})
+    return {labels: value - old.get(labels, 0.0) for labels, value in after.get(name, {}).items()}
+
+
+def _histogram_quantile(buckets: List[Tuple[float, float]], q: float) -> float:
+    """Prometheus-style quantile from cumulative (upper bound, count) buckets."""
+    total = buckets[-1][1] if buckets else 0
+    if total <= 0:
+        return 0.0
+    rank = q * total
+    lower, lower_count = 0.0, 0.0
+    for upper, count in buckets:
+        if count >= rank:
+            if upper == float("inf"):
+                return lower
+            return lower + (upper - lower) * (rank - lower_count) / max(count - lower_count, 1e-9)
+        lower, lower_count = upper, count
+    return lower
+
+
+def node_latencies(before: Dict, after: Dict) -> Dict[str, Dict[str, float]]:
+    buckets: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+    for labels, count in _delta(before, after, "agent_node_duration_seconds_bucket").items():
+        labels = dict(labels)
+        buckets[labels["node"]].append((float(labels["le"]), count))
+    errors = {dict(l)["node"]: v for l, v in _delta(before, after, "agent_node_errors_total").items()}
+
+    report = {}
+    for node, node_buckets in sorted(buckets.items()):
+        node_buckets.sort()
+        count = node_buckets[-1][1]
+        if count <= 0:
+            continue
+        report[node] = {
+            "count": int(count),
+            "p50": round(_histogram_quantile(node_buckets, 0.50), 4),
+            "p95": round(_histogram_quantile(node_buckets, 0.95), 4),
+            "p99": round(_histogram_quantile(node_buckets, 0.99), 4),
+            "errors": int(errors.get(node, 0)),
+        }
+    return report
+
+
+def external_errors(before: Dict, after: Dict) -> Dict[str, Dict[str, int]]:
+    report: Dict[str, Dict[str, int]] = defaultdict(lambda: {"errors": 0, "retries": 0})
+    for metric, key in (("agent_external_call_errors_total", "errors"), ("agent_external_retries_total", "retries")):
+        for labels, value in _delta(before, after, metric).items():
+            labels = dict(labels)
+            if value:
+                report[f"{labels['provider']}.{labels['operation']}"][key] += int(value)
+    return dict(sorted(report.items()))
+
+
+# ==============================================================
+# 🔹 Load Generation
+# ==============================================================
+
+def _seconds_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    if not start or not end:
+        return None
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+def _outcome(job: dict) -> str:
+    if job["status"] != "completed":
+        return "failed"
+    messages = next(iter((job.get("result") or {}).values()), None) or {}
+    last = (messages.get("messages") or [{}])[-1]
+    return "post_failed" if isinstance(last, dict) and last.get("content") == "post_failed" else "published"
+
+
+async def _user(client: httpx.AsyncClient, index: int, budget: dict, results: dict, poll: float) -> None:
+    while True:
+        if budget["remaining"] is not None:
+            if budget["remaining"] <= 0:
+                return
+            budget["remaining"] -= 1
+        if time.monotonic() >= budget["deadline"]:
+            return
+
+        niche = NICHES[(index + len(results["latency"])) % len(NICHES)]
+        started = time.perf_counter()
+        response = await client.post("/agent/start", json={"niche": niche})
+        if response.status_code != 202:
+            results["outcomes"][f"http_{response.status_code}"] += 1
+            await asyncio.sleep(poll)
+            continue
+
+        job_id = response.json()["job_id"]
+        while True:
+            await asyncio.sleep(poll)
+            job = (await client.get(f"/agent/jobs/{job_id}")).json()
+            if job["status"] in ("completed", "failed"):
+                break
+
+        results["latency"].append(time.perf_counter() - started)
+        results["outcomes"][_outcome(job)] += 1
+        queue_wait = _seconds_between(job.get("created_at"), job.get("started_at"))
+        execution = _seconds_between(job.get("started_at"), job.get("finished_at"))
+        if queue_wait is not None:
+            results["queue_wait"].append(queue_wait)
+        if execution is not None:
+            results["execution"].append(execution)
+
+
+async def drive(url: str, concurrency: int, runs: Optional[int], duration: float, poll: float) -> dict:
+    results = {"latency": [], "queue_wait": [], "execution": [], "outcomes": defaultdict(int)}
+    budget = {"remaining": runs, "deadline": time.monotonic() + duration}
+    limits = httpx.Limits(max_connections=concurrency + 4, max_keepalive_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(_user(client, i, budget, results, poll) for i in range(concurrency)))
+        results["wall_seconds"] = time.perf_counter() - started
+    return results
+
+
+# ==============================================================
+# 🔹 Report
+# ==============================================================
+
+def _print_report(report: dict) -> None:
+    outcomes = report["outcomes"]
+    finished = report["runs"]["client_end_to_end"]["count"]
+    print(f"\nconcurrency={report['concurrency']}  finished runs={finished}  "
+          f"wall={report['wall_seconds']:.1f}s  throughput={report['throughput_runs_per_second']:.2f} runs/s")
+    print("outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items())) +
+          f"  (error rate {report['error_rate']:.1%})")
+
+    print(f"\n{'run latency (s)':24} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, summary in report["runs"].items():
+        print(f"{name:24} {summary['p50']:8.3f} {summary['p95']:8.3f} {summary['p99']:8.3f} {summary['max']:8.3f}")
+
+    print(f"\n{'node latency (s)':24} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for node, summary in report["nodes"].items():
+        print(f"{node:24} {summary['count']:6d} {summary['p50']:8.3f} {summary['p95']:8.3f} "
+              f"{summary['p99']:8.3f} {summary['errors']:7d}")
+
+    if report["external"]:
+        print(f"\n{'external call':36} {'errors':>7} {'retries':>8}")
+        for call, counts in report["external"].items():
+            print(f"{call:36} {counts['errors']:7d} {counts['retries']:8d}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="target an already running server instead of starting one with fake providers")
+    parser.add_argument("--concurrency", type=int, default=10, help="virtual users, i.e. runs kept in flight")
+    parser.add_argument("--runs", type=int, help="stop after this many submitted runs")
+    parser.add_argument("--duration", type=float, help="stop submitting after this many seconds (default 60 without --runs)")
+    parser.add_argument("--poll", type=float, default=0.05, help="job status polling interval (s)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+    duration = args.duration if args.duration is not None else (float("inf") if args.runs else 60.0)
+
+    proc = None
+    workdir = tempfile.TemporaryDirectory(prefix="agent-load-")
+    try:
+        url = args.url
+        if url is None:
+            proc, url = start_server(args.concurrency, workdir.name)
+
+        with httpx.Client(base_url=url, timeout=30) as client:
+            before = _scrape(client)
+            results = asyncio.run(drive(url, args.concurrency, args.runs, duration, args.poll))
+            after = _scrape(client)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        workdir.cleanup()
+
+    outcomes = dict(results["outcomes"])
+    attempted = sum(outcomes.values())
+    report = {
+        "url": args.url or "fake providers",
+        "concurrency": args.concurrency,
+        "wall_seconds": round(results["wall_seconds"], 3),
+        "throughput_runs_per_second": round(len(results["latency"]) / results["wall_seconds"], 3),
+        "outcomes": outcomes,
+        "error_rate": round((attempted - outcomes.get("published", 0)) / attempted, 4) if attempted else 0.0,
+        "runs": {
+            "client_end_to_end": latency_summary(results["latency"]),
+            "queue_wait": latency_summary(results["queue_wait"]),
+            "execution": latency_summary(results["execution"]),
+        },
+        "nodes": node_latencies(before, after),
+        "external": external_errors(before, after),
+    }
+    _print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+MongoDB client benchmark: a new MongoClient per call vs. the shared pool.
+
+Replays the summary-counter access pattern (find_one_and_update with $inc,
+then find_one) against a scratch collection, both the old way (a fresh
+MongoClient, i.e. a new pool, TCP/TLS handshake and server discovery, for
+every call) and through the process-wide client from mongodb_service.
+Reports per-call latency for each, sequentially and from concurrent
+threads.
+
+Needs a reachable MongoDB: MONGO_URI (or --uri), e.g. a local
+`docker run -p 27017:27017 mongo`. The scratch collection is dropped
+afterwards.
+
+Usage (from the server/ directory):
+    python -m benchmarks.mongo_client --uri mongodb://localhost:27017
+    python -m benchmarks.mongo_client --calls 500 --threads 16 --json mongo_client.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+SCRATCH_COLLECTION = "benchmark_mongo_client"
+
+
+def _per_call_client(uri: str, db_name: str) -> Callable[[], None]:
+    """The old pattern: every call builds (and here, at least closes) its own client."""
+    from pymongo import MongoClient
+
+    def call() -> None:
+        client = MongoClient(uri)
+        try:
+            collection = client[db_name][SCRATCH_COLLECTION]
+            collection.find_one_and_update({}, {"$inc": {"total_completed": 1}}, upsert=True)
+            collection.find_one()
+        finally:
+            client.close()
+    return call
+
+
+def _shared_client(db_name: str) -> Callable[[], None]:
+    from app.services.mongodb_service import get_client
+
+    def call() -> None:
+        collection = get_client()[db_name][SCRATCH_COLLECTION]
+        collection.find_one_and_update({}, {"$inc": {"total_completed": 1}}, upsert=True)
+        collection.find_one()
+    return call
+
+
+def measure(call: Callable[[], None], calls: int, threads: int) -> Dict[str, float]:
+    """Latency summary of `calls` invocations spread over `threads` threads."""
+    from app.utils.stats import latency_summary
+
+    def timed(_) -> float:
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies: List[float] = list(pool.map(timed, range(calls)))
+    elapsed = time.perf_counter() - started
+    return {**latency_summary(latencies), "calls_per_second": round(calls / elapsed, 1)}
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uri", help="MongoDB URI (default: MONGO_URI)")
+    parser.add_argument("--calls", type=int, default=200, help="calls per scenario")
+    parser.add_argument("--threads", type=int, default=8, help="threads for the concurrent scenarios")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.uri:
+        os.environ["MONGO_URI"] = args.uri
+    os.environ["PROVIDER_MODE"] = "live"
+    from app.utils.config import MONGO_URI, DB_NAME
+    from app.services.mongodb_service import get_client, close_mongo_client
+
+    if not MONGO_URI:
+        parser.error("set MONGO_URI or pass --uri")
+    db_name = DB_NAME or "benchmark"
+
+    scenarios = {
+        "per_call_client": _per_call_client(MONGO_URI, db_name),
+        "shared_client": _shared_client(db_name),
+    }
+    results = {}
+    try:
+        get_client().admin.command("ping")
+        for name, call in scenarios.items():
+            call()  # first call outside the timings (imports, initial discovery)
+            for threads in (1, args.threads):
+                results[f"{name}/{threads} thread{'s' if threads > 1 else ''}"] = measure(call, args.calls, threads)
+    finally:
+        get_client()[db_name].drop_collection(SCRATCH_COLLECTION)
+        close_mongo_client()
+
+    print(f"\n{'scenario':32}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>10}")
+    for name, row in results.items():
+        print(
+            f"{name:32}" + "".join(f"{row[k] * 1e3:10.2f}" for k in ("mean", "p50", "p95", "p99"))
+            + f"{row['calls_per_second']:10.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Startup-time benchmark: import cost per module and graph warm-up time.
+
+Each measurement runs in a fresh interpreter (`python -X importtime`), so
+results reflect a cold process the way uvicorn/autoscaling sees it.
+
+Usage (from the server/ directory):
+    python -m benchmarks.startup_imports
+    python -m benchmarks.startup_imports --runs 10 --json startup.json
+
+Required environment variables that are unset are filled with dummy
+values; clients are constructed during warm-up but never called.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose import cost we track, roughly in dependency order
+MODULES = [
+    "app.utils.config",
+    "app.services.metrics",
+    "app.services.mongodb_service",
+    "app.services.linkedin_service",
+    "app.services.gemini_service",
+    "app.services.topic_index",
+    "app.services.job_queue",
+    "app.routes.route",
+    "app.services.agent_graph",
+    "app.main",
+]
+
+WARM_UP_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from app.services.agent_graph import warm_up; warm_up(); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _env() -> Dict[str, str]:
+    from app.utils.config import required_vars
+
+    env = dict(os.environ)
+    for var in required_vars:
+        env.setdefault(var, "benchmark")
+    return env
+
+
+def import_time(module: str, env: Dict[str, str]) -> Dict[str, float]:
+    """Cumulative import time (seconds) of `module` and of every app.* module it pulls in."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        times[name] = int(cumulative_us) / 1e6
+    return times
+
+
+def warm_up_time(env: Dict[str, str]) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-c", WARM_UP_SNIPPET],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, SERVER_DIR)
+    env = _env()
+
+    results = {"imports": {}, "warm_up_seconds": None}
+    print(f"{'module':40} {'median (s)':>10} {'min (s)':>10}")
+    for module in MODULES:
+        samples = [import_time(module, env)[module] for _ in range(args.runs)]
+        results["imports"][module] = {"median": statistics.median(samples), "min": min(samples)}
+        print(f"{module:40} {statistics.median(samples):10.3f} {min(samples):10.3f}")
+
+    warm = [warm_up_time(env) for _ in range(args.runs)]
+    results["warm_up_seconds"] = {"median": statistics.median(warm), "min": min(warm)}
+    print(f"{'agent_graph.warm_up()':40} {statistics.median(warm):10.3f} {min(warm):10.3f}")
+
+    # What app.main pulls in, heaviest first
+    breakdown = import_time("app.main", env)
+    heaviest = sorted(((t, m) for m, t in breakdown.items() if "." not in m or m.startswith("app.")), reverse=True)[:10]
+    results["app_main_breakdown"] = {m: t for t, m in heaviest}
+    print("\nheaviest imports under app.main (cumulative s):")
+    for t, m in heaviest:
+        print(f"  {m:38} {t:10.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()